@@ -9,8 +9,9 @@
 
 
 import threading
+import math
 import os
-from configobj import ConfigObj
+import re
 import globalPluginHandler
 import inputCore
 import gui
@@ -18,33 +19,74 @@ import wx
 import config
 import globalVars
 import scriptHandler
-import mouseHandler
 import ui
 import api
-import winUser
 import addonHandler
-import time
-import math as np
-import random
+from logHandler import log
+from .trajectory import planWindMouse, resampleToDuration, speedEasing
+from .playback import LatestPositionDispatcher, DEFAULT_RATE
+from .motion import ActiveMotion
+from .cache import TrajectoryCache
+from .models import getMotionModel, motionModels
+from .positions import Position, PositionTable
+from .positionStore import PositionFileCache, ShortCutIndex
+from .search import SearchIndex, positionText
+from .spatial import SpatialIndex
+from .waypoints import WaypointBuffer
+from .tour import planTour, shortestOrder
+from .prefetch import PathPrefetcher
+from .emission import MAX_GAP_FRAMES, decimate
+from .injection import WinUserBackend
+from . import probes
+from .profiling import Profiler
+from .recording import Recorder, CompressedRing
+from . import positionDatabase
 
 
 addonHandler.initTranslation()
 
-sqrt3 = np.sqrt(3)
-sqrt5 = np.sqrt(5)
-
 # Each global constant is prefixed with "CM".
 
 # Constants
 CMMousePositions = os.path.join(globalVars.appArgs.configPath, "addons", "cursormovements", "mousePositions")
-# Mouse movement directions
-shortCut = "none"
+CMPositionDatabase = os.path.join(globalVars.appArgs.configPath, "addons", "cursormovements", "positions.db")
+CMPathCache = os.path.join(globalVars.appArgs.configPath, "addons", "cursormovements", "pathCache.bin")
+CMProfiles = os.path.join(globalVars.appArgs.configPath, "addons", "cursormovements", "profiles")
+CMRecordings = os.path.join(globalVars.appArgs.configPath, "addons", "cursormovements", "recordings")
+# Milliseconds to wait for focus to settle in a newly focused application before rebinding its shortcuts.
+CMBindingDebounce = 50
+# Windows device names, which cannot be used as file names.
+CMReservedFileNames = frozenset(
+	["CON", "PRN", "AUX", "NUL"] + ["COM%d" % i for i in range(1, 10)] + ["LPT%d" % i for i in range(1, 10)]
+)
+# Keys that cannot become click shortcuts, in lower case like normalized gesture identifiers.
+CMReservedShortCuts = frozenset((
+	"tab", "shift+tab", "uparrow", "downarrow", "leftarrow", "rightarrow", "home", "end", "escape",
+	"pageup", "pagedown", ",", "numpadenter", "space", "enter"
+))
+
+
+def gestureLabel(gesture):
+	# Shortcuts are shown without their "kb:" prefix, positions without one as "None".
+	if not gesture:
+		return "None"
+	return gesture.split(":", 1)[-1]
+
+
+# Profiles the code of this add-on on demand, started and stopped from the GUI thread.
+addonProfiler = Profiler(CMProfiles, os.path.dirname(os.path.abspath(__file__)))
+# Ends the profiling session after the configured duration.
+profilingTimer = None
+
+# Every cursor move, click and position query goes through this backend.
+# Replacing it with an L{injection.RecordingBackend} runs the add-on without a real cursor.
+injectionBackend = WinUserBackend()
 
 
 # Reports mouse position, used in various places.
 def reportMousePosition(x=None, y=None):
 	# The coordinates are keywords so specific position can be announced if needed.
-	cursorPos = winUser.getCursorPos()
+	cursorPos = injectionBackend.position()
 	if x is None:
 		x = cursorPos[0]
 	if y is None:
@@ -55,17 +97,92 @@ def reportMousePosition(x=None, y=None):
 def setMousePosition(x, y, announceMousePosition=False, click=False):
 	# Setter version of report mouse position function.
 	# The new position announcement is to be used if needed.
-	winUser.setCursorPos(x, y)
-	mouseHandler.executeMouseMoveEvent(x, y)
+	start = None
+	if probes.enabled:
+		start = probes.now()
+		probes.markEnd("firstMove", "gestureToFirstMove")
+	injectionBackend.move(x, y)
 	if click:
-		winUser.mouse_event(winUser.MOUSEEVENTF_LEFTDOWN, 0, 0, None, None)
-		winUser.mouse_event(winUser.MOUSEEVENTF_LEFTUP, 0, 0, None, None)
+		injectionBackend.click()
 		#wx.CallLater(100, ui.message, _("left click"))
+	if start is not None:
+		probes.since("inject", start)
 	if announceMousePosition:
 		# Announce this half a second later to give the appearance of mouse movement.
 		wx.CallLater(500, reportMousePosition, x=x, y=y)
 
 
+def recordingName(name):
+	# The name becomes a file name in CMRecordings: characters Windows does not allow are replaced,
+	# so the file cannot end up in another folder, and device names such as "con" get a prefix.
+	name = re.sub(r'[<>:"/\\|?*\x00-\x1f]', "_", name).strip().rstrip(".")
+	if name.split(".")[0].upper() in CMReservedFileNames:
+		name = "_" + name
+	return name
+
+
+def openPositionStore():
+	# Position files by default, the SQLite database when chosen and available.
+	if config.conf["goldenCursor"]["positionStorage"] == "database" and positionDatabase.isAvailable():
+		try:
+			store = positionDatabase.PositionDatabase(CMPositionDatabase)
+			store.importFiles(CMMousePositions)
+			return store
+		except Exception:
+			log.error("Cannot open the mouse positions database", exc_info=True)
+	return PositionFileCache(CMMousePositions, ".gc", onError=logSaveError, onReadError=logReadError)
+
+
+def logSaveError(appName):
+	log.error("Cannot save mouse positions for %s" % appName, exc_info=True)
+
+
+def logReadError(appName):
+	log.error("Cannot read mouse positions for %s" % appName, exc_info=True)
+
+
+def logPrefetchError():
+	log.debugWarning("Cannot plan a path in advance", exc_info=True)
+
+
+def startProfiling():
+	global profilingTimer
+	if addonProfiler.running:
+		return
+	addonProfiler.start()
+	profilingTimer = wx.CallLater(config.conf["goldenCursor"]["profileDuration"] * 1000, stopProfiling)
+	# Translators: Reported when profiling of the add-on starts.
+	ui.message(_("Profiling started"))
+
+
+def stopProfiling():
+	global profilingTimer
+	if profilingTimer is not None:
+		profilingTimer.Stop()
+		profilingTimer = None
+	try:
+		fileName = addonProfiler.stop()
+	except Exception:
+		log.error("Cannot write the Cursor Movements profile", exc_info=True)
+		return
+	if fileName:
+		log.info("Cursor Movements profile written to %s" % fileName)
+		# Translators: Reported when profiling of the add-on stops, followed by the folder of the report.
+		ui.message(_("Profiling stopped, report saved in %s") % os.path.dirname(fileName))
+
+
+def markGesture():
+	# The latency of a move is measured from the gesture that asked for it.
+	if probes.enabled:
+		probes.mark("firstMove")
+		probes.mark("arrival")
+
+
+def getPlaybackRate():
+	# 0 follows the display, DEFAULT_RATE is used when its refresh rate is not known.
+	return config.conf["goldenCursor"]["playbackRate"] or injectionBackend.refreshRate() or DEFAULT_RATE
+
+
 class EnterPositionName(wx.TextEntryDialog):
 	"""
 	This subclass of the wx.TextEntryDialog class was created to
@@ -92,6 +209,72 @@ class EnterPositionName(wx.TextEntryDialog):
 		super(EnterPositionName, self).__init__(*args, **kwargs)
 
 
+class VirtualPositionsList(wx.ListCtrl):
+	"""
+	Report list of mouse positions in virtual mode: rows are drawn on demand from a PositionTable,
+	so opening the list and editing a row take the same time however many positions there are.
+	Create it with the wx.LC_VIRTUAL style.
+	"""
+
+	def __init__(self, *args, **kwargs):
+		super(VirtualPositionsList, self).__init__(*args, **kwargs)
+		self.positions = PositionTable()
+		self.rows = []
+		self._rowOf = {}
+
+	def setPositions(self, positions):
+		self.positions = positions
+		self.setRows(list(positions.keys()))
+
+	def setRows(self, rows):
+		# Shows only the positions named in rows, in that order.
+		self.rows = rows
+		self._rowOf = None
+		self.SetItemCount(len(self.rows))
+		if self.rows:
+			self.RefreshItems(0, len(self.rows) - 1)
+
+	def OnGetItemText(self, item, column):
+		name = self.rows[item]
+		if column == 0:
+			return name
+		position = self.positions[name]
+		if column == 1:
+			return str(position.x)
+		if column == 2:
+			return str(position.y)
+		return gestureLabel(position.gesture)
+
+	def nameAt(self, index):
+		return self.rows[index]
+
+	def rowOf(self, name):
+		# Built again lazily after a deletion shifted the rows.
+		if self._rowOf is None:
+			self._rowOf = {rowName: row for row, rowName in enumerate(self.rows)}
+		return self._rowOf.get(name)
+
+	def refreshName(self, name):
+		row = self.rowOf(name)
+		if row is not None:
+			self.RefreshItem(row)
+
+	def renameRow(self, index, name):
+		oldName = self.rows[index]
+		self.rows[index] = name
+		if self._rowOf is not None:
+			del self._rowOf[oldName]
+			self._rowOf[name] = index
+		self.RefreshItem(index)
+
+	def deleteRow(self, index):
+		del self.rows[index]
+		self._rowOf = None
+		self.SetItemCount(len(self.rows))
+		if index < len(self.rows):
+			self.RefreshItems(index, len(self.rows) - 1)
+
+
 class PositionsList(wx.Dialog):
 	"""
 	This common dialogue has been created to facilitate access to the following choices:
@@ -110,7 +293,10 @@ J	accessible via the nvda+windows+j shortcut.
 			return super(cls, cls).__new__(cls, parent, *args, **kwargs)
 		return inst
 
-	def __init__(self, parent, appName=None, goto=False):
+	def __init__(
+		self, parent, appName=None, goto=False, positions=None, store=None, shortCutIndex=None, onChange=None,
+		spatialIndex=None
+	):
 		inst = PositionsList._instance() if PositionsList._instance else None
 		if inst:
 			return
@@ -120,6 +306,13 @@ J	accessible via the nvda+windows+j shortcut.
 
 		if appName:
 			super(PositionsList, self).__init__(parent, title=_("Mouse positions for %s") % (appName), size=(420, 300))
+			# Edits go to the same positions and shortcut index used by the click shortcuts,
+			# onChange is called after a shortcut was added, moved or removed.
+			self.positions = positions
+			self.store = store
+			self.shortCutIndex = shortCutIndex
+			self.spatialIndex = spatialIndex
+			self.onChange = onChange
 			self.mousePositionsList(appName=appName)
 		elif goto:
 			super(PositionsList, self).__init__(parent, title=_("New mouse position"))
@@ -127,13 +320,22 @@ J	accessible via the nvda+windows+j shortcut.
 
 	def mousePositionsList(self, appName):
 		self.appName = appName
-		self.positions = ConfigObj(os.path.join(CMMousePositions, f"{appName}.cm"), encoding="UTF-8")
 		mainSizer = wx.BoxSizer(wx.VERTICAL)
 		sHelper = gui.guiHelper.BoxSizerHelper(self, orientation=wx.VERTICAL)
+		self.searchIndex = SearchIndex()
+		for name, position in self.positions.items():
+			self.searchIndex.set(name, positionText(name, position))
+		self.filterEdit = sHelper.addLabeledControl(
+			# Translators: The label of a field to show only the mouse positions containing the typed text
+			# in their name, coordinates or shortcut.
+			_("&Filter"), wx.TextCtrl
+		)
+		self.filterEdit.Bind(wx.EVT_TEXT, self.onFilter)
 		# Translators: The label for the list view of the mouse positions in the current application.
 		mousePositionsText = _("&Saved mouse positions")
 		self.mousePositionsList = sHelper.addLabeledControl(
-			mousePositionsText, wx.ListCtrl, style=wx.LC_REPORT | wx.LC_SINGLE_SEL, size=(550, 350)
+			mousePositionsText, VirtualPositionsList,
+			style=wx.LC_REPORT | wx.LC_VIRTUAL | wx.LC_SINGLE_SEL, size=(550, 350)
 		)
 		self.listItems()
 		self.mousePositionsList.Select(0, on=1)
@@ -194,21 +396,19 @@ J	accessible via the nvda+windows+j shortcut.
 		# Translators: the column in mouse positions list to identify the Shortcut.
 		self.mousePositionsList.InsertColumn(3, _("shortCut"), width=100)
 		self.mousePositionsList.Bind(wx.EVT_LIST_ITEM_ACTIVATED, self.onJump)
-		for entry in self.positions.keys():
-			list = self.positions[entry].split(",")
-			x = list[0]
-			y = list[1]
-			try:
-				z = list[2]
-			except Exception:
-				z = "None"
-			self.mousePositionsList.Append((entry, x, y, z))
+		self.mousePositionsList.setPositions(self.positions)
+
+	def onFilter(self, event):
+		self.mousePositionsList.setRows(self.searchIndex.search(self.filterEdit.GetValue()))
+		if self.mousePositionsList.GetItemCount():
+			self.mousePositionsList.Select(0, on=1)
+			self.mousePositionsList.SetItemState(0, wx.LIST_STATE_FOCUSED, wx.LIST_STATE_FOCUSED)
 
 	def jumpToPosition(self):
 		mainSizer = wx.BoxSizer(wx.VERTICAL)
 		mouseJumpHelper = gui.guiHelper.BoxSizerHelper(self, orientation=wx.VERTICAL)
 
-		x, y = winUser.getCursorPos()
+		x, y = injectionBackend.position()
 		w, h = api.getDesktopObject().location[2:]
 		self.xPos = mouseJumpHelper.addLabeledControl(
 			_("&X position"), gui.nvdaControls.SelectOnFocusSpinCtrl, min=0, max=w - 1, initial=x
@@ -228,7 +428,9 @@ J	accessible via the nvda+windows+j shortcut.
 
 	def onRename(self, event):
 		index = self.mousePositionsList.GetFirstSelected()
-		oldName = self.mousePositionsList.GetItemText(index)
+		if index < 0:
+			return
+		oldName = self.mousePositionsList.nameAt(index)
 		name = wx.GetTextFromUser(
 			# Translators: The label of a field to enter a new name for a mouse position/tag.
 			_("New name"),
@@ -246,10 +448,13 @@ J	accessible via the nvda+windows+j shortcut.
 				_("Error"), wx.OK | wx.ICON_ERROR, self
 			)
 			return
-		self.mousePositionsList.SetItemText(index, name)
+		self.mousePositionsList.renameRow(index, name)
 		self.mousePositionsList.SetFocus()
-		self.positions[name] = self.positions[oldName]
-		del self.positions[oldName]
+		self.positions.rename(oldName, name)
+		self.searchIndex.rename(oldName, name, positionText(name, self.positions[name]))
+		self.shortCutIndex.rename(oldName, name)
+		self.spatialIndex.rename(("saved", oldName), ("saved", name))
+		self.store.renamePosition(self.appName, self.positions, oldName, name)
 
 	def onAdd(self, event):
 		# Translators: The prompt to enter a gesture
@@ -257,18 +462,13 @@ J	accessible via the nvda+windows+j shortcut.
 		t.start()
 		inputCore.manager._captureFunc = self.addGestureCaptor
 
-	def saveShortCut(self, str):
-		global shortCut
+	def saveShortCut(self, identifier):
 		index = self.mousePositionsList.GetFirstSelected()
-		name = self.mousePositionsList.GetItemText(index)
-		list = self.positions[name].split(",")
-		x = list[0]
-		y = list[1]
-		shortCut = str.split(":")[1]
-		shortCut = shortCut.replace("control", "CONTROL")
-		if shortCut in [
-			"tab", "shift+tab", "upArrow", "downArrow", "leftArrow", "rightArrow", "home", "end", "escape",
-			"pageUp", "pageDown", ",", "numpadEnter", "space", "enter"]:
+		if index < 0:
+			return
+		name = self.mousePositionsList.nameAt(index)
+		shortCut = identifier.split(":")[1]
+		if shortCut.lower() in CMReservedShortCuts:
 			gui.messageBox(
 				# Translators: Message displayde if shortCut is not valid.
 				_("This shortCut is not valid, choose another one please"),
@@ -276,16 +476,15 @@ J	accessible via the nvda+windows+j shortcut.
 				_("Information"), wx.OK | wx.ICON_INFORMATION
 			)
 			return
-		for k, v in self.positions.items():
-			if "," + shortCut in v:
-				newV = v.replace("," + shortCut, "")
-				self.positions[k] = newV
-		self.positions[name] = x + "," + y + "," + shortCut
-		self.mousePositionsList.ClearAll()
-		self.listItems()
-		self.mousePositionsList.Select(index, on=1)
+		# The gesture is taken away from the position that had it before, if any.
+		for changed in self.positions.setGesture(name, identifier):
+			self.shortCutIndex.set(changed, self.positions[changed])
+			self.searchIndex.set(changed, positionText(changed, self.positions[changed]))
+			self.store.setPosition(self.appName, self.positions, changed)
+			# Only the rows whose shortcut changed are redrawn.
+			self.mousePositionsList.refreshName(changed)
+		self.onChange()
 		self.mousePositionsList.SetFocus()
-		self.mousePositionsList.SetItemState(index, wx.LIST_STATE_FOCUSED, wx.LIST_STATE_FOCUSED)
 		t = threading.Timer(0.2, ui.message, [_("Shortcut added successfully")])
 		t.start()
 
@@ -293,13 +492,15 @@ J	accessible via the nvda+windows+j shortcut.
 		if gesture.isModifier:
 			return False
 		inputCore.manager._captureFunc = None
-		wx.CallAfter(self.saveShortCut, gesture.identifiers[-1])
+		wx.CallAfter(self.saveShortCut, gesture.normalizedIdentifiers[-1])
 		return False
 
 	def deletePosition(self, clearPositions=False):
 		message, title = "", ""
 		entry = self.mousePositionsList.GetFirstSelected()
-		name = self.mousePositionsList.GetItemText(entry)
+		if entry < 0 and not clearPositions:
+			return
+		name = self.mousePositionsList.nameAt(entry) if entry >= 0 else None
 		if not clearPositions:
 			message = _(
 				# Translators: The confirmation prompt displayed when the user requests to delete the selected tag.
@@ -320,14 +521,22 @@ J	accessible via the nvda+windows+j shortcut.
 		) == wx.NO:
 			return
 		if not clearPositions:
-			del self.positions[name]
-			self.mousePositionsList.DeleteItem(entry)
-			self.positions.write()
+			self.positions.remove(name)
+			self.searchIndex.remove(name)
+			self.shortCutIndex.remove(name)
+			self.spatialIndex.remove(("saved", name))
+			self.onChange()
+			self.mousePositionsList.deleteRow(entry)
+			self.store.removePosition(self.appName, self.positions, name)
 			if self.mousePositionsList.GetItemCount() > 0:
 				self.mousePositionsList.Select(0, on=1)
-		if clearPositions or self.mousePositionsList.GetItemCount() == 0:
-			os.remove(self.positions.filename)
+		if clearPositions or len(self.positions) == 0:
+			self.store.delete(self.appName)
+			for name in self.positions:
+				self.spatialIndex.remove(("saved", name))
 			self.positions.clear()
+			self.shortCutIndex.clear()
+			self.onChange()
 			gui.messageBox(
 				# Translators: A dialog message shown when tags for the application is cleared.
 				_("All mouse positions for the application {appName} have been deleted.").format(appName=self.appName),
@@ -344,21 +553,20 @@ J	accessible via the nvda+windows+j shortcut.
 
 	def onJump(self, event):
 		index = self.mousePositionsList.GetFirstSelected()
-		name = self.mousePositionsList.GetItemText(index)
-		list = self.positions[name].split(",")
-		self.Destroy()
-		self.positions.write()
-		try:
-			x, y = list[0], list[1]
-		except Exception:
+		if index < 0:
 			return
+		name = self.mousePositionsList.nameAt(index)
+		position = self.positions[name]
+		self.Destroy()
+		# Edits are saved in the background, do not wait for the idle delay once the dialog is gone.
+		self.store.flush()
 		self.positions = None
-		wx.CallLater(500, setMousePosition, int(x), int(y))
+		wx.CallLater(500, setMousePosition, position.x, position.y)
 
 	def onClose(self, evt):
+		# Edits are saved in the background, do not wait for the idle delay once the dialog is gone.
 		self.Destroy()
-		if len(self.positions):
-			self.positions.write()
+		self.store.flush()
 		self.positions = None
 
 	def onOk(self, evt):
@@ -380,8 +588,44 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
 	def __init__(self, *args, **kwargs):
 		super(GlobalPlugin, self).__init__(*args, **kwargs)
-		self.list_of_points = [] #["1000,1000", "1500,900", "2000,1100", "200,200"]
+		# Waypoints visited by the arrow scripts, the oldest are dropped once the configured capacity is reached.
+		self.list_of_points = WaypointBuffer(
+			config.conf["goldenCursor"]["waypointCapacity"], config.conf["goldenCursor"]["skipRepeatedWaypoints"]
+		)
 		self.current_idx = -1
+		self.positions = PositionTable()
+		# Focus changes read saved shortcuts from here, not from disk.
+		self.positionFiles = openPositionStore()
+		# Shortcuts are only rebound when the focused application or its position file changes.
+		self.currentApp = None
+		self.currentPositions = None
+		self.boundShortCuts = frozenset()
+		# Application name to (positions, ShortCutIndex), rebuilt only when the position file is parsed again.
+		self.shortCutIndexes = {}
+		self.shortCutIndex = ShortCutIndex(inputCore.normalizeGestureIdentifier)
+		# Saved positions of the focused application, keyed ("saved", name), and waypoints,
+		# keyed ("waypoint", number of waypoints added before), for the jumps to the nearest position.
+		self.spatialIndex = SpatialIndex()
+		self.rebindTimer = None
+		# The live recording in progress, if any.
+		self.recorder = None
+		self.defaultGestures = {
+			inputCore.normalizeGestureIdentifier(identifier): script
+			for identifier, script in self.__gestures.items()
+		}
+		# Cursor positions are handed to the main thread one at a time, never queued up.
+		self.moveDispatcher = LatestPositionDispatcher(wx.CallAfter, setMousePosition)
+		self.motion = ActiveMotion(self.moveDispatcher, planner=self.planPath, onArrived=self.onArrived)
+		# Planning also happens on the prefetch thread.
+		self.pathCacheLock = threading.Lock()
+		probes.enabled = config.conf["goldenCursor"]["latencyProbes"]
+		self.pathCache = TrajectoryCache()
+		self.prefetcher = PathPrefetcher(self.planNewPath, onError=logPrefetchError)
+		if config.conf["goldenCursor"]["persistPathCache"] and os.path.exists(CMPathCache):
+			try:
+				self.pathCache.load(CMPathCache)
+			except Exception:
+				pass
 		gui.settingsDialogs.NVDASettingsDialog.categoryClasses.append(cursorMovementsSettings)
 		try:
 			self.getShortCut()
@@ -389,41 +633,95 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			pass
 
 	def terminate(self):
+		stopProfiling()
+		if self.recorder is not None:
+			self.recorder.stop()
+		self.motion.stop()
+		self.prefetcher.close()
+		if self.rebindTimer is not None:
+			self.rebindTimer.Stop()
+		self.positionFiles.close()
+		if config.conf["goldenCursor"]["persistPathCache"] and len(self.pathCache):
+			try:
+				self.pathCache.save(CMPathCache)
+			except Exception:
+				pass
 		try:
-			gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(CursorMovementsSettings)
-		except IndexError:
+			gui.settingsDialogs.NVDASettingsDialog.categoryClasses.remove(cursorMovementsSettings)
+		except ValueError:
 			pass
 
 	def event_gainFocus(self, obj, nextHandler):
-		self.getShortCut()
+		appModule = getattr(obj, "appModule", None)
+		if appModule is not None and appModule.appName == self.currentApp:
+			# Focus moved within the same application, this is a cache lookup at most.
+			self.getShortCut()
+		else:
+			if probes.enabled:
+				# Measured until the shortcuts of the newly focused application are bound.
+				probes.mark("rebind")
+			if self.rebindTimer is not None and self.rebindTimer.IsRunning():
+				# A burst of focus events while switching applications, rebind once it settles.
+				self.rebindTimer.Restart(CMBindingDebounce)
+			else:
+				self.rebindTimer = wx.CallLater(CMBindingDebounce, self.getShortCut)
 		nextHandler()
 
 	def getShortCut(self):
+		if probes.enabled:
+			probes.markEnd("rebind", "focusToRebind")
 		appName = api.getFocusObject().appModule.appName
-		if not os.path.exists(os.path.join(CMMousePositions, f"{appName}.gc")):
-			self.clearGestureBindings()
-			self.bindGestures(self.__gestures)
+		positions = self.positionFiles.get(appName)
+		if appName == self.currentApp and positions is self.currentPositions:
 			return
+		self.currentApp = appName
+		self.currentPositions = positions
+		if positions is None:
+			self.positions = PositionTable()
+			self.shortCutIndex = ShortCutIndex(inputCore.normalizeGestureIdentifier)
 		else:
-			self.positions = ConfigObj(os.path.join(CMMousePositions, f"{appName}.gc"), encoding="UTF-8")
-			for entry in self.positions.values():
-				try:
-					self.bindGesture(f"kb:{entry.split(',')[2]}", "click")
-				except Exception:
-					pass
+			self.positions = positions
+			self.shortCutIndex = self.getShortCutIndex(appName, positions)
+		self.applyShortCuts(self.shortCutIndex.gestures)
+		self.indexSavedPositions()
+
+	def indexSavedPositions(self):
+		# Waypoints stay indexed, the saved positions are those of the focused application.
+		index = self.spatialIndex
+		for key in [key for key in index.keys() if key[0] == "saved"]:
+			index.remove(key)
+		for name, position in self.positions.items():
+			index.insert(("saved", name), position.x, position.y)
+
+	def getShortCutIndex(self, appName, positions):
+		cached = self.shortCutIndexes.get(appName)
+		if cached is None or cached[0] is not positions:
+			cached = self.shortCutIndexes[appName] = (
+				positions, ShortCutIndex(inputCore.normalizeGestureIdentifier, positions)
+			)
+		return cached[1]
+
+	def refreshShortCuts(self):
+		# Called by the positions dialog after it changed the shortcut index of the focused application.
+		self.applyShortCuts(self.shortCutIndex.gestures)
+
+	def applyShortCuts(self, gestures):
+		# Only the difference with the shortcuts currently bound is applied to the gesture map.
+		for identifier in self.boundShortCuts - gestures:
+			self.removeGestureBinding(identifier)
+			if identifier in self.defaultGestures:
+				# The shortcut had replaced one of our own gestures, restore it.
+				self.bindGesture(identifier, self.defaultGestures[identifier])
+		for identifier in gestures - self.boundShortCuts:
+			self.bindGesture(identifier, "click")
+		self.boundShortCuts = gestures
 
 	def script_click(self, gesture):
-		for entry in self.positions.values():
-			if entry.count(",") == 1:
-				entry = entry + ",*"
-			entry = entry.replace("CONTROL", "ctrl")
-			try:
-				if gesture.displayName == entry.split(",")[2]:
-					x, y = entry.split(',')[:2]
-					wx.CallAfter(setMousePosition, int(x), int(y), announceMousePosition=False, click=True)
-					break
-			except Exception:
-				return
+		if probes.enabled:
+			probes.mark("firstMove")
+		position = self.shortCutIndex.lookup(gesture.normalizedIdentifiers)
+		if position is not None:
+			wx.CallAfter(setMousePosition, position[0], position[1], announceMousePosition=False, click=True)
 
 	@scriptHandler.script(
 		# Translators: input help message for a Golden Cursor command.
@@ -433,12 +731,21 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 	def script_mousePositionsList(self, gesture):
 		# Don't even think about opening this dialog if positions list does not exist.
 		appName = api.getFocusObject().appModule.appName
-		if not os.path.exists(os.path.join(CMMousePositions, f"{appName}.gc")):
+		positions = self.positionFiles.get(appName)
+		if positions is None:
 			# Translators: message presented when no mouse positions are available for the focused app.
 			ui.message(_("No mouse positions for %s.") % appName)
 		else:
+			shortCutIndex = self.getShortCutIndex(appName, positions)
+			if appName == self.currentApp:
+				onChange, spatialIndex = self.refreshShortCuts, self.spatialIndex
+			else:
+				onChange, spatialIndex = lambda: None, SpatialIndex()
 			try:
-				d = PositionsList(parent=gui.mainFrame, appName=appName)
+				d = PositionsList(
+					parent=gui.mainFrame, appName=appName, positions=positions, store=self.positionFiles,
+					shortCutIndex=shortCutIndex, onChange=onChange, spatialIndex=spatialIndex
+				)
 				gui.mainFrame.prePopup()
 				d.Raise()
 				d.Show()
@@ -452,10 +759,8 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		gesture="kb:nvda+shift+l"
 	)
 	def script_saveMousePosition(self, gesture):
-		appName = "Current"
-		x, y = winUser.getCursorPos()
-		# Stringify coordinates early.
-		x, y = str(x), str(y)
+		appName = api.getFocusObject().appModule.appName
+		x, y = injectionBackend.position()
 		d = EnterPositionName(
 			# Translators: edit field label for new mouse position.
 			gui.mainFrame, _("Enter the name for the current mouse position (x: {positionX}, Y: {positionY}").format(
@@ -470,17 +775,22 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				name = d.GetValue().rstrip()
 				if name == "":
 					return
-				# appName = self.getMouse().appModule.appName
-				# If the files path does not exist, create it now.
-				if not os.path.exists(CMMousePositions):
-					os.mkdir(CMMousePositions)
-				position = ConfigObj(os.path.join(CMMousePositions, f"{appName}.gc"), encoding="UTF-8")
-				position[name] = ",".join([x, y])
-				entry = ",".join([x, y])
-				list_of_points.add(entry)
-				position.write()
+				# The files path is created on the first write if needed.
+				positions = self.positionFiles.get(appName) or PositionTable()
+				positions.set(name, Position(x, y))
+				self.addMousePosition(x, y)
+				self.positionFiles.setPosition(appName, positions, name)
+				# Saving over a position drops its shortcut.
+				shortCutIndex = self.getShortCutIndex(appName, positions)
+				shortCutIndex.set(name, positions[name])
+				if appName == self.currentApp:
+					# The table is new when it is the first position of the application.
+					self.currentPositions = self.positions = positions
+					self.shortCutIndex = shortCutIndex
+					self.refreshShortCuts()
+					self.spatialIndex.insert(("saved", name), x, y)
 				# Translators: presented when position (tag) has been saved.
-				ui.message(_("Position saved in %s.") % position.filename)
+				ui.message(_("Position saved in %s.") % self.positionFiles.fileName(appName))
 		gui.runScriptModalDialog(d, callback)
 
 
@@ -493,52 +803,6 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		reportMousePosition()
 		self.addMousePosition()
 
-	def wind_mouse(obj, start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12, move_mouse=lambda x,y: None):
-		'''
-		WindMouse algorithm. Calls the move_mouse kwarg with each new step.
-		Released under the terms of the GPLv3 license.
-		G_0 - magnitude of the gravitational force
-		W_0 - magnitude of the wind force fluctuations
-		M_0 - maximum step size (velocity clip threshold)
-		D_0 - distance where wind behavior changes from random to damped
-		'''
-		current_x,current_y = start_x,start_y
-		v_x = v_y = W_x = W_y = 0
-		dist = np.hypot(dest_x - start_x, dest_y - start_y)
-		while dist >= 1:
-			W_mag = min(W_0, dist)
-			if dist >= D_0:
-				W_x = W_x/sqrt3 + (2*random.random()-1)*W_mag/sqrt5
-				W_y = W_y/sqrt3 + (2*random.random()-1)*W_mag/sqrt5
-			else:
-				W_x /= sqrt3
-				W_y /= sqrt3
-				if M_0 < 3:
-					M_0 = random.random()*3 + 3
-				else:
-					M_0 /= sqrt5
-			v_x += W_x + G_0*(dest_x-start_x)/dist
-			v_y += W_y + G_0*(dest_y-start_y)/dist
-			v_mag = np.hypot(v_x, v_y)
-			if v_mag > M_0:
-				v_clip = M_0/2 + random.random()*M_0/2
-				v_x = (v_x/v_mag) * v_clip
-				v_y = (v_y/v_mag) * v_clip
-			start_x += v_x
-			start_y += v_y
-			# from the while statement
-			dist = np.hypot(dest_x - start_x, dest_y - start_y)
-			move_x = int(round(start_x))
-			move_y = int(round(start_y))
-			if current_x != move_x or current_y != move_y:
-				#This should wait for the mouse polling interval
-				#time.sleep(0.0001)
-				setMousePosition(move_x,move_y)
-				current_x =move_x
-				current_y =move_y
-
-		return current_x,current_y
-
 	@scriptHandler.script(
 		# Translators: Input help message for a Golden Cursor command.
 		description=_("Moves the Mouse pointer to the right"),
@@ -553,29 +817,102 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
 	def addMousePosition(self, x=None, y=None):
 		if x is None:
-			cursorPos = winUser.getCursorPos()
+			cursorPos = injectionBackend.position()
 			if x is None:
 				x = cursorPos[0]
 			if y is None:
 				y = cursorPos[1]
 
-		entry = ",".join([str(x), str(y)])
-		self.list_of_points.append(entry)
+		points = self.list_of_points
+		points.skipRepeated = config.conf["goldenCursor"]["skipRepeatedWaypoints"]
+		capacity = config.conf["goldenCursor"]["waypointCapacity"]
+		dropped = points.dropped
+		if capacity != points.capacity:
+			points.resize(capacity)
+		if points.append(x, y):
+			self.spatialIndex.insert(("waypoint", points.dropped + len(points) - 1), x, y)
+		if points.dropped != dropped:
+			for number in range(dropped, points.dropped):
+				self.spatialIndex.remove(("waypoint", number))
+			# Keep pointing at the same waypoint, or at the oldest one if it was dropped.
+			self.current_idx = max(0, self.current_idx - (points.dropped - dropped))
+
+	def planPath(self, startX, startY, destX, destY, velocity=(0.0, 0.0)):
+		start = probes.now() if probes.enabled else None
+		path = None
+		if velocity == (0.0, 0.0):
+			# A move from rest may have been planned already while the cursor was resting.
+			path = self.prefetcher.take((startX, startY), (destX, destY), self.planningContext())
+		if path is None:
+			path = self.planNewPath(startX, startY, destX, destY, velocity)
+		if start is not None:
+			probes.since("plan", start)
+		return path
+
+	def planNewPath(self, startX, startY, destX, destY, velocity=(0.0, 0.0)):
+		path = self.planModelPath(startX, startY, destX, destY, velocity)
+		duration = config.conf["goldenCursor"]["moveDuration"]
+		if duration:
+			# Every move takes the same time whatever the distance, to match a narration track.
+			# A retargeted move leaves at the speed the cursor had instead of starting from rest.
+			easing = speedEasing(math.hypot(*velocity), path.length, duration / 1000.0)
+			path = resampleToDuration(path, duration / 1000.0, getPlaybackRate(), easing)
+		return self.thinPath(path)
+
+	def thinPath(self, path):
+		# Samples that would not visibly change the movement are not injected.
+		tolerance = config.conf["goldenCursor"]["decimationTolerance"]
+		if not tolerance:
+			return path
+		# A position is still sent every MAX_GAP_FRAMES frames, so the cursor keeps moving smoothly.
+		return decimate(path, tolerance, MAX_GAP_FRAMES / float(getPlaybackRate()))[0]
+
+	def planModelPath(self, startX, startY, destX, destY, velocity=(0.0, 0.0)):
+		# Repeatable paths are seeded and served from the cache, so every take of a tour is identical.
+		# A path continuing an interrupted move depends on its velocity and is never cached.
+		repeatable = config.conf["goldenCursor"]["repeatablePaths"]
+		seed = config.conf["goldenCursor"]["pathSeed"] if repeatable else None
+		model = getMotionModel(config.conf["goldenCursor"]["motionModel"])
+		if model.name != "windMouse":
+			# Closed form models are sampled directly at the playback rate, there is nothing worth caching.
+			return model.plan(startX, startY, destX, destY, getPlaybackRate(), velocity=velocity, seed=seed)
+		if not repeatable or velocity != (0.0, 0.0):
+			return planWindMouse(startX, startY, destX, destY, velocity=velocity)
+		with self.pathCacheLock:
+			return self.pathCache.plan(startX, startY, destX, destY, seed=seed)
+
+	def planningContext(self):
+		# Everything besides start and destination that changes a planned path.
+		conf = config.conf["goldenCursor"]
+		return (
+			conf["motionModel"], conf["moveDuration"], conf["repeatablePaths"], conf["pathSeed"], getPlaybackRate(),
+			conf["decimationTolerance"]
+		)
+
+	def onArrived(self, playback):
+		# Called from the playback thread.
+		if probes.enabled:
+			probes.markEnd("arrival", "gestureToArrival")
+		wx.CallAfter(self.prefetchNeighbours)
+
+	def prefetchNeighbours(self):
+		# Plans the moves of the four arrow commands from the waypoint the cursor rests on.
+		points = self.list_of_points
+		if self.motion.moving or not len(points):
+			return
+		last = len(points) - 1
+		index = min(max(self.current_idx, 0), last)
+		targets = [points[min(index + 1, last)], points[max(index - 1, 0)], points[0], points[last]]
+		self.prefetcher.prefetch(injectionBackend.position(), targets, self.planningContext())
 
 	def gotoCursorPosition(self, idx):
 		if self.current_idx < 0 or self.current_idx >= len(self.list_of_points):
 			return
-		x, y = winUser.getCursorPos()
-		entry = self.list_of_points[idx]
-		if entry.count(",") == 1:
-			entry = entry + ",*"
-			
-		try:
-			to_x, to_y = entry.split(',')[:2]
-			wx.CallAfter(self.wind_mouse, x, y, int(to_x), int(to_y))
-		except Exception:
-			pass
-		
+		to_x, to_y = self.list_of_points[idx]
+		markGesture()
+		# A move still in progress is retargeted from where the cursor currently is.
+		self.motion.rate = getPlaybackRate()
+		self.motion.moveTo(to_x, to_y, injectionBackend.position())
 
 	@scriptHandler.script(
 		# Translators: Input help message for a Golden Cursor command.
@@ -606,9 +943,270 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		self.current_idx = 0
 		self.gotoCursorPosition(self.current_idx)
 
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer through all waypoints in one continuous movement"),
+		gesture="kb:nvda+windows+t"
+	)
+	def script_playTour(self, gesture):
+		points = list(self.list_of_points)
+		if not points:
+			# Translators: Reported when a tour is requested but no waypoints were collected.
+			ui.message(_("No waypoints"))
+			return
+		markGesture()
+		conf = config.conf["goldenCursor"]
+		# The whole tour is planned before the cursor starts moving. With thousands of waypoints that takes
+		# a while, so it happens on its own thread.
+		t = threading.Thread(
+			target=self.planTourPath, name="cursorMovements.tour", args=(
+				injectionBackend.position(), points, conf["tourOrder"] == "shortest", getPlaybackRate(),
+				conf["tourDwell"] / 1000.0
+			)
+		)
+		t.daemon = True
+		t.start()
+
+	def planTourPath(self, start, points, shortest, rate, dwell):
+		# Runs on the tour thread.
+		try:
+			order = shortestOrder(start, points) if shortest else list(range(len(points)))
+			path = planTour(start, [points[index] for index in order], rate, dwell=dwell)
+		except Exception:
+			log.error("Cannot plan the tour", exc_info=True)
+			return
+		wx.CallAfter(self.startTour, path, order[-1], rate)
+
+	def startTour(self, path, last, rate):
+		# The arrow commands carry on from the last waypoint of the tour.
+		self.current_idx = last
+		self.motion.rate = rate
+		self.motion.play(self.thinPath(path))
+
+	def jumpToNearest(self, direction=None):
+		# Moves to the saved position or waypoint nearest to the cursor, optionally only looking in one direction.
+		x, y = injectionBackend.position()
+		key = self.spatialIndex.nearest(x, y, direction)
+		if key is None:
+			if direction:
+				# Translators: Reported when there is no saved position or waypoint in the requested direction.
+				ui.message(_("No position in that direction"))
+			else:
+				# Translators: Reported when there is no saved position or waypoint to jump to.
+				ui.message(_("No positions"))
+			return
+		if key[0] == "waypoint":
+			# The arrow commands carry on from this waypoint.
+			self.current_idx = key[1] - self.list_of_points.dropped
+		toX, toY = self.spatialIndex.point(key)
+		markGesture()
+		self.motion.rate = getPlaybackRate()
+		self.motion.moveTo(toX, toY, (x, y))
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer to the nearest saved position or waypoint on the right"),
+		gesture="kb:nvda+windows+shift+rightArrow"
+	)
+	def script_nearestRight(self, gesture):
+		self.jumpToNearest("right")
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer to the nearest saved position or waypoint on the left"),
+		gesture="kb:nvda+windows+shift+leftArrow"
+	)
+	def script_nearestLeft(self, gesture):
+		self.jumpToNearest("left")
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer to the nearest saved position or waypoint above"),
+		gesture="kb:nvda+windows+shift+upArrow"
+	)
+	def script_nearestUp(self, gesture):
+		self.jumpToNearest("up")
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer to the nearest saved position or waypoint below"),
+		gesture="kb:nvda+windows+shift+downArrow"
+	)
+	def script_nearestDown(self, gesture):
+		self.jumpToNearest("down")
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Moves the mouse pointer to the nearest saved position or waypoint"),
+		gesture="kb:nvda+windows+n"
+	)
+	def script_nearest(self, gesture):
+		self.jumpToNearest()
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_(
+			"Reports how long moves take to start and to arrive, and writes all latency statistics to the NVDA log. "
+			"Pressed twice, clears them"
+		),
+		gesture="kb:nvda+windows+shift+l"
+	)
+	def script_latencyReport(self, gesture):
+		if scriptHandler.getLastScriptRepeatCount() == 1:
+			probes.reset()
+			self.motion.clearStatistics()
+			# Translators: Reported when the latency statistics were cleared.
+			ui.message(_("Latency statistics cleared"))
+			return
+		if not probes.enabled:
+			# Translators: Reported when latency statistics are requested while they are not collected.
+			ui.message(_("Latency measurement is off, it can be turned on in the Cursor Movements settings"))
+			return
+		log.info("Cursor Movements latency in milliseconds:\n%s" % probes.report())
+		motion = self.motion
+		if motion.thinnedMoves:
+			log.info("Cursor events of %d thinned moves that arrived: %d sent, %d dropped, %.1f sent per move" % (
+				motion.thinnedMoves, motion.sentEvents, motion.droppedEvents,
+				motion.sentEvents / float(motion.thinnedMoves)
+			))
+		errors = self.motion.timingErrors()
+		if errors:
+			# Moves with a fixed duration, late arrivals are positive.
+			log.info(
+				"Arrival of %d moves with a fixed duration, actual minus requested time: "
+				"mean %.1f, min %.1f, max %.1f milliseconds" % (
+					len(errors), sum(errors) / len(errors) * 1000, min(errors) * 1000, max(errors) * 1000
+				)
+			)
+		parts = []
+		for name, label in (
+			# Translators: Part of the latency report, followed by percentiles of the time until the cursor moves.
+			("gestureToFirstMove", _("first move")),
+			# Translators: Part of the latency report, followed by percentiles of the time until the cursor arrives.
+			("gestureToArrival", _("arrival")),
+		):
+			histogram = probes.histograms.get(name)
+			if histogram is None or not histogram.count:
+				continue
+			parts.append(
+				# Translators: Latency percentiles of one part of a move, in milliseconds.
+				_("{label}: median {p50:.0f}, 95% {p95:.0f}, 99% {p99:.0f} milliseconds").format(
+					label=label, p50=histogram.percentile(50) * 1000, p95=histogram.percentile(95) * 1000,
+					p99=histogram.percentile(99) * 1000
+				)
+			)
+		if not parts:
+			# Translators: Reported when latency statistics are requested before any move was measured.
+			parts.append(_("No moves measured yet"))
+		ui.message(". ".join(parts))
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Starts or stops profiling Cursor Movements, the report is saved in its settings folder"),
+		gesture="kb:nvda+windows+shift+p"
+	)
+	def script_toggleProfiling(self, gesture):
+		if addonProfiler.running:
+			stopProfiling()
+		else:
+			startProfiling()
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Starts recording the mouse movements, or stops and saves the recording under a name"),
+		gesture="kb:nvda+windows+r"
+	)
+	def script_toggleRecording(self, gesture):
+		if self.recorder is None:
+			self.recorder = Recorder(
+				injectionBackend.position, rate=config.conf["goldenCursor"]["recordingRate"],
+				tolerance=config.conf["goldenCursor"]["recordingTolerance"]
+			)
+			self.recorder.start()
+			# Translators: Reported when the recording of mouse movements starts.
+			ui.message(_("Recording"))
+			return
+		recorder, self.recorder = self.recorder, None
+		recorder.stop()
+		ring = recorder.ring
+		log.debug("Recorded %d of %d samples (%d skipped, %d dropped when full), %d bytes" % (
+			ring.points, recorder.samples, recorder.skippedSamples, ring.droppedPoints, ring.sizeBytes
+		))
+		if ring.points < 2:
+			# Translators: Reported when a recording stops before the mouse moved.
+			ui.message(_("Recording stopped, the mouse did not move"))
+			return
+		d = EnterPositionName(
+			# Translators: edit field label for the name of a recorded mouse movement.
+			gui.mainFrame, _("Enter the name for the recorded movement ({points} points, {size:.0f} KB)").format(
+				points=ring.points, size=ring.sizeBytes / 1024.0
+			),
+			# Translators: title for the dialog saving a recorded mouse movement.
+			_("Save recording")
+		)
+
+		def callback(result):
+			if result == wx.ID_OK:
+				name = recordingName(d.GetValue())
+				if name == "":
+					return
+				fileName = os.path.join(CMRecordings, name + ".cmr")
+				try:
+					ring.save(fileName)
+				except Exception:
+					log.error("Cannot save the recording %s" % fileName, exc_info=True)
+					# Translators: presented when a recorded mouse movement could not be saved.
+					ui.message(_("Cannot save the recording %s") % name)
+					return
+				# Translators: presented when a recorded mouse movement has been saved.
+				ui.message(_("Recording saved in %s.") % fileName)
+		gui.runScriptModalDialog(d, callback)
+
+	@scriptHandler.script(
+		# Translators: Input help message for a Cursor Movements command.
+		description=_("Opens a list of the saved recordings and replays the chosen mouse movement"),
+		gesture="kb:nvda+windows+shift+r"
+	)
+	def script_replayRecording(self, gesture):
+		if self.recorder is not None:
+			# Translators: Reported when a recording is to be replayed while another is being recorded.
+			ui.message(_("Stop recording first"))
+			return
+		names = []
+		if os.path.isdir(CMRecordings):
+			names = sorted(
+				os.path.splitext(fileName)[0] for fileName in os.listdir(CMRecordings) if fileName.endswith(".cmr")
+			)
+		if not names:
+			# Translators: Reported when there are no saved recordings to replay.
+			ui.message(_("No recordings"))
+			return
+		d = wx.SingleChoiceDialog(
+			# Translators: label of the list of saved recordings.
+			gui.mainFrame, _("Choose the recording to replay"),
+			# Translators: title of the dialog listing the saved recordings.
+			_("Replay recording"), names
+		)
+
+		def callback(result):
+			if result != wx.ID_OK:
+				return
+			fileName = os.path.join(CMRecordings, names[d.GetSelection()] + ".cmr")
+			rate = getPlaybackRate()
+			try:
+				path = CompressedRing.load(fileName).toTrajectory(rate)
+			except Exception:
+				log.error("Cannot read the recording %s" % fileName, exc_info=True)
+				return
+			# The replay starts where the recording did.
+			self.motion.stop()
+			setMousePosition(path.startX, path.startY)
+			self.motion.rate = rate
+			self.motion.play(path)
+		gui.runScriptModalDialog(d, callback)
 
 	def getMouse(self):
-		return api.getDesktopObject().objectFromPoint(*winUser.getCursorPos())
+		return api.getDesktopObject().objectFromPoint(*injectionBackend.position())
 
 
 # Add-on config database
@@ -616,6 +1214,22 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 confspec = {
 	"reportNewMouseCoordinates": "boolean(default=true)",
 	"mouseMovementUnit": "integer(min=1, max=100, default=5)",
+	"playbackRate": "integer(min=0, max=500, default=0)",
+	"repeatablePaths": "boolean(default=false)",
+	"pathSeed": "integer(default=1)",
+	"persistPathCache": "boolean(default=false)",
+	"moveDuration": "integer(min=0, max=10000, default=0)",
+	"positionStorage": "option('files', 'database', default='files')",
+	"motionModel": "option('windMouse', 'minimumJerk', 'bezier', default='windMouse')",
+	"waypointCapacity": "integer(min=10, max=100000, default=1000)",
+	"skipRepeatedWaypoints": "boolean(default=true)",
+	"tourOrder": "option('recorded', 'shortest', default='recorded')",
+	"tourDwell": "integer(min=0, max=10000, default=0)",
+	"decimationTolerance": "integer(min=0, max=20, default=1)",
+	"latencyProbes": "boolean(default=false)",
+	"profileDuration": "integer(min=5, max=600, default=60)",
+	"recordingRate": "integer(min=10, max=1000, default=200)",
+	"recordingTolerance": "integer(min=0, max=20, default=1)",
 }
 config.conf.spec["goldenCursor"] = confspec
 
@@ -637,7 +1251,133 @@ class cursorMovementsSettings(gui.settingsDialogs.SettingsPanel):
 			_("Mouse movement &unit (in pixels)"), gui.nvdaControls.SelectOnFocusSpinCtrl,
 			min=1, max=100, initial=config.conf["goldenCursor"]["mouseMovementUnit"]
 		)
+		self.playbackRate = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings to change how many
+			# cursor positions are sent per second while moving. 0 uses the display refresh rate.
+			_("Movement &playback rate (positions per second, 0 matches the display)"),
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=0, max=500, initial=config.conf["goldenCursor"]["playbackRate"]
+		)
+		self.motionModelNames = list(motionModels.keys())
+		self.motionModelChoice = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings to choose how the cursor moves.
+			_("&Motion model"), wx.Choice, choices=[
+				# Translators: A motion model simulating gravity and wind forces.
+				_("WindMouse (simulated forces)"),
+				# Translators: A motion model moving in a straight line, accelerating and decelerating smoothly.
+				_("Minimum jerk (smooth straight line)"),
+				# Translators: A motion model moving along a randomly bent curve.
+				_("Bézier curve"),
+			]
+		)
+		self.motionModelChoice.SetSelection(
+			self.motionModelNames.index(config.conf["goldenCursor"]["motionModel"])
+		)
+		self.moveDuration = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings to give every move the same duration.
+			_("Move &duration (milliseconds, 0 lets the motion model decide)"),
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=0, max=10000, initial=config.conf["goldenCursor"]["moveDuration"]
+		)
+		self.decimationTolerance = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings. Cursor positions that are at most
+			# this many pixels away from where the cursor would be anyway, between the positions sent around them,
+			# are skipped.
+			_("Skip cursor positions within this many pi&xels of where the cursor would be anyway (0 sends them all)"),
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=0, max=20, initial=config.conf["goldenCursor"]["decimationTolerance"]
+		)
+		self.repeatablePathsCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("Use the same &path every time the cursor moves between two positions"))
+		)
+		self.repeatablePathsCheckBox.SetValue(config.conf["goldenCursor"]["repeatablePaths"])
+		self.persistPathCacheCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("&Keep repeatable paths when NVDA restarts"))
+		)
+		self.persistPathCacheCheckBox.SetValue(config.conf["goldenCursor"]["persistPathCache"])
+		self.waypointCapacity = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings to limit how many waypoints are kept,
+			# the oldest are forgotten beyond that.
+			_("Maximum number of &waypoints"), gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=10, max=100000, initial=config.conf["goldenCursor"]["waypointCapacity"]
+		)
+		self.skipRepeatedWaypointsCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("&Ignore a waypoint at the same position as the previous one"))
+		)
+		self.skipRepeatedWaypointsCheckBox.SetValue(config.conf["goldenCursor"]["skipRepeatedWaypoints"])
+		self.shortestTourCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("Visit waypoints in the &shortest order when playing a tour"))
+		)
+		self.shortestTourCheckBox.SetValue(config.conf["goldenCursor"]["tourOrder"] == "shortest")
+		self.tourDwell = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings to pause at each waypoint of a tour.
+			_("Pause at each &waypoint of a tour (milliseconds, 0 does not stop)"),
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=0, max=10000, initial=config.conf["goldenCursor"]["tourDwell"]
+		)
+		self.recordingRate = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings,
+			# how many times per second the mouse position is sampled while recording.
+			_("Recordin&g rate (samples per second)"), gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=10, max=1000, initial=config.conf["goldenCursor"]["recordingRate"]
+		)
+		self.recordingTolerance = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings. Recorded positions that are at most
+			# this many pixels away from the replayed movement are left out of the recording.
+			_("Leave &out recorded positions within this many pixels of the replay (0 keeps them all)"),
+			gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=0, max=20, initial=config.conf["goldenCursor"]["recordingTolerance"]
+		)
+		self.positionDatabaseCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("Store mouse positions in one data&base (after restarting NVDA)"))
+		)
+		self.positionDatabaseCheckBox.SetValue(config.conf["goldenCursor"]["positionStorage"] == "database")
+		self.positionDatabaseCheckBox.Enable(positionDatabase.isAvailable())
+		self.latencyProbesCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("Measure movement &latency"))
+		)
+		self.latencyProbesCheckBox.SetValue(config.conf["goldenCursor"]["latencyProbes"])
+		self.profilingCheckBox = gcHelper.addItem(
+			# Translators: This is the label for a checkbox in the Cursor Movements settings panel.
+			wx.CheckBox(self, label=_("P&rofile Cursor Movements now"))
+		)
+		self.profilingCheckBox.SetValue(addonProfiler.running)
+		self.profileDuration = gcHelper.addLabeledControl(
+			# Translators: The label for a setting in Cursor Movements settings,
+			# profiling stops by itself after this long.
+			_("Stop profiling after (&seconds)"), gui.nvdaControls.SelectOnFocusSpinCtrl,
+			min=5, max=600, initial=config.conf["goldenCursor"]["profileDuration"]
+		)
 
 	def onSave(self):
 		config.conf["goldenCursor"]["reportNewMouseCoordinates"] = self.mouseCoordinatesCheckBox.IsChecked()
 		config.conf["goldenCursor"]["mouseMovementUnit"] = self.mouseMovementUnit.Value
+		config.conf["goldenCursor"]["playbackRate"] = self.playbackRate.Value
+		config.conf["goldenCursor"]["motionModel"] = self.motionModelNames[self.motionModelChoice.GetSelection()]
+		config.conf["goldenCursor"]["moveDuration"] = self.moveDuration.Value
+		config.conf["goldenCursor"]["decimationTolerance"] = self.decimationTolerance.Value
+		config.conf["goldenCursor"]["latencyProbes"] = probes.enabled = self.latencyProbesCheckBox.IsChecked()
+		config.conf["goldenCursor"]["profileDuration"] = self.profileDuration.Value
+		if self.profilingCheckBox.IsChecked():
+			startProfiling()
+		else:
+			stopProfiling()
+		config.conf["goldenCursor"]["repeatablePaths"] = self.repeatablePathsCheckBox.IsChecked()
+		config.conf["goldenCursor"]["persistPathCache"] = self.persistPathCacheCheckBox.IsChecked()
+		config.conf["goldenCursor"]["waypointCapacity"] = self.waypointCapacity.Value
+		config.conf["goldenCursor"]["skipRepeatedWaypoints"] = self.skipRepeatedWaypointsCheckBox.IsChecked()
+		config.conf["goldenCursor"]["tourOrder"] = (
+			"shortest" if self.shortestTourCheckBox.IsChecked() else "recorded"
+		)
+		config.conf["goldenCursor"]["tourDwell"] = self.tourDwell.Value
+		config.conf["goldenCursor"]["recordingRate"] = self.recordingRate.Value
+		config.conf["goldenCursor"]["recordingTolerance"] = self.recordingTolerance.Value
+		config.conf["goldenCursor"]["positionStorage"] = (
+			"database" if self.positionDatabaseCheckBox.IsChecked() else "files"
+		)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Batched WindMouse simulation, used to tune motion parameters.
+# N independent simulations advance together in array form when NumPy is available.
+# NVDA does not ship NumPy, so without it every simulation runs through the scalar planner instead.
+
+from array import array
+import math
+
+from .trajectory import Trajectory, iterWindMouse, sqrt3, sqrt5, DEFAULT_STEP_INTERVAL, MAX_STEPS
+
+try:
+	import numpy
+except ImportError:
+	numpy = None
+
+
+class BatchResult(object):
+	"""
+	Outcome of a batch of simulations, one entry per simulation in each list.
+	overshoot is how far (pixels) the cursor went past the destination along the start-destination line.
+	paths holds the trajectories when they were requested, otherwise None.
+	"""
+
+	def __init__(self, steps, samples, overshoot, stepInterval, paths=None):
+		self.steps = steps
+		self.samples = samples
+		self.overshoot = overshoot
+		self.stepInterval = stepInterval
+		self.paths = paths
+
+	def __len__(self):
+		return len(self.steps)
+
+	@property
+	def durations(self):
+		return [s * self.stepInterval for s in self.steps]
+
+
+def _broadcast(values, count):
+	if isinstance(values, (int, float)):
+		return [values] * count
+	values = list(values)
+	if len(values) != count:
+		raise ValueError("expected %d values, got %d" % (count, len(values)))
+	return values
+
+
+def _batchSize(*args):
+	sizes = set(len(a) for a in args if not isinstance(a, (int, float)))
+	if len(sizes) > 1:
+		raise ValueError("batch arguments have different lengths: %s" % sorted(sizes))
+	return sizes.pop() if sizes else 1
+
+
+def _overshoot(startX, startY, destX, destY, xs, ys):
+	dist = math.hypot(destX - startX, destY - startY)
+	if dist == 0 or not xs:
+		return 0.0
+	ux = (destX - startX) / dist
+	uy = (destY - startY) / dist
+	furthest = max((x - startX) * ux + (y - startY) * uy for x, y in zip(xs, ys))
+	return max(0.0, furthest - dist)
+
+
+def simulateBatch(
+	start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12,
+	seeds=0, stepInterval=DEFAULT_STEP_INTERVAL, maxSteps=MAX_STEPS, keepPaths=False, useNumpy=True
+):
+	"""
+	Runs a batch of WindMouse simulations.
+	Every argument up to seeds is either a single value shared by all simulations or a sequence with one
+	value per simulation. With NumPy a batch draws from one generator seeded by the first seed, so its paths
+	follow the same distribution as, but are not identical to, scalar paths planned with the same seeds.
+	"""
+	count = _batchSize(start_x, start_y, dest_x, dest_y, G_0, W_0, M_0, D_0, seeds)
+	args = [_broadcast(v, count) for v in (start_x, start_y, dest_x, dest_y, G_0, W_0, M_0, D_0, seeds)]
+	if numpy is not None and useNumpy:
+		return _simulateNumpy(args, stepInterval, maxSteps, keepPaths)
+	return _simulateScalar(args, stepInterval, maxSteps, keepPaths)
+
+
+def _simulateScalar(args, stepInterval, maxSteps, keepPaths):
+	steps, samples, overshoot, paths = [], [], [], []
+	for sx, sy, dx, dy, g, w, m, d, seed in zip(*args):
+		path = Trajectory(sx, sy)
+		for x, y, t in iterWindMouse(
+			sx, sy, dx, dy, g, w, m, d, seed=seed, stepInterval=stepInterval, maxSteps=maxSteps
+		):
+			path.append(x, y, t)
+		steps.append(int(round(path.duration / stepInterval)))
+		samples.append(len(path))
+		overshoot.append(_overshoot(sx, sy, dx, dy, path.xs, path.ys))
+		if keepPaths:
+			paths.append(path)
+	return BatchResult(steps, samples, overshoot, stepInterval, paths if keepPaths else None)
+
+
+def _simulateNumpy(args, stepInterval, maxSteps, keepPaths):  # noqa: C901
+	np = numpy
+	sx, sy, dx, dy, G, W0, M, D = [np.asarray(a, dtype=float) for a in args[:8]]
+	M = M.copy()
+	rng = np.random.default_rng(args[8][0])
+	count = len(sx)
+	x, y = sx.copy(), sy.copy()
+	vx, vy, wx, wy = (np.zeros(count) for i in range(4))
+	curX, curY = np.rint(sx), np.rint(sy)
+	dist = np.hypot(dx - x, dy - y)
+	# Like the scalar planner, steps count up to the last step that moved the cursor.
+	steps = np.zeros(count, dtype=np.int64)
+	samples = np.zeros(count, dtype=np.int64)
+	total = np.hypot(dx - sx, dy - sy)
+	safeTotal = np.where(total > 0, total, 1.0)
+	ux, uy = (dx - sx) / safeTotal, (dy - sy) / safeTotal
+	furthest = np.zeros(count)
+	history = []
+	for step in range(maxSteps):
+		active = dist >= 1
+		if not active.any():
+			break
+		r = rng.random((4, count))
+		wMag = np.minimum(W0, dist)
+		windy = active & (dist >= D)
+		calm = active & ~windy
+		wx = np.where(windy, wx / sqrt3 + (2 * r[0] - 1) * wMag / sqrt5, np.where(calm, wx / sqrt3, wx))
+		wy = np.where(windy, wy / sqrt3 + (2 * r[1] - 1) * wMag / sqrt5, np.where(calm, wy / sqrt3, wy))
+		M = np.where(calm & (M < 3), r[2] * 3 + 3, np.where(calm, M / sqrt5, M))
+		safeDist = np.where(active, dist, 1.0)
+		vx = np.where(active, vx + wx + G * (dx - x) / safeDist, vx)
+		vy = np.where(active, vy + wy + G * (dy - y) / safeDist, vy)
+		vMag = np.hypot(vx, vy)
+		clip = active & (vMag > M)
+		vClip = M / 2 + r[3] * M / 2
+		safeMag = np.where(clip, vMag, 1.0)
+		vx = np.where(clip, vx / safeMag * vClip, vx)
+		vy = np.where(clip, vy / safeMag * vClip, vy)
+		x = np.where(active, x + vx, x)
+		y = np.where(active, y + vy, y)
+		dist = np.hypot(dx - x, dy - y)
+		moveX, moveY = np.rint(x), np.rint(y)
+		changed = active & ((moveX != curX) | (moveY != curY))
+		samples += changed
+		steps = np.where(changed, step + 1, steps)
+		curX = np.where(changed, moveX, curX)
+		curY = np.where(changed, moveY, curY)
+		furthest = np.maximum(furthest, np.where(changed, (curX - sx) * ux + (curY - sy) * uy, 0.0))
+		if keepPaths:
+			history.append((changed, curX.astype(np.int32), curY.astype(np.int32)))
+	overshoot = np.maximum(0.0, furthest - total)
+	paths = None
+	if keepPaths:
+		paths = []
+		if history:
+			changedAt = np.stack([h[0] for h in history])
+			histX = np.stack([h[1] for h in history])
+			histY = np.stack([h[2] for h in history])
+		for lane in range(count):
+			path = Trajectory(int(args[0][lane]), int(args[1][lane]))
+			if history:
+				at = np.flatnonzero(changedAt[:, lane])
+				path.xs = array("i", histX[at, lane].tolist())
+				path.ys = array("i", histY[at, lane].tolist())
+				path.ts = array("d", ((at + 1) * stepInterval).tolist())
+			paths.append(path)
+	return BatchResult(steps.tolist(), samples.tolist(), overshoot.tolist(), stepInterval, paths)
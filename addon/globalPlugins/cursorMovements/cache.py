@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Bounded LRU cache of seeded trajectories.
+# The same start, destination, motion parameters and seed always give the same path,
+# so a cached path can be replayed instead of planned again.
+
+from array import array
+from collections import OrderedDict
+import os
+import struct
+
+from .trajectory import Trajectory, planWindMouse
+
+
+# Bytes used by one sample: x and y as 32 bit integers, t as a double.
+SAMPLE_SIZE = 16
+DEFAULT_MAX_POINTS = 200000
+
+_FILE_MAGIC = b"CMTC"
+_FILE_VERSION = 1
+_header = struct.Struct("<4sHI")
+_key = struct.Struct("<iiiiddddq")
+_entry = struct.Struct("<iiI")
+
+
+class TrajectoryCache(object):
+	"""
+	Least recently used cache of planned trajectories, bounded by the total number of samples.
+	Keys are (start_x, start_y, dest_x, dest_y, G_0, W_0, M_0, D_0, seed).
+	"""
+
+	def __init__(self, maxPoints=DEFAULT_MAX_POINTS):
+		self.maxPoints = maxPoints
+		self._paths = OrderedDict()
+		self.points = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self._paths)
+
+	def __contains__(self, key):
+		return key in self._paths
+
+	@property
+	def sizeBytes(self):
+		return self.points * SAMPLE_SIZE
+
+	@staticmethod
+	def makeKey(start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12, seed=0):
+		return (
+			int(start_x), int(start_y), int(dest_x), int(dest_y),
+			float(G_0), float(W_0), float(M_0), float(D_0), int(seed)
+		)
+
+	def get(self, key):
+		path = self._paths.get(key)
+		if path is None:
+			self.misses += 1
+			return None
+		self._paths.move_to_end(key)
+		self.hits += 1
+		return path
+
+	def put(self, key, path):
+		old = self._paths.pop(key, None)
+		if old is not None:
+			self.points -= len(old)
+		if len(path) > self.maxPoints:
+			return
+		self._paths[key] = path
+		self.points += len(path)
+		while self.points > self.maxPoints:
+			evicted = self._paths.popitem(last=False)[1]
+			self.points -= len(evicted)
+			self.evictions += 1
+
+	def plan(self, start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12, seed=0):
+		"""Returns the cached path for these arguments, planning and storing it on a miss."""
+		key = self.makeKey(start_x, start_y, dest_x, dest_y, G_0, W_0, M_0, D_0, seed)
+		path = self.get(key)
+		if path is None:
+			path = planWindMouse(*key)
+			self.put(key, path)
+		return path
+
+	def clear(self):
+		self._paths.clear()
+		self.points = 0
+
+	def resetCounters(self):
+		self.hits = self.misses = self.evictions = 0
+
+	def save(self, filename):
+		"""Writes all cached paths to filename, replacing it atomically."""
+		tmp = filename + ".tmp"
+		with open(tmp, "wb") as f:
+			f.write(_header.pack(_FILE_MAGIC, _FILE_VERSION, len(self._paths)))
+			for key, path in self._paths.items():
+				f.write(_key.pack(*key))
+				f.write(_entry.pack(path.startX, path.startY, len(path)))
+				f.write(path.xs.tobytes())
+				f.write(path.ys.tobytes())
+				f.write(path.ts.tobytes())
+		os.replace(tmp, filename)
+
+	def load(self, filename):
+		"""
+		Adds the paths stored in filename, least recently used first.
+		Files written by another format version are ignored.
+		"""
+		with open(filename, "rb") as f:
+			data = f.read()
+		if len(data) < _header.size:
+			return
+		magic, version, count = _header.unpack_from(data, 0)
+		if magic != _FILE_MAGIC or version != _FILE_VERSION:
+			return
+		intSize = array("i").itemsize
+		offset = _header.size
+		for i in range(count):
+			key = _key.unpack_from(data, offset)
+			offset += _key.size
+			startX, startY, length = _entry.unpack_from(data, offset)
+			offset += _entry.size
+			path = Trajectory(startX, startY)
+			path.xs.frombytes(data[offset:offset + length * intSize])
+			offset += length * intSize
+			path.ys.frombytes(data[offset:offset + length * intSize])
+			offset += length * intSize
+			path.ts.frombytes(data[offset:offset + length * 8])
+			offset += length * 8
+			self.put(key, path)
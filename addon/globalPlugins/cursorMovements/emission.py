@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Thinning planned paths before they are played.
+# Every kept sample becomes an injected cursor event. Where the cursor travels in a straight line
+# at a steady speed, the samples in between add nothing and are dropped.
+
+from .trajectory import Trajectory
+
+
+# Pixels a dropped sample may be away from where the cursor is assumed to be at that time.
+DEFAULT_TOLERANCE = 1.0
+# Most frames between two kept samples. The cursor then never waits more than a frame for its next position,
+# so a steady move still looks like a move.
+MAX_GAP_FRAMES = 2
+# Longest time in seconds between two kept samples, MAX_GAP_FRAMES at the default playback rate.
+DEFAULT_MAX_GAP = MAX_GAP_FRAMES / 120.0
+
+
+def decimate(path, tolerance=DEFAULT_TOLERANCE, maxGap=DEFAULT_MAX_GAP):
+	"""
+	Returns (thinned L{Trajectory}, number of dropped samples), the count is also kept in its droppedSamples.
+	A sample is dropped when every sample since the last kept one lies within tolerance pixels of the
+	position interpolated at its time between the kept samples around it. Because the check is done in time,
+	a change of direction (curvature) or of speed both keep samples. Kept samples are at most maxGap seconds
+	apart, unless the samples themselves are further apart. The last sample is always kept.
+	"""
+	xs, ys, ts = path.xs, path.ys, path.ts
+	count = len(xs)
+	thinned = Trajectory(path.startX, path.startY)
+	thinned.requestedDuration = path.requestedDuration
+	if count < 3 or tolerance <= 0:
+		thinned.xs.extend(xs)
+		thinned.ys.extend(ys)
+		thinned.ts.extend(ts)
+		thinned.droppedSamples = 0
+		return thinned, 0
+	limit = tolerance * tolerance
+	# The anchor is the last kept sample, -1 being the start of the path.
+	anchorX, anchorY, anchorT = path.startX, path.startY, 0.0
+	anchor = -1
+	candidate = 0
+	while candidate < count - 1:
+		nextIndex = candidate + 1
+		endX, endY, endT = xs[nextIndex], ys[nextIndex], ts[nextIndex]
+		keep = endT - anchorT > maxGap
+		if not keep:
+			span = endT - anchorT
+			dx, dy = endX - anchorX, endY - anchorY
+			# Could the candidate and everything since the anchor be dropped, up to the next sample?
+			for i in range(anchor + 1, nextIndex):
+				share = (ts[i] - anchorT) / span if span > 0 else 1.0
+				ex = xs[i] - (anchorX + dx * share)
+				ey = ys[i] - (anchorY + dy * share)
+				if ex * ex + ey * ey > limit:
+					keep = True
+					break
+		if keep:
+			thinned.append(xs[candidate], ys[candidate], ts[candidate])
+			anchor = candidate
+			anchorX, anchorY, anchorT = xs[candidate], ys[candidate], ts[candidate]
+		candidate = nextIndex
+	thinned.append(xs[-1], ys[-1], ts[-1])
+	thinned.droppedSamples = count - len(thinned)
+	return thinned, thinned.droppedSamples
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Cursor injection backends.
+# Everything that moves the real cursor or presses a mouse button goes through a backend,
+# so the motion code can also run against an in-memory recorder, off Windows and outside NVDA.
+
+from collections import namedtuple
+import ctypes
+import threading
+import time
+
+
+# A recorded injection: kind is "move", "down" or "up", time is in seconds from the backend's clock.
+InjectedEvent = namedtuple("InjectedEvent", ("time", "kind", "x", "y", "button"))
+
+
+class InjectionBackend(object):
+	"""Moves the cursor and presses mouse buttons. button is "left" or "right"."""
+
+	def move(self, x, y):
+		raise NotImplementedError
+
+	def moveMany(self, points):
+		"""Moves through points, a sequence of (x, y), in one call where the backend allows it."""
+		for x, y in points:
+			self.move(x, y)
+
+	def buttonDown(self, button="left"):
+		raise NotImplementedError
+
+	def buttonUp(self, button="left"):
+		raise NotImplementedError
+
+	def click(self, button="left"):
+		self.buttonDown(button)
+		self.buttonUp(button)
+
+	def position(self):
+		"""Returns the cursor position as (x, y)."""
+		raise NotImplementedError
+
+	def refreshRate(self):
+		"""Returns the refresh rate of the display in Hz, or None when it is not known."""
+		return None
+
+
+class _MouseInput(ctypes.Structure):
+	_fields_ = (
+		("dx", ctypes.c_long),
+		("dy", ctypes.c_long),
+		("mouseData", ctypes.c_ulong),
+		("dwFlags", ctypes.c_ulong),
+		("time", ctypes.c_ulong),
+		("dwExtraInfo", ctypes.c_void_p),
+	)
+
+
+class _InputUnion(ctypes.Union):
+	# Keyboard and hardware input are smaller than mouse input, only the mouse member is needed.
+	_fields_ = (("mi", _MouseInput),)
+
+
+class _Input(ctypes.Structure):
+	_anonymous_ = ("u",)
+	_fields_ = (("type", ctypes.c_ulong), ("u", _InputUnion))
+
+
+class WinUserBackend(InjectionBackend):
+	"""Injects through winUser, and tells NVDA about every move so mouse tracking follows the cursor."""
+
+	# SendInput constants.
+	_INPUT_MOUSE = 0
+	_MOUSEEVENTF_MOVE = 0x0001
+	_MOUSEEVENTF_ABSOLUTE = 0x8000
+	_MOUSEEVENTF_VIRTUALDESK = 0x4000
+	_SM_XVIRTUALSCREEN, _SM_YVIRTUALSCREEN, _SM_CXVIRTUALSCREEN, _SM_CYVIRTUALSCREEN = 76, 77, 78, 79
+	# VREFRESH from wingdi.h, the vertical refresh rate of the primary display in Hz.
+	_VREFRESH = 116
+
+	def __init__(self):
+		# NVDA modules are imported here so this module loads without them.
+		import mouseHandler
+		import winUser
+		self._winUser = winUser
+		self._mouseHandler = mouseHandler
+		self._buttons = {
+			"left": (winUser.MOUSEEVENTF_LEFTDOWN, winUser.MOUSEEVENTF_LEFTUP),
+			"right": (winUser.MOUSEEVENTF_RIGHTDOWN, winUser.MOUSEEVENTF_RIGHTUP),
+		}
+
+	def move(self, x, y):
+		self._winUser.setCursorPos(x, y)
+		self._mouseHandler.executeMouseMoveEvent(x, y)
+
+	def moveMany(self, points):
+		# All moves go to the system in a single SendInput call.
+		points = list(points)
+		if not points:
+			return
+		user32 = ctypes.windll.user32
+		left = user32.GetSystemMetrics(self._SM_XVIRTUALSCREEN)
+		top = user32.GetSystemMetrics(self._SM_YVIRTUALSCREEN)
+		width = max(2, user32.GetSystemMetrics(self._SM_CXVIRTUALSCREEN))
+		height = max(2, user32.GetSystemMetrics(self._SM_CYVIRTUALSCREEN))
+		flags = self._MOUSEEVENTF_MOVE | self._MOUSEEVENTF_ABSOLUTE | self._MOUSEEVENTF_VIRTUALDESK
+		inputs = (_Input * len(points))()
+		for item, (x, y) in zip(inputs, points):
+			item.type = self._INPUT_MOUSE
+			# Absolute coordinates are normalized to 0-65535 over the virtual desktop.
+			item.mi.dx = ((x - left) * 65535) // (width - 1)
+			item.mi.dy = ((y - top) * 65535) // (height - 1)
+			item.mi.dwFlags = flags
+		user32.SendInput(len(points), inputs, ctypes.sizeof(_Input))
+		self._mouseHandler.executeMouseMoveEvent(*points[-1])
+
+	def buttonDown(self, button="left"):
+		self._winUser.mouse_event(self._buttons[button][0], 0, 0, None, None)
+
+	def buttonUp(self, button="left"):
+		self._winUser.mouse_event(self._buttons[button][1], 0, 0, None, None)
+
+	def position(self):
+		return self._winUser.getCursorPos()
+
+	def refreshRate(self):
+		user32 = ctypes.windll.user32
+		hdc = user32.GetDC(0)
+		try:
+			rate = ctypes.windll.gdi32.GetDeviceCaps(hdc, self._VREFRESH)
+		finally:
+			user32.ReleaseDC(0, hdc)
+		# 0 and 1 mean the hardware default refresh rate.
+		return rate if rate > 1 else None
+
+
+class RecordingBackend(InjectionBackend):
+	"""
+	Records every injection with a timestamp instead of touching the real cursor.
+	The position is the last moved to, so code reading it back behaves as with the real cursor.
+	"""
+
+	def __init__(self, start=(0, 0), clock=time.perf_counter, refreshRate=None):
+		self._clock = clock
+		self._refreshRate = refreshRate
+		self._lock = threading.Lock()
+		self._position = tuple(start)
+		self.events = []
+		self.calls = 0
+
+	def _record(self, kind, x, y, button=None):
+		self.events.append(InjectedEvent(self._clock(), kind, x, y, button))
+
+	def move(self, x, y):
+		with self._lock:
+			self.calls += 1
+			self._position = (x, y)
+			self._record("move", x, y)
+
+	def moveMany(self, points):
+		with self._lock:
+			self.calls += 1
+			for x, y in points:
+				self._position = (x, y)
+				self._record("move", x, y)
+
+	def buttonDown(self, button="left"):
+		with self._lock:
+			self.calls += 1
+			self._record("down", self._position[0], self._position[1], button)
+
+	def buttonUp(self, button="left"):
+		with self._lock:
+			self.calls += 1
+			self._record("up", self._position[0], self._position[1], button)
+
+	def position(self):
+		return self._position
+
+	def refreshRate(self):
+		return self._refreshRate
+
+	def clear(self):
+		with self._lock:
+			del self.events[:]
+			self.calls = 0
+
+	def moves(self):
+		return [event for event in self.events if event.kind == "move"]
+
+	def moveIntervals(self):
+		"""Seconds between consecutive recorded moves."""
+		times = [event.time for event in self.moves()]
+		return [b - a for a, b in zip(times, times[1:])]
+
+	def movesPerSecond(self):
+		times = [event.time for event in self.moves()]
+		if len(times) < 2 or times[-1] == times[0]:
+			return 0.0
+		return (len(times) - 1) / (times[-1] - times[0])
+
+	def jitter(self):
+		"""Standard deviation of the time between consecutive moves, in seconds."""
+		intervals = self.moveIntervals()
+		if len(intervals) < 2:
+			return 0.0
+		mean = sum(intervals) / len(intervals)
+		return (sum((interval - mean) ** 2 for interval in intervals) / len(intervals)) ** 0.5
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Motion models used to plan cursor movements.
+# WindMouse simulates forces step by step, the other models are closed form curves:
+# their duration is known before the move starts and any timestamp is evaluated in constant time.
+
+from collections import OrderedDict
+import math
+import random
+
+from .trajectory import Trajectory, minimumJerk, planWindMouse
+
+
+# Fitts' law constants: T = a + b * log2(distance / width + 1), in seconds.
+FITTS_A = 0.1
+FITTS_B = 0.15
+# Assumed width of the target, in pixels.
+FITTS_WIDTH = 20
+
+
+def fittsDuration(distance, width=FITTS_WIDTH, a=FITTS_A, b=FITTS_B):
+	"""Movement time in seconds predicted by Fitts' law (Shannon formulation)."""
+	return a + b * math.log2(distance / float(width) + 1)
+
+
+def sampleCurve(curve, startX, startY, rate):
+	"""
+	Samples curve at rate frames per second into a L{Trajectory}.
+	curve has a duration (seconds) and at(t) returning a floating point (x, y).
+	Only samples that change the integer cursor position are kept, the last one is always the destination.
+	"""
+	path = Trajectory(startX, startY)
+	duration = curve.duration
+	frames = max(1, int(math.ceil(duration * rate)))
+	at = curve.at
+	lastX, lastY = startX, startY
+	for frame in range(1, frames + 1):
+		t = min(duration, frame / float(rate))
+		x, y = at(t)
+		x, y = int(round(x)), int(round(y))
+		if x != lastX or y != lastY:
+			path.append(x, y, t)
+			lastX, lastY = x, y
+	return path
+
+
+class QuinticCurve(object):
+	"""
+	Straight minimum jerk move, optionally starting with a velocity (pixels per second).
+	Ends at rest with zero acceleration.
+	"""
+
+	__slots__ = ("duration", "_cx", "_cy")
+
+	def __init__(self, startX, startY, destX, destY, duration, velocity=(0.0, 0.0)):
+		self.duration = duration
+		self._cx = self._coefficients(startX, destX, velocity[0] * duration)
+		self._cy = self._coefficients(startY, destY, velocity[1] * duration)
+
+	@staticmethod
+	def _coefficients(start, dest, v0):
+		d = dest - start - v0
+		return (start, v0, 10 * d + 4 * v0, -15 * d - 7 * v0, 6 * d + 3 * v0)
+
+	def at(self, t):
+		tau = t / self.duration if self.duration else 1.0
+		tau2 = tau * tau
+		a0, a1, a3, a4, a5 = self._cx
+		x = a0 + a1 * tau + tau2 * tau * (a3 + tau * (a4 + tau * a5))
+		a0, a1, a3, a4, a5 = self._cy
+		y = a0 + a1 * tau + tau2 * tau * (a3 + tau * (a4 + tau * a5))
+		return x, y
+
+
+class BezierCurve(object):
+	"""
+	Cubic Bézier curve with control points randomly offset to one side of the straight line,
+	traversed with a minimum jerk timing profile.
+	With a velocity, the first control point continues in that direction and the timing profile starts
+	at full speed instead of at rest, so the cursor leaves with that velocity.
+	"""
+
+	__slots__ = ("duration", "_points", "_moving")
+
+	def __init__(self, startX, startY, destX, destY, duration, velocity=(0.0, 0.0), seed=None, bend=0.25):
+		rnd = random.Random(seed).random
+		self.duration = duration
+		self._moving = velocity != (0.0, 0.0)
+		dx, dy = destX - startX, destY - startY
+		# Normal of the straight line, as long as the line itself; o1 and o2 are random shares of it.
+		side = 1 if rnd() < 0.5 else -1
+		nx, ny = -dy * side, dx * side
+		o1 = bend * (0.2 + 0.8 * rnd())
+		o2 = bend * (0.2 + 0.8 * rnd())
+		if velocity != (0.0, 0.0):
+			c1x = startX + velocity[0] * duration / 3
+			c1y = startY + velocity[1] * duration / 3
+		else:
+			c1x = startX + dx * (0.2 + 0.2 * rnd()) + nx * o1
+			c1y = startY + dy * (0.2 + 0.2 * rnd()) + ny * o1
+		c2x = startX + dx * (0.6 + 0.2 * rnd()) + nx * o2
+		c2y = startY + dy * (0.6 + 0.2 * rnd()) + ny * o2
+		self._points = (startX, startY, c1x, c1y, c2x, c2y, destX, destY)
+
+	def at(self, t):
+		tau = t / self.duration if self.duration else 1.0
+		if self._moving:
+			# Quintic from 0 to 1 with slope 1 at the start, where the curve's own speed is the velocity,
+			# and at rest with zero acceleration at the end.
+			s = tau + tau * tau * tau * (4 + tau * (-7 + tau * 3))
+		else:
+			s = minimumJerk(tau)
+		u = 1 - s
+		b0, b1, b2, b3 = u * u * u, 3 * u * u * s, 3 * u * s * s, s * s * s
+		p = self._points
+		return b0 * p[0] + b1 * p[2] + b2 * p[4] + b3 * p[6], b0 * p[1] + b1 * p[3] + b2 * p[5] + b3 * p[7]
+
+
+class MotionModel(object):
+	"""
+	Base class for motion models.
+	plan returns the L{Trajectory} for a move, sampled for playback at rate frames per second.
+	velocity is the cursor velocity (pixels per second) when an interrupted move is continued.
+	"""
+
+	#: Name stored in the configuration.
+	name = None
+
+	def duration(self, startX, startY, destX, destY):
+		"""Duration of a move in seconds, or None when it is only known after planning."""
+		return None
+
+	def plan(self, startX, startY, destX, destY, rate, velocity=(0.0, 0.0), seed=None):
+		raise NotImplementedError
+
+
+class WindMouseModel(MotionModel):
+	name = "windMouse"
+
+	def __init__(self, G_0=15, W_0=3, M_0=30, D_0=12):
+		self.params = (G_0, W_0, M_0, D_0)
+
+	def plan(self, startX, startY, destX, destY, rate, velocity=(0.0, 0.0), seed=None):
+		return planWindMouse(startX, startY, destX, destY, *self.params, seed=seed, velocity=velocity)
+
+
+class ClosedFormModel(MotionModel):
+	"""A model whose duration comes from durationModel(distance), Fitts' law by default."""
+
+	def __init__(self, durationModel=fittsDuration):
+		self.durationModel = durationModel
+
+	def duration(self, startX, startY, destX, destY):
+		return self.durationModel(math.hypot(destX - startX, destY - startY))
+
+	def curve(self, startX, startY, destX, destY, duration, velocity=(0.0, 0.0), seed=None):
+		raise NotImplementedError
+
+	def plan(self, startX, startY, destX, destY, rate, velocity=(0.0, 0.0), seed=None):
+		duration = self.duration(startX, startY, destX, destY)
+		curve = self.curve(startX, startY, destX, destY, duration, velocity, seed)
+		return sampleCurve(curve, startX, startY, rate)
+
+
+class MinimumJerkModel(ClosedFormModel):
+	name = "minimumJerk"
+
+	def curve(self, startX, startY, destX, destY, duration, velocity=(0.0, 0.0), seed=None):
+		return QuinticCurve(startX, startY, destX, destY, duration, velocity)
+
+
+class BezierModel(ClosedFormModel):
+	name = "bezier"
+
+	def curve(self, startX, startY, destX, destY, duration, velocity=(0.0, 0.0), seed=None):
+		return BezierCurve(startX, startY, destX, destY, duration, velocity, seed)
+
+
+motionModels = OrderedDict((cls.name, cls) for cls in (WindMouseModel, MinimumJerkModel, BezierModel))
+
+
+def getMotionModel(name):
+	"""Returns a new instance of the model stored as name, WindMouse for unknown names."""
+	return motionModels.get(name, WindMouseModel)()
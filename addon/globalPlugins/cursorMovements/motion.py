@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# The cursor move in progress.
+# A new move preempts the current one instead of being queued behind it.
+
+from collections import deque, namedtuple
+import threading
+
+from .playback import Playback, DEFAULT_RATE
+from .trajectory import planWindMouse
+
+
+# Requested, planned and actual arrival time of a move, in seconds.
+ArrivalTiming = namedtuple("ArrivalTiming", ("requested", "planned", "actual"))
+# Number of moves whose arrival times are kept.
+TIMINGS_KEPT = 1000
+
+
+def planFrom(startX, startY, destX, destY, velocity=(0.0, 0.0)):
+	return planWindMouse(startX, startY, destX, destY, velocity=velocity)
+
+
+class ActiveMotion(object):
+	"""
+	Owns the playback of the cursor move in progress.
+	When moveTo is called while the cursor is still travelling, the remaining samples are dropped
+	and a new path is planned from the current position and velocity, so the cursor bends
+	towards the new target without stopping first.
+	planner(startX, startY, destX, destY, velocity) returns a L{trajectory.Trajectory}.
+	onArrived(playback) is called from the playback thread when a move reached its destination.
+	"""
+
+	def __init__(self, emit, planner=planFrom, rate=DEFAULT_RATE, onArrived=None):
+		self._emit = emit
+		self.planner = planner
+		self.onArrived = onArrived
+		self.rate = rate
+		self._lock = threading.Lock()
+		self._playback = None
+		self.retargets = 0
+		# Arrival times of completed moves that were planned for a given duration.
+		self.timings = deque(maxlen=TIMINGS_KEPT)
+		# Cursor events sent and dropped by thinning, for the thinned moves that arrived.
+		self.thinnedMoves = 0
+		self.sentEvents = 0
+		self.droppedEvents = 0
+
+	@property
+	def moving(self):
+		playback = self._playback
+		return playback is not None and playback.is_alive() and not playback.finished
+
+	def moveTo(self, destX, destY, start):
+		"""
+		Moves the cursor to destX, destY.
+		start is the position to plan from when no move is in progress (usually the real cursor position).
+		"""
+		with self._lock:
+			velocity = (0.0, 0.0)
+			playback = self._playback
+			if playback is not None:
+				playback.stop()
+				if playback.is_alive() and not playback.finished:
+					start = playback.position
+					velocity = playback.velocity
+					self.retargets += 1
+			path = self.planner(start[0], start[1], destX, destY, velocity)
+			self._playback = Playback(path, self._emit, rate=self.rate, onFinished=self._onFinished)
+			self._playback.start()
+			return path
+
+	def play(self, path):
+		"""Plays an already planned path, stopping any move in progress."""
+		with self._lock:
+			if self._playback is not None:
+				self._playback.stop()
+			self._playback = Playback(path, self._emit, rate=self.rate, onFinished=self._onFinished)
+			self._playback.start()
+
+	def stop(self):
+		with self._lock:
+			if self._playback is not None:
+				self._playback.stop()
+				self._playback = None
+
+	def timingErrors(self):
+		"""Returns actual minus requested arrival time, in seconds, for every recorded move."""
+		return [timing.actual - timing.requested for timing in self.timings]
+
+	def clearStatistics(self):
+		"""Forgets the arrival times and thinning counts gathered so far."""
+		self.timings.clear()
+		self.thinnedMoves = self.sentEvents = self.droppedEvents = 0
+
+	def _onFinished(self, playback):
+		path = playback.path
+		if path.requestedDuration is not None and playback.actualDuration is not None:
+			self.timings.append(ArrivalTiming(path.requestedDuration, path.duration, playback.actualDuration))
+		with self._lock:
+			if self._playback is playback:
+				self._playback = None
+		arrived = playback.finished and not playback.stopped
+		if arrived and path.droppedSamples is not None:
+			# Counted from what was played, an interrupted move never sent all of its events.
+			self.thinnedMoves += 1
+			self.sentEvents += playback.emittedFrames
+			self.droppedEvents += path.droppedSamples
+		if self.onArrived is not None and arrived:
+			self.onArrived(playback)
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Write-behind persistence.
+# Edits are coalesced per key and written from a background thread once they stop coming in,
+# so saving never blocks the GUI thread.
+
+import os
+import threading
+import time
+
+
+# Seconds without new edits before pending writes are flushed.
+DEFAULT_IDLE_DELAY = 1.0
+# Number of keys waiting to be written that forces a flush without waiting for the idle delay.
+DEFAULT_MAX_PENDING = 32
+
+
+def atomicWrite(fileName, data):
+	"""Writes data (bytes) to a temporary file next to fileName, then renames it over fileName."""
+	tmp = fileName + ".tmp"
+	with open(tmp, "wb") as f:
+		f.write(data)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp, fileName)
+
+
+class WriteBehind(object):
+	"""
+	Calls write(key, value) from a background thread for the latest value submitted for each key.
+	Values are written after idleDelay seconds without new submissions, when more than maxPending keys
+	are waiting, when flush is called, or when the writer is closed.
+	onError(key) is called from the background thread, within an exception handler, when a write fails.
+	"""
+
+	def __init__(
+		self, write, idleDelay=DEFAULT_IDLE_DELAY, maxPending=DEFAULT_MAX_PENDING, onError=None,
+		clock=time.monotonic
+	):
+		self._write = write
+		self._onError = onError
+		self.idleDelay = idleDelay
+		self.maxPending = maxPending
+		self._clock = clock
+		self._pending = {}
+		self._lastSubmit = 0.0
+		self._flushRequested = False
+		self._closed = False
+		self._writing = False
+		self._condition = threading.Condition()
+		self.submitted = 0
+		self.written = 0
+		self.failed = 0
+		self._thread = threading.Thread(target=self._run, name="cursorMovements.writeBehind")
+		self._thread.daemon = True
+		self._thread.start()
+
+	@property
+	def pending(self):
+		with self._condition:
+			return len(self._pending)
+
+	def submit(self, key, value):
+		with self._condition:
+			if self._closed:
+				raise RuntimeError("writer is closed")
+			self._pending[key] = value
+			self._lastSubmit = self._clock()
+			self.submitted += 1
+			if len(self._pending) > self.maxPending:
+				self._flushRequested = True
+			self._condition.notify()
+
+	def discard(self, key):
+		"""Drops a value that has not been written yet."""
+		with self._condition:
+			self._pending.pop(key, None)
+
+	def flush(self, wait=False, timeout=None):
+		"""Starts writing everything pending now. With wait, returns once it has been written."""
+		with self._condition:
+			self._flushRequested = True
+			self._condition.notify()
+			if wait:
+				self._condition.wait_for(lambda: not self._pending and not self._writing, timeout)
+
+	def close(self, timeout=5.0):
+		"""Writes everything pending and stops the background thread."""
+		with self._condition:
+			self._closed = True
+			self._condition.notify()
+		self._thread.join(timeout)
+
+	def _due(self):
+		if not self._pending:
+			return False
+		if self._flushRequested or self._closed:
+			return True
+		return self._clock() - self._lastSubmit >= self.idleDelay
+
+	def _run(self):
+		condition = self._condition
+		while True:
+			with condition:
+				while not self._due():
+					if self._closed and not self._pending:
+						condition.notify_all()
+						return
+					timeout = None
+					if self._pending:
+						timeout = max(0.0, self._lastSubmit + self.idleDelay - self._clock())
+					condition.wait(timeout)
+				batch = self._pending
+				self._pending = {}
+				self._flushRequested = False
+				self._writing = True
+			for key, value in batch.items():
+				try:
+					self._write(key, value)
+					self.written += 1
+				except Exception:
+					self.failed += 1
+					if self._onError:
+						self._onError(key)
+			with condition:
+				self._writing = False
+				condition.notify_all()
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Timer paced playback of planned trajectories.
+# Samples are emitted from a worker thread at a fixed frame rate,
+# the GUI thread only ever receives one cursor position per callback.
+
+import threading
+import time
+
+from . import probes
+
+DEFAULT_RATE = 120
+MIN_RATE = 30
+MAX_RATE = 500
+
+
+class LatestPositionDispatcher(object):
+	"""
+	Forwards positions to another thread through callAfter (usually wx.CallAfter).
+	Only the newest pending position is kept, so a busy GUI thread never has a backlog of moves to run.
+	"""
+
+	def __init__(self, callAfter, move):
+		self._callAfter = callAfter
+		self._move = move
+		self._lock = threading.Lock()
+		self._pending = None
+		self._scheduled = False
+		self._scheduledAt = None
+
+	def __call__(self, x, y):
+		with self._lock:
+			self._pending = (x, y)
+			if self._scheduled:
+				return
+			self._scheduled = True
+			self._scheduledAt = probes.now() if probes.enabled else None
+		self._callAfter(self._flush)
+
+	def _flush(self):
+		with self._lock:
+			pos = self._pending
+			self._pending = None
+			self._scheduled = False
+			scheduledAt = self._scheduledAt
+		if scheduledAt is not None and probes.enabled:
+			# How long the GUI thread took to get to us.
+			probes.since("callAfterDelay", scheduledAt)
+		if pos is not None:
+			self._move(*pos)
+
+
+class Playback(threading.Thread):
+	"""
+	Plays a L{trajectory.Trajectory} back at rate frames per second.
+	Frames are scheduled against the start time, so sleep overshoot never accumulates,
+	and frames that are already late are skipped instead of being emitted in a burst.
+	emit(x, y) is called from this thread, onFinished(playback) once playback ends or is stopped.
+	"""
+
+	def __init__(self, path, emit, rate=DEFAULT_RATE, onFinished=None, clock=time.perf_counter):
+		super(Playback, self).__init__(name="cursorMovements.playback")
+		self.daemon = True
+		self.path = path
+		self.rate = max(MIN_RATE, min(MAX_RATE, rate))
+		self._emit = emit
+		self._onFinished = onFinished
+		self._clock = clock
+		self._stopEvent = threading.Event()
+		self.position = (path.startX, path.startY)
+		self.index = -1
+		self.startedAt = None
+		self.arrivedAt = None
+		self.emittedFrames = 0
+		self.skippedFrames = 0
+
+	def stop(self):
+		self._stopEvent.set()
+
+	@property
+	def stopped(self):
+		return self._stopEvent.is_set()
+
+	@property
+	def finished(self):
+		return self.index >= len(self.path) - 1
+
+	@property
+	def actualDuration(self):
+		"""Seconds from the start of playback until the last sample was emitted, None until then."""
+		if self.arrivedAt is None:
+			return None
+		return self.arrivedAt - self.startedAt
+
+	@property
+	def velocity(self):
+		"""Velocity of the cursor at the last emitted sample, in pixels per second."""
+		if self.finished:
+			return 0.0, 0.0
+		return self.path.velocityAt(self.index)
+
+	def run(self):
+		try:
+			self._play()
+		finally:
+			if self._onFinished:
+				self._onFinished(self)
+
+	def _play(self):
+		path = self.path
+		xs, ys, ts = path.xs, path.ys, path.ts
+		count = len(xs)
+		if not count:
+			return
+		period = 1.0 / self.rate
+		clock = self._clock
+		wait = self._stopEvent.wait
+		start = self.startedAt = clock()
+		# Sample times are relative to the start, so the sample due at t is emitted on the frame at t.
+		frame = 1
+		index = -1
+		while index < count - 1:
+			delay = start + frame * period - clock()
+			if delay > 0:
+				if wait(delay):
+					return
+			elif self._stopEvent.is_set():
+				return
+			elif delay < -period:
+				# Behind schedule: jump to the current frame rather than catching up.
+				late = int(-delay / period)
+				self.skippedFrames += late
+				frame += late
+			frameTime = frame * period
+			target = index
+			while target < count - 1 and ts[target + 1] <= frameTime:
+				target += 1
+			if target != index:
+				index = target
+				self.index = index
+				self.position = (xs[index], ys[index])
+				self._emit(xs[index], ys[index])
+				self.emittedFrames += 1
+				if probes.enabled:
+					probes.record("frameLateness", clock() - start - frameTime)
+			frame += 1
+		self.arrivedAt = clock()
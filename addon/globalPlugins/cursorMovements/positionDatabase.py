@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Mouse positions of all applications in a single SQLite database.
+# An optional alternative to the per application position files, with the same interface as
+# L{positionStore.PositionFileCache}: renames, removals and shortcut changes are single row updates.
+
+import glob
+import json
+import os
+import threading
+
+from configobj import ConfigObj
+
+from .positions import Position, PositionTable
+
+try:
+	import sqlite3
+except ImportError:
+	# Some NVDA builds leave out the sqlite3 module, the position files are used then.
+	sqlite3 = None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS positions (
+	app TEXT NOT NULL,
+	name TEXT NOT NULL,
+	ord INTEGER NOT NULL,
+	x INTEGER NOT NULL,
+	y INTEGER NOT NULL,
+	gesture TEXT,
+	meta TEXT,
+	PRIMARY KEY (app, name)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS positionsByGesture ON positions (app, gesture) WHERE gesture IS NOT NULL;
+CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+def isAvailable():
+	return sqlite3 is not None
+
+
+class PositionDatabase(object):
+	"""
+	Stores positions in one SQLite file, indexed by (app, name) and by (app, gesture).
+	Tables returned by get are kept in memory, so repeated lookups do not touch the disk.
+	All changes made by one call are committed in one transaction. The database is in WAL mode with
+	synchronous=NORMAL, so a commit appends to the log without waiting for the disk: the dialog is not blocked,
+	and a power loss can only lose the last edits, never corrupt the file.
+	"""
+
+	def __init__(self, fileName):
+		self.path = fileName
+		self._lock = threading.RLock()
+		directory = os.path.dirname(fileName)
+		if directory and not os.path.exists(directory):
+			os.makedirs(directory)
+		self._db = sqlite3.connect(fileName, check_same_thread=False)
+		self._db.execute("PRAGMA journal_mode=WAL")
+		self._db.execute("PRAGMA synchronous=NORMAL")
+		self._db.executescript(SCHEMA)
+		self._tables = {}
+		self.hits = 0
+		self.queries = 0
+
+	def close(self):
+		with self._lock:
+			self._db.close()
+
+	def flush(self, wait=False):
+		# Every change is committed when it is made.
+		pass
+
+	def fileName(self, appName):
+		return self.path
+
+	@staticmethod
+	def _row(appName, name, order, position):
+		meta = json.dumps(position.meta) if position.meta else None
+		return (appName, name, order, position.x, position.y, position.gesture, meta)
+
+	def get(self, appName):
+		"""Returns the positions of appName as a L{PositionTable}, or None when there are none."""
+		with self._lock:
+			if appName in self._tables:
+				self.hits += 1
+				return self._tables[appName]
+			self.queries += 1
+			rows = self._db.execute(
+				"SELECT name, x, y, gesture, meta FROM positions WHERE app = ? ORDER BY ord", (appName,)
+			).fetchall()
+			table = None
+			if rows:
+				table = PositionTable(
+					(name, Position(x, y, gesture, json.loads(meta) if meta else None))
+					for name, x, y, gesture, meta in rows
+				)
+			self._tables[appName] = table
+			return table
+
+	def write(self, appName, positions):
+		"""Replaces all positions of appName."""
+		with self._lock, self._db:
+			self._db.execute("DELETE FROM positions WHERE app = ?", (appName,))
+			self._db.executemany(
+				"INSERT INTO positions VALUES (?, ?, ?, ?, ?, ?, ?)",
+				[
+					self._row(appName, name, order, position)
+					for order, (name, position) in enumerate(positions.items())
+				]
+			)
+			self._tables[appName] = positions
+
+	def delete(self, appName):
+		with self._lock, self._db:
+			self._db.execute("DELETE FROM positions WHERE app = ?", (appName,))
+			self._tables[appName] = None
+
+	def setPosition(self, appName, positions, name):
+		"""Stores the position called name from positions, added or changed."""
+		position = positions[name]
+		with self._lock, self._db:
+			row = self._db.execute(
+				"SELECT ord FROM positions WHERE app = ? AND name = ?", (appName, name)
+			).fetchone()
+			if row is None:
+				row = self._db.execute(
+					"SELECT COALESCE(MAX(ord) + 1, 0) FROM positions WHERE app = ?", (appName,)
+				).fetchone()
+			if position.gesture:
+				# The gesture index is unique, the previous owner loses the gesture in the same transaction.
+				self._db.execute(
+					"UPDATE positions SET gesture = NULL WHERE app = ? AND gesture = ? AND name != ?",
+					(appName, position.gesture, name)
+				)
+			self._db.execute(
+				"INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?, ?)",
+				self._row(appName, name, row[0], position)
+			)
+			self._tables[appName] = positions
+
+	def removePosition(self, appName, positions, name):
+		with self._lock, self._db:
+			self._db.execute("DELETE FROM positions WHERE app = ? AND name = ?", (appName, name))
+			self._tables[appName] = positions if len(positions) else None
+
+	def renamePosition(self, appName, positions, oldName, newName):
+		with self._lock, self._db:
+			self._db.execute(
+				"UPDATE positions SET name = ? WHERE app = ? AND name = ?", (newName, appName, oldName)
+			)
+			self._tables[appName] = positions
+
+	def importFiles(self, directory, extensions=(".gc", ".cm")):
+		"""
+		Imports the per application position files in directory, once.
+		Applications already in the database are left alone. Returns the number of imported applications.
+		"""
+		with self._lock:
+			if self._db.execute("SELECT 1 FROM settings WHERE key = 'filesImported'").fetchone():
+				return 0
+			imported = 0
+			for extension in extensions:
+				for fileName in sorted(glob.glob(os.path.join(directory, "*" + extension))):
+					appName = os.path.splitext(os.path.basename(fileName))[0]
+					if self.get(appName) is not None:
+						continue
+					try:
+						positions = PositionTable.fromConfig(ConfigObj(fileName, encoding="UTF-8"))
+					except Exception:
+						continue
+					if len(positions):
+						self.write(appName, positions)
+						imported += 1
+			with self._db:
+				self._db.execute("INSERT OR REPLACE INTO settings VALUES ('filesImported', '1')")
+			return imported
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# In-memory cache of the per application mouse position files.
+# Focus changes look positions up here instead of parsing the file again every time.
+
+import os
+import threading
+import time
+
+from configobj import ConfigObj, ConfigObjError
+
+from .persistence import WriteBehind, atomicWrite
+from .positions import PositionTable
+
+
+# Seconds during which a cached file is trusted without looking at the disk.
+# Writes made through the cache are always seen immediately.
+DEFAULT_RECHECK_INTERVAL = 2.0
+
+
+class _Entry(object):
+	__slots__ = ("positions", "stamp", "checkedAt")
+
+	def __init__(self, positions, stamp, checkedAt):
+		self.positions = positions
+		self.stamp = stamp
+		self.checkedAt = checkedAt
+
+
+class PositionFileCache(object):
+	"""
+	Caches the position file of each application, parsed into a L{PositionTable}.
+	A cached file is used as is for recheckInterval seconds. After that, its modification time and size
+	are compared with the disk and the file is only parsed again when they changed.
+	Missing files are cached too, get then returns None.
+	Changes are kept in memory right away and written to disk in the background by a L{WriteBehind}.
+	The writer works from its own copy of each edited table, which single position edits update with the
+	changed record only, so the dialog may keep editing the cached table while a file is written.
+	A file that cannot be parsed is reported to onReadError(appName), from within an exception handler,
+	and treated as missing. It is renamed with an ".unreadable" suffix before positions are saved in its place.
+	"""
+
+	def __init__(
+		self, directory, extension, recheckInterval=DEFAULT_RECHECK_INTERVAL, clock=time.monotonic, onError=None,
+		onReadError=None
+	):
+		self.directory = directory
+		self.extension = extension
+		self.recheckInterval = recheckInterval
+		self._clock = clock
+		self._entries = {}
+		self._onReadError = onReadError
+		# Applications whose file could not be parsed, it is kept aside before being written again.
+		self._unreadable = set()
+		# Application name to (cached table, the writer's copy of it), guarded by _lock.
+		self._copies = {}
+		self._lock = threading.Lock()
+		self.writer = WriteBehind(self._save, onError=onError)
+		self.hits = 0
+		self.stats = 0
+		self.parses = 0
+
+	def fileName(self, appName):
+		return os.path.join(self.directory, appName + self.extension)
+
+	def _stamp(self, fileName):
+		self.stats += 1
+		try:
+			st = os.stat(fileName)
+		except OSError:
+			return None
+		return st.st_mtime_ns, st.st_size
+
+	def get(self, appName):
+		"""Returns the positions saved for appName as a L{PositionTable}, or None when there are none."""
+		now = self._clock()
+		entry = self._entries.get(appName)
+		if entry is not None and now - entry.checkedAt < self.recheckInterval:
+			self.hits += 1
+			return entry.positions
+		fileName = self.fileName(appName)
+		stamp = self._stamp(fileName)
+		if entry is not None and entry.stamp == stamp:
+			entry.checkedAt = now
+			self.hits += 1
+			return entry.positions
+		positions = None
+		if stamp is not None:
+			self.parses += 1
+			try:
+				positions = PositionTable.fromConfig(ConfigObj(fileName, encoding="UTF-8"))
+				self._unreadable.discard(appName)
+			except ConfigObjError:
+				self._unreadable.add(appName)
+				if self._onReadError:
+					self._onReadError(appName)
+		self._entries[appName] = _Entry(positions, stamp, now)
+		return positions
+
+	def write(self, appName, positions):
+		"""Caches positions for appName and schedules writing them to its file."""
+		copy = positions.copy()
+		self._cache(appName, positions)
+		with self._lock:
+			self._copies[appName] = (positions, copy)
+		self.writer.submit(appName, positions)
+
+	def _cache(self, appName, positions):
+		entry = self._entries.get(appName)
+		stamp = entry.stamp if entry is not None else self._stamp(self.fileName(appName))
+		self._entries[appName] = _Entry(positions, stamp, self._clock())
+
+	def _edit(self, appName, positions, edit):
+		# Applies edit to the writer's copy of positions, instead of copying the whole table again.
+		with self._lock:
+			copied = self._copies.get(appName)
+			edited = copied is not None and copied[0] is positions
+			if edited:
+				edit(copied[1])
+		if not edited:
+			# The writer has no copy of this table yet.
+			self.write(appName, positions)
+			return
+		self._cache(appName, positions)
+		self.writer.submit(appName, positions)
+
+	def _save(self, appName, positions):
+		# Runs on the writer thread.
+		fileName = self.fileName(appName)
+		if positions is None:
+			if os.path.exists(fileName):
+				os.remove(fileName)
+			return
+		with self._lock:
+			copied = self._copies.get(appName)
+			if copied is None:
+				return
+			# Records in the copy are never changed once stored, only replaced, so this list is a snapshot.
+			items = copied[1].items()
+		if not os.path.exists(self.directory):
+			os.makedirs(self.directory)
+		if appName in self._unreadable:
+			if os.path.exists(fileName):
+				os.replace(fileName, fileName + ".unreadable")
+			self._unreadable.discard(appName)
+		atomicWrite(fileName, b"\n".join(PositionTable(items).toConfig().write()) + b"\n")
+		entry = self._entries.get(appName)
+		if entry is not None and entry.positions is positions:
+			# Our own write must not look like an outside change.
+			entry.stamp = self._stamp(fileName)
+
+	def flush(self, wait=False):
+		self.writer.flush(wait)
+
+	# Single position changes still rewrite the whole file, there is no cheaper way with ConfigObj files.
+	# Consecutive edits are coalesced into one write by the writer.
+
+	def setPosition(self, appName, positions, name):
+		position = positions[name].copy()
+		self._edit(appName, positions, lambda copy: copy.set(name, position))
+
+	def removePosition(self, appName, positions, name):
+		self._edit(appName, positions, lambda copy: copy.remove(name))
+
+	def renamePosition(self, appName, positions, oldName, newName):
+		self._edit(appName, positions, lambda copy: copy.rename(oldName, newName))
+
+	def delete(self, appName):
+		"""Removes the position file of appName."""
+		self._unreadable.discard(appName)
+		self._entries[appName] = _Entry(None, None, self._clock())
+		with self._lock:
+			self._copies.pop(appName, None)
+		self.writer.submit(appName, None)
+
+	def close(self):
+		"""Writes pending changes and stops the writer."""
+		self.writer.close()
+
+	def invalidate(self, appName=None):
+		"""Forgets appName, or every application, so the next lookup reads the disk."""
+		if appName is None:
+			self._entries.clear()
+		else:
+			self._entries.pop(appName, None)
+
+	def resetCounters(self):
+		self.hits = self.stats = self.parses = 0
+
+
+class ShortCutIndex(object):
+	"""
+	Maps normalized gesture identifiers to the (x, y) position clicked by that shortcut.
+	Built once from a L{PositionTable}, then kept up to date as single positions change.
+	"""
+
+	def __init__(self, normalize, positions=None):
+		self._normalize = normalize
+		self._targets = {}
+		self._gestureOf = {}
+		if positions is not None:
+			self.build(positions)
+
+	def __len__(self):
+		return len(self._targets)
+
+	@property
+	def gestures(self):
+		return frozenset(self._targets)
+
+	def build(self, positions):
+		self.clear()
+		for name, position in positions.items():
+			self.set(name, position)
+
+	def clear(self):
+		self._targets.clear()
+		self._gestureOf.clear()
+
+	def set(self, name, position):
+		"""Indexes the gesture of the position called name, replacing what was indexed for it before."""
+		self.remove(name)
+		if not position.gesture:
+			return
+		try:
+			identifier = self._normalize(position.gesture)
+		except Exception:
+			return
+		# A shortcut belongs to one position only.
+		owner = self._targets.get(identifier)
+		if owner is not None:
+			self._gestureOf.pop(owner[2], None)
+		self._targets[identifier] = (position.x, position.y, name)
+		self._gestureOf[name] = identifier
+
+	def remove(self, name):
+		identifier = self._gestureOf.pop(name, None)
+		if identifier is not None:
+			del self._targets[identifier]
+
+	def rename(self, oldName, newName):
+		identifier = self._gestureOf.pop(oldName, None)
+		if identifier is not None:
+			x, y, name = self._targets[identifier]
+			self._targets[identifier] = (x, y, newName)
+			self._gestureOf[newName] = identifier
+
+	def lookup(self, identifiers):
+		"""Returns (x, y) for the first of identifiers that is a shortcut, or None."""
+		targets = self._targets
+		for identifier in identifiers:
+			target = targets.get(identifier)
+			if target is not None:
+				return target[0], target[1]
+		return None
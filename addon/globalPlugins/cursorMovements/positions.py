@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Typed mouse position records.
+# Position files are parsed into these records once when loaded and serialized once when saved.
+
+from collections import OrderedDict
+import re
+
+from configobj import ConfigObj
+
+
+# ConfigObj cannot read back section names containing brackets, nor names with both kinds of quotes.
+# These characters are percent escaped in section names, and % too so escaping can be undone.
+_SECTION_ESCAPES = {"%": "%25", "[": "%5B", "]": "%5D", '"': "%22"}
+_sectionEscape = re.compile("[%s]" % re.escape("".join(_SECTION_ESCAPES)))
+_sectionUnescape = re.compile("|".join(_SECTION_ESCAPES.values()))
+_SECTION_UNESCAPES = {escaped: char for char, escaped in _SECTION_ESCAPES.items()}
+
+
+def escapeSectionName(name):
+	return _sectionEscape.sub(lambda match: _SECTION_ESCAPES[match.group()], name)
+
+
+def unescapeSectionName(name):
+	return _sectionUnescape.sub(lambda match: _SECTION_UNESCAPES[match.group()], name)
+
+
+class Position(object):
+	"""
+	A mouse position: integer screen coordinates, an optional gesture identifier (such as "kb:control+f1")
+	that clicks it, and optional metadata stored along with it.
+	"""
+
+	__slots__ = ("x", "y", "gesture", "meta")
+
+	def __init__(self, x, y, gesture=None, meta=None):
+		self.x = int(x)
+		self.y = int(y)
+		self.gesture = gesture or None
+		self.meta = meta
+
+	def __repr__(self):
+		return "Position(%d, %d, %r)" % (self.x, self.y, self.gesture)
+
+	def __eq__(self, other):
+		if not isinstance(other, Position):
+			return NotImplemented
+		return (self.x, self.y, self.gesture, self.meta) == (other.x, other.y, other.gesture, other.meta)
+
+	def __ne__(self, other):
+		result = self.__eq__(other)
+		return result if result is NotImplemented else not result
+
+	@property
+	def point(self):
+		return self.x, self.y
+
+	def copy(self):
+		return Position(self.x, self.y, self.gesture, dict(self.meta) if self.meta else None)
+
+	@classmethod
+	def fromLegacy(cls, value):
+		"""
+		Parses the old "x,y[,shortcut]" format, where shortcut is a keyboard gesture without its "kb:" prefix.
+		ConfigObj returns the value as a list when it was written without quotes.
+		Raises ValueError for malformed values.
+		"""
+		fields = list(value) if isinstance(value, (list, tuple)) else value.split(",")
+		if len(fields) < 2:
+			raise ValueError("not a position: %r" % (value,))
+		# Old versions stored "control" in upper case, undo that so gestures compare equal.
+		gesture = fields[2].strip().replace("CONTROL", "control") if len(fields) > 2 else ""
+		return cls(fields[0], fields[1], "kb:" + gesture if gesture else None)
+
+	@classmethod
+	def fromSection(cls, section):
+		"""Parses a position stored as a section with x, y, an optional gesture and any other metadata keys."""
+		meta = {key: value for key, value in section.items() if key not in ("x", "y", "gesture")}
+		return cls(section["x"], section["y"], section.get("gesture"), meta or None)
+
+	def toSection(self):
+		section = OrderedDict((("x", self.x), ("y", self.y)))
+		if self.gesture:
+			section["gesture"] = self.gesture
+		if self.meta:
+			section.update(self.meta)
+		return section
+
+
+class PositionTable(object):
+	"""
+	The named mouse positions of one application, in the order they were saved.
+	Positions sit in a list of [name, position] slots and names map to their slot, so renaming or removing one
+	does not move the others. Removed slots are left empty until they make up half of the list.
+	"""
+
+	def __init__(self, positions=None):
+		self._slots = []
+		self._slotOf = {}
+		for name, position in positions or ():
+			self.set(name, position)
+
+	def __len__(self):
+		return len(self._slotOf)
+
+	def __contains__(self, name):
+		return name in self._slotOf
+
+	def __getitem__(self, name):
+		return self._slots[self._slotOf[name]][1]
+
+	def __iter__(self):
+		return (slot[0] for slot in self._slots if slot is not None)
+
+	def copy(self):
+		"""Returns a copy that does not share any record with this table."""
+		return PositionTable((name, position.copy()) for name, position in self.items())
+
+	def keys(self):
+		return list(self)
+
+	def items(self):
+		return [(slot[0], slot[1]) for slot in self._slots if slot is not None]
+
+	def values(self):
+		return [slot[1] for slot in self._slots if slot is not None]
+
+	def get(self, name, default=None):
+		index = self._slotOf.get(name)
+		return default if index is None else self._slots[index][1]
+
+	def set(self, name, position):
+		"""Stores position as name, in the place of the position it replaces or else at the end."""
+		index = self._slotOf.get(name)
+		if index is None:
+			self._slotOf[name] = len(self._slots)
+			self._slots.append([name, position])
+		else:
+			self._slots[index][1] = position
+
+	def remove(self, name):
+		self._slots[self._slotOf.pop(name)] = None
+		if len(self._slots) > 2 * len(self._slotOf) + 16:
+			self._compact()
+
+	def _compact(self):
+		self._slots = [slot for slot in self._slots if slot is not None]
+		self._slotOf = {slot[0]: index for index, slot in enumerate(self._slots)}
+
+	def clear(self):
+		del self._slots[:]
+		self._slotOf.clear()
+
+	def rename(self, oldName, newName):
+		"""Renames a position, keeping its place in the table. A position already called newName is replaced."""
+		if newName == oldName:
+			return
+		if newName in self._slotOf:
+			self.remove(newName)
+		index = self._slotOf.pop(oldName)
+		self._slots[index][0] = newName
+		self._slotOf[newName] = index
+
+	def ownerOf(self, gesture):
+		"""Returns the name of the position clicked by gesture, or None."""
+		for name, position in self.items():
+			if position.gesture == gesture:
+				return name
+		return None
+
+	def setGesture(self, name, gesture):
+		"""
+		Makes gesture click the position called name, taking it away from any other position.
+		Returns the names of the positions whose gesture changed.
+		"""
+		changed = [name]
+		for other, position in self.items():
+			if other != name and position.gesture == gesture:
+				position.gesture = None
+				changed.append(other)
+		self[name].gesture = gesture
+		return changed
+
+	@classmethod
+	def fromConfig(cls, config):
+		"""
+		Reads positions from a ConfigObj, accepting both the section format and the old "x,y[,shortcut]" strings.
+		Malformed entries are skipped.
+		"""
+		table = cls()
+		for name, value in config.items():
+			try:
+				if isinstance(value, dict):
+					table.set(unescapeSectionName(name), Position.fromSection(value))
+				else:
+					table.set(name, Position.fromLegacy(value))
+			except (KeyError, ValueError, TypeError):
+				continue
+		return table
+
+	def toConfig(self, fileName=None):
+		"""Returns the positions as a ConfigObj in the section format, ready to be written."""
+		config = ConfigObj(encoding="UTF-8")
+		config.filename = fileName
+		for name, position in self.items():
+			config[escapeSectionName(name)] = position.toSection()
+		return config
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Speculative path planning.
+# While the cursor rests, the moves the user is likely to ask for next are planned on a background thread,
+# so the command that asks for one of them does not have to plan it.
+
+import threading
+
+
+class PathPrefetcher(object):
+	"""
+	Plans paths from one start position to a few likely destinations in the background.
+	planner(startX, startY, destX, destY) returns a L{trajectory.Trajectory}.
+	context is anything that changes the planned path besides start and destination (such as the settings),
+	a plan is only handed out for the same start, destination and context.
+	Each call to prefetch replaces the plans of the previous one.
+	"""
+
+	def __init__(self, planner, onError=None):
+		self._planner = planner
+		self._onError = onError
+		self._condition = threading.Condition()
+		self._start = None
+		self._context = None
+		self._queue = []
+		self._ready = {}
+		self._closed = False
+		self.hits = 0
+		self.misses = 0
+		self.planned = 0
+		self.discarded = 0
+		self._thread = threading.Thread(target=self._run, name="cursorMovements.prefetch")
+		self._thread.daemon = True
+		self._thread.start()
+
+	def prefetch(self, start, destinations, context=None):
+		"""Starts planning from start to each of destinations, in that order, forgetting earlier plans."""
+		start = tuple(start)
+		with self._condition:
+			self._discard()
+			self._start = start
+			self._context = context
+			for destination in destinations:
+				destination = tuple(destination)
+				if destination != start and destination not in self._queue:
+					self._queue.append(destination)
+			self._condition.notify()
+
+	def take(self, start, destination, context=None):
+		"""Returns the plan from start to destination if it is ready, None otherwise. A plan is used once."""
+		with self._condition:
+			path = None
+			if tuple(start) == self._start and context == self._context:
+				path = self._ready.pop(tuple(destination), None)
+			elif self._start is not None:
+				# The cursor was moved some other way or the settings changed, every plan is stale.
+				self._discard()
+				self._start = self._context = None
+			if path is None:
+				self.misses += 1
+			else:
+				self.hits += 1
+			return path
+
+	def _discard(self):
+		self.discarded += len(self._ready)
+		self._ready.clear()
+		del self._queue[:]
+
+	def close(self):
+		with self._condition:
+			self._closed = True
+			self._discard()
+			self._condition.notify()
+		self._thread.join(1.0)
+
+	def _run(self):
+		condition = self._condition
+		while True:
+			with condition:
+				while not self._queue and not self._closed:
+					condition.wait()
+				if self._closed:
+					return
+				destination = self._queue.pop(0)
+				start, context = self._start, self._context
+			try:
+				path = self._planner(start[0], start[1], destination[0], destination[1])
+			except Exception:
+				if self._onError:
+					self._onError()
+				continue
+			with condition:
+				# Keep the plan only if it was not replaced or found stale meanwhile.
+				if start == self._start and context == self._context:
+					self._ready[destination] = path
+					self.planned += 1
+				else:
+					self.discarded += 1
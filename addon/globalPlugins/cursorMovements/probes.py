@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Latency probes.
+# Timings from the hot paths go into fixed bucket histograms. Call sites test L{enabled} before anything else,
+# so a disabled probe costs one global lookup.
+
+from bisect import bisect_left
+from collections import OrderedDict
+import threading
+import time
+
+
+#: Probes only record while this is True.
+enabled = False
+now = time.perf_counter
+
+# Upper bounds of the histogram buckets in seconds: from 10 microseconds to about 20 seconds,
+# each bucket 25% wider than the one before. Anything slower goes in a last, unbounded bucket.
+BUCKET_BOUNDS = tuple(10e-6 * 1.25 ** i for i in range(66))
+
+
+class Histogram(object):
+	"""
+	Counts of durations per bucket of L{BUCKET_BOUNDS}, with their sum and maximum.
+	Percentiles are the upper bound of the bucket holding them, so they are at most 25% too high.
+	Recording from several threads may lose a count now and then, which does not matter for statistics.
+	"""
+
+	def __init__(self):
+		self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+		self.count = 0
+		self.total = 0.0
+		self.max = 0.0
+
+	def record(self, seconds):
+		self.counts[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+		self.count += 1
+		self.total += seconds
+		if seconds > self.max:
+			self.max = seconds
+
+	@property
+	def mean(self):
+		return self.total / self.count if self.count else 0.0
+
+	def percentile(self, percent):
+		if not self.count:
+			return 0.0
+		rank = percent / 100.0 * self.count
+		seen = 0
+		for bucket, count in enumerate(self.counts):
+			seen += count
+			if seen >= rank and count:
+				if bucket == len(BUCKET_BOUNDS):
+					return self.max
+				return min(BUCKET_BOUNDS[bucket], self.max)
+		return self.max
+
+	def summary(self):
+		return OrderedDict((
+			("count", self.count),
+			("mean", self.mean),
+			("p50", self.percentile(50)),
+			("p95", self.percentile(95)),
+			("p99", self.percentile(99)),
+			("max", self.max),
+		))
+
+
+_lock = threading.Lock()
+histograms = OrderedDict()
+# Start times of spans that end in another function, such as a gesture and the first move it causes.
+_marks = {}
+
+
+def record(name, seconds):
+	histogram = histograms.get(name)
+	if histogram is None:
+		with _lock:
+			histogram = histograms.setdefault(name, Histogram())
+	histogram.record(seconds)
+
+
+def since(name, start):
+	"""Records the time elapsed since start, a value of L{now}."""
+	record(name, now() - start)
+
+
+def mark(name):
+	"""Starts the span name, replacing one that has not ended."""
+	_marks[name] = now()
+
+
+def markEnd(name, histogramName):
+	"""Ends the span name started by mark, recording it as histogramName. Does nothing when no span is open."""
+	start = _marks.pop(name, None)
+	if start is not None:
+		record(histogramName, now() - start)
+
+
+def reset():
+	with _lock:
+		histograms.clear()
+		_marks.clear()
+
+
+def report():
+	"""Returns a text table with the statistics of every histogram, times in milliseconds."""
+	lines = ["%-24s %8s %9s %9s %9s %9s %9s" % ("probe", "count", "mean", "p50", "p95", "p99", "max")]
+	for name, histogram in list(histograms.items()):
+		summary = histogram.summary()
+		lines.append("%-24s %8d %9.2f %9.2f %9.2f %9.2f %9.2f" % (
+			name, summary["count"], summary["mean"] * 1000, summary["p50"] * 1000, summary["p95"] * 1000,
+			summary["p99"] * 1000, summary["max"] * 1000
+		))
+	return "\n".join(lines)
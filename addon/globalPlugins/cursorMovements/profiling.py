@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# On demand profiling of the add-on.
+# cProfile records the thread that starts the session and the playback thread of every move started
+# while it runs. The report only lists functions of the add-on.
+
+import cProfile
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+
+
+# Functions listed in a report, the slowest first.
+REPORT_LINES = 80
+# Threads profiled in one session, each move is played by a new thread. Later threads are not profiled.
+MAX_THREADS = 500
+# From Python 3.12 on, a profiler sees every thread of the process and only one can be active at a time.
+PROCESS_WIDE = sys.version_info >= (3, 12)
+# Before that, each thread needs its own profiler, which only that thread can remove. Only playback threads
+# get one: they end with their move, so their profiler does not outlive the session by much.
+THREAD_PREFIX = "cursorMovements.playback"
+
+
+class Profiler(object):
+	"""
+	A profiling session at a time. start and stop must be called from the same thread.
+	include is the directory whose code is reported, reports are written to directory.
+	"""
+
+	def __init__(self, directory, include, clock=time.time):
+		self.directory = directory
+		self.include = include
+		self._clock = clock
+		self._lock = threading.Lock()
+		self._main = None
+		self._threadProfiles = []
+		self.startedAt = None
+
+	@property
+	def running(self):
+		return self._main is not None
+
+	def start(self):
+		if self.running:
+			return
+		self._threadProfiles = []
+		self._main = cProfile.Profile()
+		if not PROCESS_WIDE:
+			# Threads started from now on call this when they run their first Python code.
+			threading.setprofile(self._profileThread)
+		self.startedAt = self._clock()
+		self._main.enable()
+
+	def _profileThread(self, frame, event, arg):
+		sys.setprofile(None)
+		if not threading.current_thread().name.startswith(THREAD_PREFIX):
+			return
+		profile = cProfile.Profile()
+		with self._lock:
+			if self._main is None or len(self._threadProfiles) >= MAX_THREADS:
+				# Neither this thread nor the next ones are profiled.
+				threading.setprofile(None)
+				return
+			self._threadProfiles.append(profile)
+		profile.enable()
+
+	def stop(self):
+		"""Ends the session and writes its report. Returns the report file name, None when not running."""
+		if not self.running:
+			return None
+		self._main.disable()
+		if not PROCESS_WIDE:
+			threading.setprofile(None)
+		with self._lock:
+			main, self._main = self._main, None
+			threadProfiles, self._threadProfiles = self._threadProfiles, []
+		for profile in threadProfiles:
+			# A playback thread still running goes on recording until its move ends, but is no longer reported.
+			profile.disable()
+		duration = self._clock() - self.startedAt
+		stats = pstats.Stats(main)
+		for profile in threadProfiles:
+			try:
+				stats.add(profile)
+			except TypeError:
+				# A thread that never got to call anything has no statistics.
+				pass
+		fileName = os.path.join(
+			self.directory, time.strftime("profile-%Y%m%d-%H%M%S.txt", time.localtime(self.startedAt))
+		)
+		if not os.path.exists(self.directory):
+			os.makedirs(self.directory)
+		with open(fileName, "w", encoding="utf-8") as f:
+			f.write(self.report(stats, duration, len(threadProfiles)))
+		return fileName
+
+	def report(self, stats, duration, threads):
+		output = io.StringIO()
+		if PROCESS_WIDE:
+			output.write("Profiled all threads for %.1f seconds.\n" % duration)
+		else:
+			output.write("Profiled for %.1f seconds, %d playback threads started meanwhile.\n" % (duration, threads))
+		output.write("Only functions in %s are listed, sorted by cumulative time.\n" % self.include)
+		stats.stream = output
+		stats.sort_stats("cumulative", "calls").print_stats(re.escape(self.include), REPORT_LINES)
+		return output.getvalue()
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Live recording of cursor movements.
+# The cursor is sampled at a fixed rate. Samples a replay would not miss are dropped as they come in,
+# the rest are delta encoded into fixed size chunks kept in a bounded ring, so memory stays flat
+# however long the recording runs.
+
+from collections import deque
+import os
+import struct
+import threading
+import time
+
+from .persistence import atomicWrite
+from .trajectory import Trajectory
+
+
+DEFAULT_RATE = 200
+# Pixels a dropped sample may be away from the replayed movement at the same time.
+DEFAULT_TOLERANCE = 1.0
+# Samples waiting to be kept or dropped. The oldest is kept when it is full, which bounds the cost per sample.
+MAX_WINDOW = 64
+# Timestamps are stored in units of 100 microseconds.
+TICKS_PER_SECOND = 10000
+CHUNK_SIZE = 16384
+# Memory for the encoded samples of one recording, the oldest chunks are dropped beyond that.
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+_FILE_MAGIC = b"CMRC"
+_FILE_VERSION = 1
+_header = struct.Struct("<4sHIQ")
+_chunkHeader = struct.Struct("<I")
+
+
+def _writeVarint(out, value):
+	# Zigzag, so small negative deltas are small too, then 7 bits per byte.
+	value = (value << 1) ^ (value >> 63)
+	while value > 0x7F:
+		out.append((value & 0x7F) | 0x80)
+		value >>= 7
+	out.append(value)
+
+
+def _readVarints(data):
+	value = shift = 0
+	for byte in data:
+		value |= (byte & 0x7F) << shift
+		if byte & 0x80:
+			shift += 7
+			continue
+		yield (value >> 1) ^ -(value & 1)
+		value = shift = 0
+
+
+class CompressedRing(object):
+	"""
+	Points (x, y, ticks) delta encoded as varints in chunks of about CHUNK_SIZE bytes.
+	Each chunk starts with an absolute point, so the oldest chunk can be dropped without losing the others.
+	"""
+
+	def __init__(self, maxBytes=DEFAULT_MAX_BYTES, chunkSize=CHUNK_SIZE):
+		self.chunkSize = chunkSize
+		self.maxChunks = max(1, maxBytes // chunkSize)
+		self.chunks = deque()
+		self._current = None
+		self._last = None
+		self.points = 0
+		self.droppedPoints = 0
+		self._chunkPoints = deque()
+
+	@property
+	def sizeBytes(self):
+		return sum(len(chunk) for chunk in self.chunks)
+
+	def append(self, x, y, ticks):
+		current = self._current
+		if current is None or len(current) >= self.chunkSize:
+			if len(self.chunks) == self.maxChunks:
+				self.chunks.popleft()
+				dropped = self._chunkPoints.popleft()
+				self.points -= dropped
+				self.droppedPoints += dropped
+			current = self._current = bytearray()
+			self.chunks.append(current)
+			self._chunkPoints.append(0)
+			_writeVarint(current, x)
+			_writeVarint(current, y)
+			_writeVarint(current, ticks)
+		else:
+			lastX, lastY, lastTicks = self._last
+			_writeVarint(current, x - lastX)
+			_writeVarint(current, y - lastY)
+			_writeVarint(current, ticks - lastTicks)
+		self._last = (x, y, ticks)
+		self._chunkPoints[-1] += 1
+		self.points += 1
+
+	def __iter__(self):
+		"""Yields (x, y, ticks) from the oldest kept point."""
+		for chunk in list(self.chunks):
+			values = _readVarints(bytes(chunk))
+			x, y, ticks = next(values), next(values), next(values)
+			yield x, y, ticks
+			for dx in values:
+				x += dx
+				y += next(values)
+				ticks += next(values)
+				yield x, y, ticks
+
+	def toTrajectory(self, rate=None):
+		"""
+		The recorded movement as a L{Trajectory} starting at its first point, with times from there.
+		With rate, the dropped samples are filled in again by interpolating between the kept ones
+		at rate frames per second, as playback holds the cursor still between two samples.
+		"""
+		points = iter(self)
+		first = next(points, None)
+		if first is None:
+			return Trajectory(0, 0)
+		lastX, lastY, startTicks = first
+		path = Trajectory(lastX, lastY)
+		period = 1.0 / rate if rate else None
+		lastT = 0.0
+		frame = 1
+		for x, y, ticks in points:
+			t = (ticks - startTicks) / float(TICKS_PER_SECOND)
+			if period is not None and t > lastT:
+				fromX, fromY = lastX, lastY
+				while frame * period < t:
+					share = (frame * period - lastT) / (t - lastT)
+					frameX = int(round(fromX + (x - fromX) * share))
+					frameY = int(round(fromY + (y - fromY) * share))
+					if frameX != lastX or frameY != lastY:
+						path.append(frameX, frameY, frame * period)
+						lastX, lastY = frameX, frameY
+					frame += 1
+			if x != lastX or y != lastY:
+				path.append(x, y, t)
+				lastX, lastY = x, y
+			lastT = t
+		return path
+
+	def save(self, fileName):
+		"""Writes the encoded chunks as they are, atomically."""
+		data = bytearray(_header.pack(_FILE_MAGIC, _FILE_VERSION, len(self.chunks), self.points))
+		for chunk in self.chunks:
+			data += _chunkHeader.pack(len(chunk))
+			data += chunk
+		directory = os.path.dirname(fileName)
+		if directory and not os.path.exists(directory):
+			os.makedirs(directory)
+		atomicWrite(fileName, bytes(data))
+
+	@classmethod
+	def load(cls, fileName):
+		"""Reads a recording written by save, for replaying it."""
+		with open(fileName, "rb") as f:
+			data = f.read()
+		magic, version, chunkCount, points = _header.unpack_from(data)
+		if magic != _FILE_MAGIC or version != _FILE_VERSION:
+			raise ValueError("not a recording file: %s" % fileName)
+		ring = cls(maxBytes=max(len(data), CHUNK_SIZE))
+		offset = _header.size
+		for unused in range(chunkCount):
+			(length,) = _chunkHeader.unpack_from(data, offset)
+			offset += _chunkHeader.size
+			ring.chunks.append(bytearray(data[offset:offset + length]))
+			offset += length
+		ring.points = points
+		return ring
+
+
+class Simplifier(object):
+	"""
+	Keeps the samples needed to replay a movement within tolerance pixels, passing them to keep(x, y, t).
+	A sample is dropped when it lies within tolerance of the position interpolated at its time between
+	the samples kept around it, so bends, speed changes and pauses are kept. Repeated positions while
+	the cursor rests are collapsed to the first and last.
+	"""
+
+	def __init__(self, keep, tolerance=DEFAULT_TOLERANCE):
+		self._keep = keep
+		self._limit = tolerance * tolerance
+		self._anchor = None
+		self._window = []
+		# Last sample seen while the cursor rests, not passed on until it moves again.
+		self._resting = None
+
+	def add(self, x, y, t):
+		if self._anchor is None:
+			self._anchor = (x, y, t)
+			self._keep(x, y, t)
+			return
+		last = self._window[-1] if self._window else self._anchor
+		if (x, y) == (last[0], last[1]):
+			self._resting = (x, y, t)
+			return
+		if self._resting is not None:
+			resting, self._resting = self._resting, None
+			self._push(*resting)
+		self._push(x, y, t)
+
+	def _push(self, x, y, t):
+		window = self._window
+		if window and not self._fits(x, y, t):
+			# The newest sample cannot be reached in a straight line, the one before it is kept.
+			self._keepAnchor(len(window) - 1)
+		window.append((x, y, t))
+		if len(window) >= MAX_WINDOW:
+			self._keepAnchor(len(window) - 1)
+
+	def _fits(self, x, y, t):
+		anchorX, anchorY, anchorT = self._anchor
+		span = t - anchorT
+		dx, dy = x - anchorX, y - anchorY
+		for px, py, pt in self._window:
+			share = (pt - anchorT) / span if span > 0 else 1.0
+			ex = px - (anchorX + dx * share)
+			ey = py - (anchorY + dy * share)
+			if ex * ex + ey * ey > self._limit:
+				return False
+		return True
+
+	def _keepAnchor(self, index):
+		anchor = self._window[index]
+		self._keep(*anchor)
+		self._anchor = anchor
+		del self._window[:index + 1]
+
+	def flush(self):
+		"""Keeps the last sample, call it when recording ends."""
+		if self._resting is not None:
+			resting, self._resting = self._resting, None
+			self._window.append(resting)
+		if self._window:
+			self._keepAnchor(len(self._window) - 1)
+
+
+class Recorder(threading.Thread):
+	"""
+	Samples getPosition() rate times per second into a L{CompressedRing} until stopped.
+	Samples are scheduled against the start time like playback frames, late samples are skipped.
+	"""
+
+	def __init__(
+		self, getPosition, rate=DEFAULT_RATE, tolerance=DEFAULT_TOLERANCE, maxBytes=DEFAULT_MAX_BYTES,
+		clock=time.perf_counter
+	):
+		super(Recorder, self).__init__(name="cursorMovements.recorder")
+		self.daemon = True
+		self._getPosition = getPosition
+		self.rate = rate
+		self._clock = clock
+		self._stopEvent = threading.Event()
+		self.ring = CompressedRing(maxBytes)
+		self._simplifier = Simplifier(self._store, tolerance)
+		self.samples = 0
+		self.skippedSamples = 0
+
+	def _store(self, x, y, t):
+		self.ring.append(x, y, int(round(t * TICKS_PER_SECOND)))
+
+	def stop(self):
+		"""Stops sampling and returns once every kept sample is in the ring."""
+		self._stopEvent.set()
+		if self.is_alive():
+			self.join()
+
+	def run(self):
+		period = 1.0 / self.rate
+		clock = self._clock
+		wait = self._stopEvent.wait
+		start = clock()
+		sample = 0
+		add = self._simplifier.add
+		getPosition = self._getPosition
+		while True:
+			delay = start + sample * period - clock()
+			if delay > 0 and wait(delay):
+				break
+			if self._stopEvent.is_set():
+				break
+			if delay < -period:
+				late = int(-delay / period)
+				self.skippedSamples += late
+				sample += late
+			x, y = getPosition()
+			add(x, y, sample * period)
+			self.samples += 1
+			sample += 1
+		self._simplifier.flush()
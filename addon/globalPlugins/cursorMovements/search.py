@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Incremental substring search over saved mouse positions.
+# Every 1, 2 and 3 character substring of an entry's text maps to the entries containing it,
+# so a query only looks at candidate entries instead of scanning them all.
+
+# Longest substring kept in the index. Longer queries intersect the entries of their substrings of that size.
+GRAM = 3
+
+
+def _grams(text):
+	grams = set()
+	length = len(text)
+	for size in range(1, GRAM + 1):
+		for start in range(length - size + 1):
+			grams.add(text[start:start + size])
+	return grams
+
+
+def positionText(name, position):
+	"""The text a position is found by: its name, coordinates and gesture, lower cased."""
+	gesture = position.gesture.split(":", 1)[-1] if position.gesture else ""
+	return "\n".join((name, "%d,%d" % (position.x, position.y), gesture)).lower()
+
+
+class SearchIndex(object):
+	"""
+	Case insensitive substring index of named entries.
+	Entries are added, changed, renamed and removed one at a time.
+	search returns matching names in the order the entries were first added.
+	"""
+
+	def __init__(self):
+		self._postings = {}
+		self._texts = {}
+		self._order = {}
+		self._counter = 0
+		self._lastQuery = None
+		self._lastResult = None
+
+	def __len__(self):
+		return len(self._texts)
+
+	def _forgetLastResult(self):
+		self._lastQuery = self._lastResult = None
+
+	def _index(self, name, text):
+		self._texts[name] = text
+		postings = self._postings
+		for gram in _grams(text):
+			entries = postings.get(gram)
+			if entries is None:
+				postings[gram] = {name}
+			else:
+				entries.add(name)
+
+	def _unindex(self, name):
+		text = self._texts.pop(name)
+		postings = self._postings
+		for gram in _grams(text):
+			entries = postings[gram]
+			entries.discard(name)
+			if not entries:
+				del postings[gram]
+
+	def set(self, name, text):
+		"""Adds an entry, or replaces the text of an existing one."""
+		text = text.lower()
+		if name in self._texts:
+			if self._texts[name] == text:
+				return
+			self._unindex(name)
+		else:
+			self._order[name] = self._counter
+			self._counter += 1
+		self._index(name, text)
+		self._forgetLastResult()
+
+	def remove(self, name):
+		if name not in self._texts:
+			return
+		self._unindex(name)
+		del self._order[name]
+		self._forgetLastResult()
+
+	def rename(self, oldName, newName, text):
+		"""Renames an entry, keeping its place in the order."""
+		if oldName not in self._order:
+			return
+		order = self._order[oldName]
+		self.remove(oldName)
+		self.set(newName, text)
+		self._order[newName] = order
+
+	def search(self, query):
+		"""Returns the names of all entries whose text contains query, in order. An empty query matches all."""
+		query = query.lower()
+		if not query:
+			names = self._texts.keys()
+		elif self._lastQuery and self._lastQuery in query:
+			# The user typed more characters: only the previous matches can still match.
+			texts = self._texts
+			names = [name for name in self._lastResult if query in texts[name]]
+		elif len(query) <= GRAM:
+			names = self._postings.get(query, ())
+		else:
+			postings = self._postings
+			grams = sorted(
+				(postings.get(query[start:start + GRAM], set()) for start in range(len(query) - GRAM + 1)),
+				key=len
+			)
+			candidates = set(grams[0]).intersection(*grams[1:])
+			texts = self._texts
+			names = [name for name in candidates if query in texts[name]]
+		order = self._order
+		result = sorted(names, key=order.__getitem__)
+		self._lastQuery = query
+		self._lastResult = result
+		return result
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Uniform grid over screen points, for finding the nearest point, optionally in one direction.
+# Points are kept in square cells, a query only looks at the cells around the cursor,
+# in growing rings, until no closer point can be found.
+
+# Side of a grid cell in pixels.
+DEFAULT_CELL_SIZE = 128
+# How much sideways distance counts against a point when looking in a direction.
+# With 2, a point 100 pixels to the right and 50 down is as near as one 200 pixels straight to the right.
+SIDEWAYS_WEIGHT = 2
+
+# Screen y grows downwards.
+DIRECTIONS = {
+	"left": (-1, 0),
+	"right": (1, 0),
+	"up": (0, -1),
+	"down": (0, 1),
+}
+
+
+def directionalDistance(dx, dy, direction):
+	"""
+	Distance of a point at (dx, dy) from the cursor, as seen when looking in direction.
+	Returns None for points that are not on that side of the cursor.
+	"""
+	ux, uy = DIRECTIONS[direction]
+	ahead = dx * ux + dy * uy
+	if ahead <= 0:
+		return None
+	return ahead + SIDEWAYS_WEIGHT * abs(dx * uy - dy * ux)
+
+
+class SpatialIndex(object):
+	"""
+	Points keyed by any hashable, indexed by grid cell. Keys are inserted, moved and removed one at a time.
+	nearest never returns a point at the query position itself, so repeated jumps move on.
+	"""
+
+	def __init__(self, cellSize=DEFAULT_CELL_SIZE):
+		self.cellSize = cellSize
+		self._points = {}
+		self._cells = {}
+		# (minX, minY, maxX, maxY) of the cells ever occupied since the last clear, limits the ring search.
+		self._bounds = None
+
+	def __len__(self):
+		return len(self._points)
+
+	def __contains__(self, key):
+		return key in self._points
+
+	def keys(self):
+		return self._points.keys()
+
+	def point(self, key):
+		return self._points[key]
+
+	def _cellOf(self, x, y):
+		return x // self.cellSize, y // self.cellSize
+
+	def insert(self, key, x, y):
+		"""Adds the point called key, or moves it if it is already indexed."""
+		x, y = int(x), int(y)
+		if key in self._points:
+			if self._points[key] == (x, y):
+				return
+			self.remove(key)
+		self._points[key] = (x, y)
+		cell = self._cellOf(x, y)
+		keys = self._cells.get(cell)
+		if keys is None:
+			self._cells[cell] = {key}
+			bounds = self._bounds
+			if bounds is None:
+				self._bounds = cell + cell
+			else:
+				self._bounds = (
+					min(bounds[0], cell[0]), min(bounds[1], cell[1]), max(bounds[2], cell[0]), max(bounds[3], cell[1])
+				)
+		else:
+			keys.add(key)
+
+	def remove(self, key):
+		point = self._points.pop(key, None)
+		if point is None:
+			return
+		cell = self._cellOf(*point)
+		keys = self._cells[cell]
+		keys.discard(key)
+		if not keys:
+			del self._cells[cell]
+
+	def rename(self, oldKey, newKey):
+		point = self._points.get(oldKey)
+		if point is not None:
+			self.remove(oldKey)
+			self.insert(newKey, *point)
+
+	def clear(self):
+		self._points.clear()
+		self._cells.clear()
+		self._bounds = None
+
+	def _ring(self, cx, cy, radius):
+		# Cells at Chebyshev distance radius from (cx, cy).
+		if radius == 0:
+			yield cx, cy
+			return
+		for i in range(-radius, radius + 1):
+			yield cx + i, cy - radius
+			yield cx + i, cy + radius
+		for i in range(-radius + 1, radius):
+			yield cx - radius, cy + i
+			yield cx + radius, cy + i
+
+	def _score(self, key, x, y, direction):
+		px, py = self._points[key]
+		dx, dy = px - x, py - y
+		if dx == 0 and dy == 0:
+			return None
+		if direction is None:
+			return (dx * dx + dy * dy) ** 0.5
+		return directionalDistance(dx, dy, direction)
+
+	def nearest(self, x, y, direction=None):
+		"""
+		Returns the key of the point nearest to (x, y), or None.
+		With direction ("left", "right", "up" or "down"), only points on that side count,
+		and sideways distance weighs more than distance ahead.
+		"""
+		if direction is not None and direction not in DIRECTIONS:
+			raise ValueError("unknown direction: %r" % (direction,))
+		cells = self._cells
+		if not cells:
+			return None
+		x, y = int(x), int(y)
+		cx, cy = self._cellOf(x, y)
+		# Only cells within these bounds can hold an answer, past them there are no occupied cells.
+		minX, minY, maxX, maxY = self._bounds
+		if direction is not None:
+			# Points on that side are in the cursor's own cell or beyond it.
+			ux, uy = DIRECTIONS[direction]
+			if ux > 0:
+				minX = max(minX, cx)
+			elif ux < 0:
+				maxX = min(maxX, cx)
+			elif uy > 0:
+				minY = max(minY, cy)
+			else:
+				maxY = min(maxY, cy)
+			if minX > maxX or minY > maxY:
+				return None
+		maxRadius = max(cx - minX, maxX - cx, cy - minY, maxY - cy, 0)
+		best = bestScore = None
+		scanned = 0
+		for radius in range(maxRadius + 1):
+			# Every point in this ring is at least this far, whatever the direction (the scores are never
+			# below the straight line distance).
+			if bestScore is not None and (radius - 1) * self.cellSize > bestScore:
+				break
+			if scanned + 8 * radius > len(cells):
+				# Walking the rings costs more than looking at every remaining occupied cell.
+				return self._nearestOf(
+					[
+						key for (gx, gy), keys in cells.items()
+						if minX <= gx <= maxX and minY <= gy <= maxY for key in keys
+					], x, y, direction
+				)
+			for cell in self._ring(cx, cy, radius):
+				scanned += 1
+				if not (minX <= cell[0] <= maxX and minY <= cell[1] <= maxY):
+					continue
+				keys = cells.get(cell)
+				if keys is None:
+					continue
+				for key in keys:
+					score = self._score(key, x, y, direction)
+					if score is not None and (bestScore is None or score < bestScore):
+						best, bestScore = key, score
+		return best
+
+	def _nearestOf(self, keys, x, y, direction):
+		best = bestScore = None
+		for key in keys:
+			score = self._score(key, x, y, direction)
+			if score is not None and (bestScore is None or score < bestScore):
+				best, bestScore = key, score
+		return best
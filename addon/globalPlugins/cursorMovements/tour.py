@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Tours: one continuous path through every waypoint.
+# The visiting order can be shortened (nearest neighbour, then 2-opt), and the whole path is planned
+# before playback starts, so the cursor does not stop at each waypoint unless asked to dwell there.
+
+import math
+
+from .models import fittsDuration
+from .spatial import SpatialIndex
+from .trajectory import Trajectory
+
+
+# Improvement passes of 2-opt.
+MAX_TWO_OPT_PASSES = 20
+# 2-opt only tries reversing up to this many waypoints at once, so a pass is O(n) rather than O(n²).
+TWO_OPT_WINDOW = 50
+# Beyond this many waypoints, the nearest neighbour order is used as is.
+MAX_TWO_OPT_POINTS = 5000
+
+
+def _distance(a, b):
+	return math.hypot(b[0] - a[0], b[1] - a[1])
+
+
+def tourLength(start, points, order):
+	"""Length in pixels of the route from start through points in order."""
+	total = 0.0
+	last = start
+	for index in order:
+		total += _distance(last, points[index])
+		last = points[index]
+	return total
+
+
+def nearestNeighbourOrder(start, points):
+	"""Visiting order that always goes to the closest waypoint not visited yet."""
+	# Waypoints at the same position are visited together, the index holds each position once.
+	indexesAt = {}
+	for index, point in enumerate(points):
+		indexesAt.setdefault(tuple(point), []).append(index)
+	xs = [point[0] for point in indexesAt]
+	ys = [point[1] for point in indexesAt]
+	# Cells holding a few waypoints each keep every lookup short, however many waypoints there are.
+	area = (max(xs) - min(xs) + 1) * (max(ys) - min(ys) + 1) if indexesAt else 1
+	remaining = SpatialIndex(cellSize=max(1, int(2 * math.sqrt(area / max(1, len(indexesAt))))))
+	for point in indexesAt:
+		remaining.insert(point, *point)
+	order = list(indexesAt.pop(tuple(start), ()))
+	remaining.remove(tuple(start))
+	last = start
+	while len(remaining):
+		last = remaining.nearest(*last)
+		remaining.remove(last)
+		order.extend(indexesAt[last])
+	return order
+
+
+def twoOpt(start, points, order, maxPasses=MAX_TWO_OPT_PASSES, window=TWO_OPT_WINDOW):
+	"""
+	Shortens an open route starting at start by reversing parts of it, at most window waypoints long,
+	while that helps. Returns the improved order, order itself is left alone.
+	"""
+	order = list(order)
+	count = len(order)
+	for unusedPass in range(maxPasses):
+		improved = False
+		for i in range(count - 1):
+			before = start if i == 0 else points[order[i - 1]]
+			first = points[order[i]]
+			for j in range(i + 1, min(count, i + 1 + window)):
+				last = points[order[j]]
+				# The route is open: reversing up to its end only changes the edge into the reversed part.
+				after = points[order[j + 1]] if j + 1 < count else None
+				current = _distance(before, first)
+				changed = _distance(before, last)
+				if after is not None:
+					current += _distance(last, after)
+					changed += _distance(first, after)
+				if changed < current - 1e-9:
+					order[i:j + 1] = reversed(order[i:j + 1])
+					first = points[order[i]]
+					improved = True
+		if not improved:
+			break
+	return order
+
+
+def shortestOrder(start, points):
+	order = nearestNeighbourOrder(start, points)
+	if len(points) > MAX_TWO_OPT_POINTS:
+		return order
+	return twoOpt(start, points, order)
+
+
+def _hermite(p0, v0, p1, v1, duration, u):
+	# Cubic Hermite interpolation of one coordinate, velocities in pixels per second.
+	u2 = u * u
+	u3 = u2 * u
+	return (
+		(2 * u3 - 3 * u2 + 1) * p0 + (u3 - 2 * u2 + u) * v0 * duration
+		+ (-2 * u3 + 3 * u2) * p1 + (u3 - u2) * v1 * duration
+	)
+
+
+def planTour(start, points, rate, dwell=0.0, durationModel=fittsDuration):
+	"""
+	Plans one L{Trajectory} from start through points, sampled at rate frames per second.
+	Each leg lasts durationModel(distance) seconds. Without dwell the cursor passes through the waypoints
+	without stopping, its velocity there set by the neighbouring waypoints (Catmull-Rom);
+	with dwell it stops at each waypoint and stays there for dwell seconds.
+	"""
+	stops = [tuple(start)] + [tuple(point) for point in points]
+	path = Trajectory(stops[0][0], stops[0][1])
+	# Legs of zero length are dropped, the cursor is already there.
+	route = [stops[0]]
+	for stop in stops[1:]:
+		if stop != route[-1]:
+			route.append(stop)
+	if len(route) < 2:
+		return path
+	durations = [durationModel(_distance(a, b)) for a, b in zip(route, route[1:])]
+	velocities = [(0.0, 0.0)] * len(route)
+	if not dwell:
+		for i in range(1, len(route) - 1):
+			span = durations[i - 1] + durations[i]
+			velocities[i] = (
+				(route[i + 1][0] - route[i - 1][0]) / span, (route[i + 1][1] - route[i - 1][1]) / span
+			)
+	period = 1.0 / rate
+	legStart = 0.0
+	lastX, lastY = route[0]
+	for leg, duration in enumerate(durations):
+		(x0, y0), (x1, y1) = route[leg], route[leg + 1]
+		(vx0, vy0), (vx1, vy1) = velocities[leg], velocities[leg + 1]
+		legEnd = legStart + duration
+		# Frames on the tour clock, not the leg clock, so samples stay evenly spaced across waypoints.
+		frame = int(legStart / period) + 1
+		t = frame * period
+		while t < legEnd:
+			u = (t - legStart) / duration
+			x = int(round(_hermite(x0, vx0, x1, vx1, duration, u)))
+			y = int(round(_hermite(y0, vy0, y1, vy1, duration, u)))
+			if x != lastX or y != lastY:
+				path.append(x, y, t)
+				lastX, lastY = x, y
+			frame += 1
+			t = frame * period
+		# Every waypoint is reached exactly.
+		if (x1, y1) != (lastX, lastY):
+			path.append(x1, y1, legEnd)
+			lastX, lastY = x1, y1
+		legStart = legEnd + dwell
+	return path
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Trajectory planning for mouse cursor movements.
+# Nothing in this module touches winUser, mouseHandler or wx,
+# so paths can be planned, cached, benchmarked and replayed without side effects.
+
+from array import array
+import math
+import random
+
+
+sqrt3 = math.sqrt(3)
+sqrt5 = math.sqrt(5)
+
+# Time between two simulation steps, in seconds.
+DEFAULT_STEP_INTERVAL = 1.0 / 120
+# Upper bound of simulation steps, guards against paths that never settle.
+MAX_STEPS = 20000
+
+
+class Trajectory(object):
+	"""
+	A planned cursor path stored as compact parallel arrays of x, y (pixels) and t (seconds from start).
+	Only samples where the integer cursor position changes are kept.
+	"""
+
+	__slots__ = ("xs", "ys", "ts", "startX", "startY", "requestedDuration", "droppedSamples")
+
+	def __init__(self, startX, startY, xs=None, ys=None, ts=None):
+		self.startX = startX
+		self.startY = startY
+		# Set when the path was resampled to arrive after a given time, see L{resampleToDuration}.
+		self.requestedDuration = None
+		# Set when the path was thinned, see L{emission.decimate}.
+		self.droppedSamples = None
+		self.xs = xs if xs is not None else array("i")
+		self.ys = ys if ys is not None else array("i")
+		self.ts = ts if ts is not None else array("d")
+
+	def append(self, x, y, t):
+		self.xs.append(x)
+		self.ys.append(y)
+		self.ts.append(t)
+
+	def __len__(self):
+		return len(self.xs)
+
+	def __getitem__(self, index):
+		return self.xs[index], self.ys[index], self.ts[index]
+
+	def __iter__(self):
+		return zip(self.xs, self.ys, self.ts)
+
+	@property
+	def length(self):
+		"""Length of the polyline from the start through every sample, in pixels."""
+		hypot = math.hypot
+		total = 0.0
+		lastX, lastY = self.startX, self.startY
+		for x, y in zip(self.xs, self.ys):
+			total += hypot(x - lastX, y - lastY)
+			lastX, lastY = x, y
+		return total
+
+	@property
+	def end(self):
+		if not self.xs:
+			return self.startX, self.startY
+		return self.xs[-1], self.ys[-1]
+
+	@property
+	def duration(self):
+		return self.ts[-1] if self.ts else 0.0
+
+	def velocityAt(self, index):
+		"""Cursor velocity in pixels per second when sample index is reached."""
+		if index <= 0:
+			if not self.xs or not self.ts[0]:
+				return 0.0, 0.0
+			dt = self.ts[0]
+			return (self.xs[0] - self.startX) / dt, (self.ys[0] - self.startY) / dt
+		dt = self.ts[index] - self.ts[index - 1]
+		if dt <= 0:
+			return 0.0, 0.0
+		return (self.xs[index] - self.xs[index - 1]) / dt, (self.ys[index] - self.ys[index - 1]) / dt
+
+
+def minimumJerk(tau):
+	"""Minimum jerk profile from 0 to 1 over tau in [0, 1], at rest at both ends."""
+	return tau * tau * tau * (10 + tau * (-15 + tau * 6))
+
+
+def quinticEasing(slope):
+	"""
+	Returns a quintic profile from 0 to 1 over tau in [0, 1] that starts with the given slope and ends at rest,
+	without acceleration at either end. A slope of 0 is L{minimumJerk}.
+	Slopes above L{MAX_EASING_SLOPE} are clamped, beyond it the profile would overshoot and come back.
+	"""
+	slope = max(0.0, min(MAX_EASING_SLOPE, slope))
+	d = 1.0 - slope
+	a3, a4, a5 = 10 * d + 4 * slope, -15 * d - 7 * slope, 6 * d + 3 * slope
+
+	def easing(tau):
+		return slope * tau + tau * tau * tau * (a3 + tau * (a4 + tau * a5))
+	return easing
+
+
+# Steepest start of a L{quinticEasing} that still moves forward all the way.
+MAX_EASING_SLOPE = 2.5
+
+
+def speedEasing(speed, length, duration):
+	"""
+	Easing for L{resampleToDuration} that starts at speed pixels per second along a path of length pixels
+	played in duration seconds, used to continue an interrupted move without slowing down first.
+	"""
+	if not speed or not length or not duration:
+		return minimumJerk
+	return quinticEasing(speed * duration / length)
+
+
+def iterWindMouse(
+	start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12,
+	seed=None, stepInterval=DEFAULT_STEP_INTERVAL, maxSteps=MAX_STEPS, velocity=(0.0, 0.0)
+):
+	'''
+	WindMouse algorithm, yields (x, y, t) each time the integer cursor position changes.
+	Released under the terms of the GPLv3 license.
+	G_0 - magnitude of the gravitational force
+	W_0 - magnitude of the wind force fluctuations
+	M_0 - maximum step size (velocity clip threshold)
+	D_0 - distance where wind behavior changes from random to damped
+	seed - seed for the private random generator, the same seed always gives the same path
+	velocity - initial cursor velocity in pixels per second, used to continue an interrupted move
+	'''
+	rnd = random.Random(seed).random
+	hypot = math.hypot
+	current_x, current_y = start_x, start_y
+	W_x = W_y = 0
+	v_x = velocity[0] * stepInterval
+	v_y = velocity[1] * stepInterval
+	dist = hypot(dest_x - start_x, dest_y - start_y)
+	step = 0
+	while dist >= 1 and step < maxSteps:
+		step += 1
+		W_mag = min(W_0, dist)
+		if dist >= D_0:
+			W_x = W_x / sqrt3 + (2 * rnd() - 1) * W_mag / sqrt5
+			W_y = W_y / sqrt3 + (2 * rnd() - 1) * W_mag / sqrt5
+		else:
+			W_x /= sqrt3
+			W_y /= sqrt3
+			if M_0 < 3:
+				M_0 = rnd() * 3 + 3
+			else:
+				M_0 /= sqrt5
+		v_x += W_x + G_0 * (dest_x - start_x) / dist
+		v_y += W_y + G_0 * (dest_y - start_y) / dist
+		v_mag = hypot(v_x, v_y)
+		if v_mag > M_0:
+			v_clip = M_0 / 2 + rnd() * M_0 / 2
+			v_x = (v_x / v_mag) * v_clip
+			v_y = (v_y / v_mag) * v_clip
+		start_x += v_x
+		start_y += v_y
+		dist = hypot(dest_x - start_x, dest_y - start_y)
+		move_x = int(round(start_x))
+		move_y = int(round(start_y))
+		if current_x != move_x or current_y != move_y:
+			current_x = move_x
+			current_y = move_y
+			yield move_x, move_y, step * stepInterval
+
+
+def planWindMouse(
+	start_x, start_y, dest_x, dest_y, G_0=15, W_0=3, M_0=30, D_0=12,
+	seed=None, stepInterval=DEFAULT_STEP_INTERVAL, maxSteps=MAX_STEPS, velocity=(0.0, 0.0)
+):
+	"""Plans a complete WindMouse path and returns it as a L{Trajectory}."""
+	path = Trajectory(start_x, start_y)
+	append = path.append
+	for x, y, t in iterWindMouse(
+		start_x, start_y, dest_x, dest_y, G_0, W_0, M_0, D_0,
+		seed=seed, stepInterval=stepInterval, maxSteps=maxSteps, velocity=velocity
+	):
+		append(x, y, t)
+	return path
+
+
+def resampleToDuration(path, duration, rate, easing=minimumJerk):
+	"""
+	Returns path reparameterized by arc length so that it takes exactly duration seconds
+	when played at rate frames per second.
+	Frame k of n is placed at arc length easing(k / n) of the total length, easing None moves at constant speed.
+	The final frame is always kept, so the destination is reached on the last frame.
+	"""
+	frames = max(1, int(round(duration * rate)))
+	resampled = Trajectory(path.startX, path.startY)
+	resampled.requestedDuration = duration
+	if not len(path):
+		return resampled
+	hypot = math.hypot
+	vx = array("d", [path.startX])
+	vy = array("d", [path.startY])
+	cumulative = array("d", [0.0])
+	total = 0.0
+	for x, y in zip(path.xs, path.ys):
+		total += hypot(x - vx[-1], y - vy[-1])
+		vx.append(x)
+		vy.append(y)
+		cumulative.append(total)
+	last = len(cumulative) - 1
+	segment = 0
+	lastX, lastY = path.startX, path.startY
+	for frame in range(1, frames + 1):
+		share = frame / float(frames)
+		target = total * (easing(share) if easing else share)
+		while segment < last - 1 and cumulative[segment + 1] < target:
+			segment += 1
+		span = cumulative[segment + 1] - cumulative[segment]
+		f = (target - cumulative[segment]) / span if span else 1.0
+		x = int(round(vx[segment] + (vx[segment + 1] - vx[segment]) * f))
+		y = int(round(vy[segment] + (vy[segment + 1] - vy[segment]) * f))
+		if x != lastX or y != lastY or frame == frames:
+			resampled.append(x, y, frame / float(rate))
+			lastX, lastY = x, y
+	return resampled
+
+
+def resampleToSpeed(path, speed, rate, easing=minimumJerk):
+	"""Like L{resampleToDuration}, with the duration following from an average speed in pixels per second."""
+	return resampleToDuration(path, path.length / float(speed), rate, easing)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Parameter sweeps over the WindMouse motion model.
+# Run from the NVDA Python console, for example:
+# from globalPlugins.cursorMovements import tuning
+# print(tuning.formatReport(tuning.sweep(G_0=(9, 15, 21), M_0=(15, 30))))
+
+import itertools
+import math
+
+from .batch import simulateBatch
+
+
+DEFAULT_DISTANCES = (100, 500, 1500)
+
+
+def summarize(values):
+	"""Returns min, mean, p50, p95 and max of values."""
+	if not values:
+		return dict(min=0.0, mean=0.0, p50=0.0, p95=0.0, max=0.0)
+	ordered = sorted(values)
+	last = len(ordered) - 1
+	return dict(
+		min=ordered[0],
+		mean=sum(ordered) / len(ordered),
+		p50=ordered[int(round(last * 0.5))],
+		p95=ordered[int(round(last * 0.95))],
+		max=ordered[-1],
+	)
+
+
+def sweep(
+	G_0=(15,), W_0=(3,), M_0=(30,), D_0=(12,), distances=DEFAULT_DISTANCES, runs=100, seed=0, useNumpy=True
+):
+	"""
+	Simulates every combination of the given G_0, W_0, M_0 and D_0 values,
+	runs times per distance in directions spread evenly around the circle, all in a single batch.
+	Returns one dict per combination and distance with the distributions of
+	duration (seconds), steps, samples and overshoot (pixels).
+	"""
+	combos = list(itertools.product(G_0, W_0, M_0, D_0, distances))
+	lanes = dict(sx=[], sy=[], dx=[], dy=[], g=[], w=[], m=[], d=[], seeds=[])
+	for g, w, m, d, distance in combos:
+		for run in range(runs):
+			angle = 2 * math.pi * run / runs
+			lanes["sx"].append(0)
+			lanes["sy"].append(0)
+			lanes["dx"].append(int(round(distance * math.cos(angle))))
+			lanes["dy"].append(int(round(distance * math.sin(angle))))
+			lanes["g"].append(g)
+			lanes["w"].append(w)
+			lanes["m"].append(m)
+			lanes["d"].append(d)
+			lanes["seeds"].append(seed + len(lanes["seeds"]))
+	result = simulateBatch(
+		lanes["sx"], lanes["sy"], lanes["dx"], lanes["dy"],
+		lanes["g"], lanes["w"], lanes["m"], lanes["d"], seeds=lanes["seeds"], useNumpy=useNumpy
+	)
+	durations = result.durations
+	report = []
+	for index, (g, w, m, d, distance) in enumerate(combos):
+		part = slice(index * runs, (index + 1) * runs)
+		report.append(dict(
+			G_0=g, W_0=w, M_0=m, D_0=d, distance=distance,
+			duration=summarize(durations[part]),
+			steps=summarize(result.steps[part]),
+			samples=summarize(result.samples[part]),
+			overshoot=summarize(result.overshoot[part]),
+		))
+	return report
+
+
+def formatReport(report):
+	"""Formats the result of L{sweep} as a plain text table, one line per combination and distance."""
+	lines = [
+		"G_0\tW_0\tM_0\tD_0\tdist\tdur p50\tdur p95\tsteps p50\tsteps p95\tover p50\tover p95\tover max"
+	]
+	for row in report:
+		lines.append("\t".join(str(v) for v in (
+			row["G_0"], row["W_0"], row["M_0"], row["D_0"], row["distance"],
+			"%.3f" % row["duration"]["p50"], "%.3f" % row["duration"]["p95"],
+			row["steps"]["p50"], row["steps"]["p95"],
+			"%.1f" % row["overshoot"]["p50"], "%.1f" % row["overshoot"]["p95"], "%.1f" % row["overshoot"]["max"],
+		)))
+	return "\n".join(lines)
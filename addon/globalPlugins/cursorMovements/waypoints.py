@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Bounded sequence of waypoints for the arrow commands.
+# Coordinates are kept in two preallocated integer arrays used as a ring,
+# once full the oldest waypoint is dropped for each new one.
+
+from array import array
+
+
+DEFAULT_CAPACITY = 1000
+
+
+class WaypointBuffer(object):
+	"""
+	Ring buffer of (x, y) waypoints holding at most capacity of them. Indexing is O(1), 0 is the oldest.
+	With skipRepeated, a waypoint equal to the last one is not added again.
+	dropped counts the waypoints pushed out so far: the waypoint at index i was the (dropped + i)th one added.
+	"""
+
+	def __init__(self, capacity=DEFAULT_CAPACITY, skipRepeated=True):
+		if capacity < 1:
+			raise ValueError("capacity must be at least 1")
+		self.capacity = capacity
+		self.skipRepeated = skipRepeated
+		self._xs = array("i", bytes(4 * capacity))
+		self._ys = array("i", bytes(4 * capacity))
+		self._start = 0
+		self._count = 0
+		self.dropped = 0
+
+	def __len__(self):
+		return self._count
+
+	def _slot(self, index):
+		if index < 0:
+			index += self._count
+		if not 0 <= index < self._count:
+			raise IndexError("waypoint index out of range")
+		return (self._start + index) % self.capacity
+
+	def __getitem__(self, index):
+		slot = self._slot(index)
+		return self._xs[slot], self._ys[slot]
+
+	def __iter__(self):
+		xs, ys, capacity, start = self._xs, self._ys, self.capacity, self._start
+		for i in range(self._count):
+			slot = (start + i) % capacity
+			yield xs[slot], ys[slot]
+
+	def append(self, x, y):
+		"""Adds a waypoint, dropping the oldest one when full. Returns False when it was skipped as a repeat."""
+		x, y = int(x), int(y)
+		if self.skipRepeated and self._count and self[-1] == (x, y):
+			return False
+		if self._count == self.capacity:
+			slot = self._start
+			self._start = (self._start + 1) % self.capacity
+			self.dropped += 1
+		else:
+			slot = (self._start + self._count) % self.capacity
+			self._count += 1
+		self._xs[slot] = x
+		self._ys[slot] = y
+		return True
+
+	def clear(self):
+		self.dropped += self._count
+		self._start = 0
+		self._count = 0
+
+	def resize(self, capacity):
+		"""Changes the capacity, keeping the newest waypoints that fit."""
+		if capacity < 1:
+			raise ValueError("capacity must be at least 1")
+		points = self.exportPoints()
+		keep = min(self._count, capacity)
+		self.dropped += self._count - keep
+		self.capacity = capacity
+		self._xs = array("i", bytes(4 * capacity))
+		self._ys = array("i", bytes(4 * capacity))
+		self._start = 0
+		self._count = keep
+		if keep:
+			self._xs[:keep] = points[2 * (len(points) // 2 - keep)::2]
+			self._ys[:keep] = points[2 * (len(points) // 2 - keep) + 1::2]
+
+	def exportPoints(self):
+		"""Returns all waypoints, oldest first, as one array of interleaved x and y."""
+		points = array("i", bytes(8 * self._count))
+		end = self._start + self._count
+		if end <= self.capacity:
+			points[0::2] = self._xs[self._start:end]
+			points[1::2] = self._ys[self._start:end]
+		else:
+			wrapped = end - self.capacity
+			points[0::2] = self._xs[self._start:] + self._xs[:wrapped]
+			points[1::2] = self._ys[self._start:] + self._ys[:wrapped]
+		return points
+
+	def importPoints(self, points):
+		"""
+		Replaces the waypoints with points, interleaved x and y as returned by exportPoints.
+		Only the last capacity of them are kept, repeats are skipped when skipRepeated is set.
+		"""
+		if not isinstance(points, array) or points.typecode != "i":
+			points = array("i", points)
+		if len(points) % 2:
+			raise ValueError("points must hold x and y pairs")
+		self.clear()
+		if self.skipRepeated:
+			for i in range(0, len(points), 2):
+				self.append(points[i], points[i + 1])
+			return
+		count = len(points) // 2
+		keep = min(count, self.capacity)
+		self.dropped += count - keep
+		first = 2 * (count - keep)
+		self._xs[:keep] = points[first::2]
+		self._ys[:keep] = points[first + 1::2]
+		self._count = keep
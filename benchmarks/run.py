@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Benchmarks for motion planning, event emission and the position stores.
+# NVDA modules are replaced by the stand-ins in stubs.py,
+# so this runs on any system with Python 3 and configobj.
+#
+# Usage:
+#   python benchmarks/run.py [--output results.json] [--baseline old.json] [--threshold 0.15] [--filter text]
+# Results are written as JSON. With --baseline, every benchmark is compared with the same one in the baseline,
+# and the exit code is 1 when any got slower by more than the threshold.
+
+import argparse
+from collections import OrderedDict
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+import stubs  # noqa: E402
+
+CONFIG_PATH = stubs.install()
+sys.path.insert(0, os.path.join(HERE, "..", "addon", "globalPlugins"))
+import cursorMovements  # noqa: E402
+from cursorMovements import emission, injection, models, positionDatabase, trajectory  # noqa: E402
+from cursorMovements.positions import Position, PositionTable  # noqa: E402
+from cursorMovements.positionStore import PositionFileCache  # noqa: E402
+
+
+# Straight line distances in pixels of the planned moves.
+DISTANCE_BUCKETS = (50, 200, 800, 2000)
+SHORTCUT_COUNTS = (10, 100, 1000)
+POSITION_COUNTS = (100, 1000, 5000)
+# Seconds each measurement runs for, at least.
+MIN_TIME = 0.2
+REPEATS = 5
+
+benchmarks = OrderedDict()
+
+
+def benchmark(func):
+	benchmarks[func.__name__] = func
+	return func
+
+
+def measure(func, minTime=MIN_TIME, repeats=REPEATS):
+	"""
+	Times func, returning microseconds per call: mean and standard deviation over the repeats,
+	median and min. Each repeat calls func as many times as fit in minTime.
+	"""
+	number = 1
+	while True:
+		start = time.perf_counter()
+		for unused in range(number):
+			func()
+		elapsed = time.perf_counter() - start
+		if elapsed >= minTime / 10 or number >= 1 << 20:
+			break
+		number *= 2
+	number = max(1, int(number * (minTime / 10) / max(elapsed, 1e-9)))
+	samples = []
+	for unused in range(repeats):
+		start = time.perf_counter()
+		for unused in range(number):
+			func()
+		samples.append((time.perf_counter() - start) / number * 1e6)
+	return OrderedDict((
+		("mean", statistics.mean(samples)),
+		("stdev", statistics.stdev(samples) if len(samples) > 1 else 0.0),
+		("median", statistics.median(samples)),
+		("min", min(samples)),
+		("calls", number * repeats),
+	))
+
+
+def destination(distance, rnd):
+	angle = rnd.uniform(0, 2 * math.pi)
+	return 1000 + int(distance * math.cos(angle)), 1000 + int(distance * math.sin(angle))
+
+
+def newPlugin(appName="benchmark"):
+	sys.modules["api"].focus = stubs.FocusObject(appName)
+	return cursorMovements.GlobalPlugin()
+
+
+@benchmark
+def planning():
+	"""Planning one move with each motion model, per distance, with the samples and events it produces."""
+	rnd = random.Random(1)
+	for name in models.motionModels:
+		model = models.getMotionModel(name)
+		for distance in DISTANCE_BUCKETS:
+			moves = [destination(distance, rnd) for unused in range(16)]
+			state = {"index": 0}
+
+			def plan():
+				x, y = moves[state["index"] % len(moves)]
+				state["index"] += 1
+				return model.plan(1000, 1000, x, y, 120, seed=state["index"])
+			result = measure(plan)
+			paths = [model.plan(1000, 1000, x, y, 120, seed=i) for i, (x, y) in enumerate(moves)]
+			result["samples"] = statistics.mean(len(path) for path in paths)
+			result["events"] = statistics.mean(len(emission.decimate(path)[0]) for path in paths)
+			result["duration"] = statistics.mean(path.duration for path in paths)
+			yield "planning.%s.%d" % (name, distance), result
+
+
+@benchmark
+def windMouseSteps():
+	"""The legacy step by step WindMouse loop, which emits one event per integer cursor change."""
+	for distance in DISTANCE_BUCKETS:
+		rnd = random.Random(distance)
+		x, y = destination(distance, rnd)
+		result = measure(lambda: trajectory.planWindMouse(1000, 1000, x, y, seed=7))
+		result["steps"] = sum(1 for unused in trajectory.iterWindMouse(1000, 1000, x, y, seed=7))
+		yield "windMouse.%d" % distance, result
+
+
+@benchmark
+def decimation():
+	"""Thinning a planned path before it is played."""
+	for distance in DISTANCE_BUCKETS:
+		path = models.getMotionModel("bezier").plan(1000, 1000, 1000 + distance, 1000, 120, seed=3)
+		result = measure(lambda: emission.decimate(path))
+		thinned, dropped = emission.decimate(path)
+		result["samples"] = len(path)
+		result["events"] = len(thinned)
+		yield "decimation.%d" % distance, result
+
+
+@benchmark
+def emitMove():
+	"""Sending every sample of a planned move through setMousePosition to a recording backend."""
+	backend = injection.RecordingBackend()
+	cursorMovements.injectionBackend = backend
+	path = models.getMotionModel("minimumJerk").plan(0, 0, 1500, 900, 120)
+	thinned = emission.decimate(path)[0]
+
+	def emit(path):
+		backend.clear()
+		for x, y, t in path:
+			cursorMovements.setMousePosition(x, y)
+	for name, p in (("all", path), ("thinned", thinned)):
+		result = measure(lambda: emit(p))
+		result["events"] = len(p)
+		yield "emitMove.%s" % name, result
+
+
+def shortCutTable(count):
+	return PositionTable(
+		("position %d" % i, Position(i, i, "kb:control+shift+alt+%d" % i)) for i in range(count)
+	)
+
+
+@benchmark
+def clickLookup():
+	"""script_click: finding the position of a pressed shortcut among the saved ones."""
+	cursorMovements.injectionBackend = injection.RecordingBackend()
+	for count in SHORTCUT_COUNTS:
+		plugin = newPlugin()
+		plugin.positions = shortCutTable(count)
+		plugin.shortCutIndex = plugin.getShortCutIndex("benchmark", plugin.positions)
+		gestures = [stubs.Gesture("kb:control+shift+alt+%d" % i) for i in range(0, count, max(1, count // 10))]
+		state = {"index": 0}
+
+		def click():
+			state["index"] += 1
+			plugin.script_click(gestures[state["index"] % len(gestures)])
+		yield "clickLookup.%d" % count, measure(click)
+		plugin.terminate()
+
+
+@benchmark
+def focusEvents():
+	"""event_gainFocus within one application, and when switching between two with saved shortcuts."""
+	for count in SHORTCUT_COUNTS:
+		plugin = newPlugin()
+		for appName in ("first", "second"):
+			plugin.positionFiles.write(appName, shortCutTable(count))
+		plugin.positionFiles.flush(wait=True)
+		first, second = stubs.FocusObject("first"), stubs.FocusObject("second")
+		api = sys.modules["api"]
+
+		def nextHandler():
+			pass
+
+		def sameApp():
+			api.focus = first
+			plugin.event_gainFocus(first, nextHandler)
+		api.focus = first
+		plugin.getShortCut()
+		yield "focus.sameApp.%d" % count, measure(sameApp)
+		state = {"index": 0}
+
+		def switchApp():
+			state["index"] += 1
+			focus = first if state["index"] % 2 else second
+			api.focus = focus
+			plugin.event_gainFocus(focus, nextHandler)
+		yield "focus.switchApp.%d" % count, measure(switchApp)
+		plugin.terminate()
+
+
+def positionTable(count):
+	return PositionTable(
+		("position %d" % i, Position(i % 1920, i // 1920, "kb:control+%d" % i if i % 3 == 0 else None))
+		for i in range(count)
+	)
+
+
+@benchmark
+def positionFiles():
+	"""Loading and saving position files, and single position edits."""
+	for count in POSITION_COUNTS:
+		directory = os.path.join(CONFIG_PATH, "files%d" % count)
+		store = PositionFileCache(directory, ".gc")
+		positions = positionTable(count)
+
+		def save():
+			store.write("app", positions)
+			store.flush(wait=True)
+
+		def load():
+			store.invalidate()
+			return store.get("app")
+
+		def edit():
+			store.setPosition("app", positions, "position 0")
+		yield "positionFiles.save.%d" % count, measure(save)
+		yield "positionFiles.load.%d" % count, measure(load)
+		yield "positionFiles.cachedGet.%d" % count, measure(lambda: store.get("app"))
+		# Only the cost on the calling thread, writing happens in the background.
+		yield "positionFiles.edit.%d" % count, measure(edit)
+		store.close()
+		shutil.rmtree(directory, ignore_errors=True)
+
+
+@benchmark
+def positionDatabases():
+	"""The same operations against the SQLite position database."""
+	if not positionDatabase.isAvailable():
+		return
+	for count in POSITION_COUNTS:
+		fileName = os.path.join(CONFIG_PATH, "positions%d.db" % count)
+		database = positionDatabase.PositionDatabase(fileName)
+		positions = positionTable(count)
+
+		def load():
+			database._tables.clear()
+			return database.get("app")
+		yield "positionDatabase.save.%d" % count, measure(lambda: database.write("app", positions))
+		yield "positionDatabase.load.%d" % count, measure(load)
+		yield "positionDatabase.edit.%d" % count, measure(
+			lambda: database.setPosition("app", positions, "position 0")
+		)
+		database.close()
+		os.remove(fileName)
+
+
+def run(names=None, filterText=None):
+	results = OrderedDict()
+	for name, func in benchmarks.items():
+		if names and name not in names:
+			continue
+		for resultName, result in func():
+			if filterText and filterText not in resultName:
+				continue
+			results[resultName] = result
+			print("%-40s %12.2f us  (+- %.2f)" % (resultName, result["mean"], result["stdev"]))
+	return results
+
+
+def compare(results, baseline, threshold, complete=True):
+	"""
+	Prints the change of every benchmark against baseline, returns the names that got slower than threshold.
+	complete tells whether every benchmark was run, so the ones missing from results were removed.
+	"""
+	regressions = []
+	for name, result in results.items():
+		old = baseline.get(name)
+		if old is None:
+			print("%-40s %12s" % (name, "new"))
+			continue
+		# Medians are less sensitive to a single slow repeat than means.
+		change = result["median"] / old["median"] - 1 if old["median"] else 0.0
+		flag = ""
+		if change > threshold:
+			flag = "  REGRESSION"
+			regressions.append(name)
+		elif change < -threshold:
+			flag = "  improvement"
+		print("%-40s %+11.1f%%%s" % (name, change * 100, flag))
+	for name in baseline:
+		if complete and name not in results:
+			print("%-40s %12s" % (name, "missing"))
+	return regressions
+
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description=__doc__)
+	parser.add_argument("--output", help="JSON file to write the results to")
+	parser.add_argument("--baseline", help="JSON file of an earlier run to compare with")
+	parser.add_argument(
+		"--threshold", type=float, default=0.15, help="Relative slowdown reported as a regression (default 0.15)"
+	)
+	parser.add_argument("--filter", help="Only run benchmarks whose result name contains this text")
+	parser.add_argument("benchmarks", nargs="*", help="Benchmarks to run: " + ", ".join(benchmarks))
+	args = parser.parse_args(argv)
+	results = run(args.benchmarks, args.filter)
+	document = OrderedDict((
+		("meta", OrderedDict((
+			("python", platform.python_version()),
+			("platform", platform.platform()),
+			("time", time.strftime("%Y-%m-%dT%H:%M:%S")),
+		))),
+		("results", results),
+	))
+	if args.output:
+		with open(args.output, "w") as f:
+			json.dump(document, f, indent="\t")
+	shutil.rmtree(CONFIG_PATH, ignore_errors=True)
+	if args.baseline:
+		with open(args.baseline) as f:
+			baseline = json.load(f)["results"]
+		print()
+		if compare(results, baseline, args.threshold, complete=not (args.benchmarks or args.filter)):
+			return 1
+	return 0
+
+
+if __name__ == "__main__":
+	sys.exit(main())
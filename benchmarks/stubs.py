@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Stand-ins for the NVDA modules imported by the add-on, so it can be imported and driven outside NVDA.
+# They do just enough for the code paths the benchmarks exercise: wx callbacks run immediately,
+# the configuration holds the defaults of the add-on's spec, and scripts are bound like NVDA binds them.
+
+import builtins
+import re
+import sys
+import tempfile
+import types
+
+
+class Anything(object):
+	"""Accepts any constructor arguments, attribute or call, for classes and objects nobody looks at."""
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def __call__(self, *args, **kwargs):
+		return Anything()
+
+	def __getattr__(self, name):
+		return Anything()
+
+
+class StubModule(types.ModuleType):
+	# Names nobody set explicitly are classes or callables that do nothing.
+
+	def __getattr__(self, name):
+		if name.startswith("__"):
+			raise AttributeError(name)
+		return Anything
+
+
+def _module(name, **attributes):
+	module = StubModule(name)
+	module.__dict__.update(attributes)
+	sys.modules[name] = module
+	return module
+
+
+class Timer(object):
+	# wx.CallLater runs its callback immediately, the timer is then already stopped.
+
+	def __init__(self, delay, callback, *args, **kwargs):
+		callback(*args, **kwargs)
+
+	def IsRunning(self):
+		return False
+
+	def Stop(self):
+		pass
+
+	def Restart(self, delay=None):
+		pass
+
+
+def _callAfter(callback, *args, **kwargs):
+	callback(*args, **kwargs)
+
+
+class AppModule(object):
+	def __init__(self, appName):
+		self.appName = appName
+
+
+class FocusObject(object):
+	def __init__(self, appName):
+		self.appModule = AppModule(appName)
+
+
+class Api(StubModule):
+	# The focused application is chosen by the benchmark.
+	focus = FocusObject("benchmark")
+
+	def getFocusObject(self):
+		return self.focus
+
+
+def script(description=None, gesture=None, gestures=None, category=None, **kwargs):
+	def decorator(func):
+		func.__doc__ = description
+		func.gestures = list(gestures or ()) + ([gesture] if gesture else [])
+		return func
+	return decorator
+
+
+class ScriptableType(type):
+	# Like NVDA, gestures of decorated scripts end up in _<class name>__gestures.
+
+	def __new__(meta, name, bases, namespace):
+		cls = super(ScriptableType, meta).__new__(meta, name, bases, namespace)
+		gestures = {}
+		for attribute, value in namespace.items():
+			if attribute.startswith("script_"):
+				for gesture in getattr(value, "gestures", ()):
+					gestures[gesture] = attribute[len("script_"):]
+		setattr(cls, "_%s__gestures" % name, gestures)
+		return cls
+
+
+class GlobalPlugin(object, metaclass=ScriptableType):
+
+	def __init__(self, *args, **kwargs):
+		self._gestureMap = {}
+
+	def bindGesture(self, identifier, scriptName):
+		self._gestureMap[normalizeGestureIdentifier(identifier)] = scriptName
+
+	def removeGestureBinding(self, identifier):
+		del self._gestureMap[normalizeGestureIdentifier(identifier)]
+
+	def terminate(self):
+		pass
+
+
+def normalizeGestureIdentifier(identifier):
+	# NVDA also sorts modifiers, lower casing is what matters for the lookups benchmarked here.
+	return identifier.lower()
+
+
+class Gesture(object):
+	def __init__(self, identifier):
+		self.normalizedIdentifiers = [normalizeGestureIdentifier(identifier)]
+		self.isModifier = False
+
+
+class Log(object):
+	def _ignore(self, *args, **kwargs):
+		pass
+
+	debug = info = debugWarning = warning = error = exception = _ignore
+
+
+class Section(dict):
+	pass
+
+
+class Conf(dict):
+	def __init__(self):
+		super(Conf, self).__init__()
+		self.spec = SpecSections(self)
+
+
+class SpecSections(dict):
+	# Assigning a spec section fills the configuration section with its defaults.
+
+	def __init__(self, conf):
+		super(SpecSections, self).__init__()
+		self._conf = conf
+
+	def __setitem__(self, name, spec):
+		super(SpecSections, self).__setitem__(name, spec)
+		self._conf[name] = Section((key, specDefault(value)) for key, value in spec.items())
+
+
+def specDefault(spec):
+	kind = spec.split("(", 1)[0]
+	value = re.search(r"default\s*=\s*([^,)]+)", spec).group(1).strip().strip("'\"")
+	if kind == "boolean":
+		return value.lower() == "true"
+	if kind == "integer":
+		return int(value)
+	if kind == "float":
+		return float(value)
+	return value
+
+
+def install(configPath=None):
+	"""Puts the stand-in modules in sys.modules and _ in builtins. Returns the configuration path used."""
+	if configPath is None:
+		configPath = tempfile.mkdtemp(prefix="cursorMovementsBenchmarks")
+	builtins._ = lambda text: text
+	_module("addonHandler", initTranslation=lambda: None)
+	_module("globalVars", appArgs=types.SimpleNamespace(configPath=configPath, secure=False))
+	_module("globalPluginHandler", GlobalPlugin=GlobalPlugin)
+	_module("scriptHandler", script=script)
+	_module(
+		"inputCore", normalizeGestureIdentifier=normalizeGestureIdentifier, InputGesture=Gesture,
+		manager=types.SimpleNamespace(_captureFunc=None)
+	)
+	_module("logHandler", log=Log())
+	_module("config", conf=Conf())
+	_module("ui", message=lambda text: None)
+	api = Api("api")
+	sys.modules["api"] = api
+	_module("wx", CallAfter=_callAfter, CallLater=Timer)
+	gui = _module("gui", mainFrame=Anything())
+	gui.settingsDialogs = _module(
+		"gui.settingsDialogs",
+		NVDASettingsDialog=types.SimpleNamespace(categoryClasses=[]),
+		SettingsPanel=object,
+	)
+	gui.guiHelper = _module("gui.guiHelper")
+	gui.nvdaControls = _module("gui.nvdaControls")
+	# The winUser backend is replaced by a recording one before anything moves.
+	_module("winUser", getCursorPos=lambda: (0, 0))
+	_module("mouseHandler")
+	return configPath
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+# Tests run outside NVDA: its modules are replaced by the stand-ins of the benchmarks.
+
+import os
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+import stubs  # noqa: E402
+
+CONFIG_PATH = stubs.install()
+sys.path.insert(0, os.path.join(ROOT, "addon", "globalPlugins"))
+
+
+def pytest_sessionfinish(session, exitstatus):
+	shutil.rmtree(CONFIG_PATH, ignore_errors=True)
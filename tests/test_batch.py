@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+from cursorMovements import batch
+from cursorMovements.trajectory import planWindMouse
+
+
+LANES = 300
+
+
+def test_scalarBatchMatchesThePlanner():
+	result = batch.simulateBatch(0, 0, [300, 900, 1500], 400, seeds=[1, 2, 3], keepPaths=True, useNumpy=False)
+	assert len(result) == 3
+	for lane, (destX, seed) in enumerate(((300, 1), (900, 2), (1500, 3))):
+		path = planWindMouse(0, 0, destX, 400, seed=seed)
+		assert list(result.paths[lane]) == list(path)
+		assert result.samples[lane] == len(path)
+		assert abs(result.durations[lane] - path.duration) < 1e-9
+
+
+def test_batchArgumentsMustHaveOneLength():
+	with pytest.raises(ValueError):
+		batch.simulateBatch(0, 0, [1, 2], [1, 2, 3])
+
+
+def test_numpyBatchMatchesTheScalarOne():
+	pytest.importorskip("numpy")
+	dests = [200 + 7 * lane for lane in range(LANES)]
+	seeds = list(range(LANES))
+	scalar = batch.simulateBatch(0, 0, dests, 300, seeds=seeds, useNumpy=False)
+	vector = batch.simulateBatch(0, 0, dests, 300, seeds=seeds, keepPaths=True)
+	# Different random numbers, the same distribution.
+	for name in ("steps", "samples", "overshoot"):
+		scalarMean = sum(getattr(scalar, name)) / float(LANES)
+		vectorMean = sum(getattr(vector, name)) / float(LANES)
+		assert abs(vectorMean - scalarMean) <= 0.1 * scalarMean + 0.5, name
+	for lane, path in enumerate(vector.paths):
+		assert len(path) == vector.samples[lane]
+		assert abs(path.duration - vector.durations[lane]) < 1e-9
+		x, y = path.end
+		assert abs(x - dests[lane]) <= 1 and abs(y - 300) <= 1
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+
+from cursorMovements.cache import TrajectoryCache
+from cursorMovements.trajectory import Trajectory, planWindMouse
+
+
+def samples(path):
+	return (path.startX, path.startY, list(path))
+
+
+def sized(length):
+	path = Trajectory(0, 0)
+	for i in range(length):
+		path.append(i, i, i / 100.0)
+	return path
+
+
+def test_planIsRepeatableAndCached():
+	cache = TrajectoryCache()
+	first = cache.plan(0, 0, 800, 300, seed=4)
+	assert cache.plan(0, 0, 800, 300, seed=4) is first
+	assert (cache.hits, cache.misses) == (1, 1)
+	assert samples(first) == samples(planWindMouse(0, 0, 800, 300, seed=4))
+	assert samples(cache.plan(0, 0, 800, 300, seed=5)) != samples(first)
+
+
+def test_leastRecentlyUsedIsEvictedFirst():
+	cache = TrajectoryCache(maxPoints=30)
+	for key in ("a", "b", "c"):
+		cache.put(key, sized(10))
+	cache.get("a")
+	cache.put("d", sized(10))
+	assert "b" not in cache
+	assert all(key in cache for key in ("a", "c", "d"))
+	assert (cache.points, cache.evictions) == (30, 1)
+	# Replacing a path only counts its new samples.
+	cache.put("a", sized(5))
+	assert cache.points == 25
+
+
+def test_pathsLargerThanTheCacheAreNotKept():
+	cache = TrajectoryCache(maxPoints=10)
+	cache.put("a", sized(5))
+	cache.put("b", sized(11))
+	assert "b" not in cache and "a" in cache
+	assert cache.points == 5
+
+
+def test_saveAndLoad(tmp_path):
+	fileName = os.path.join(str(tmp_path), "paths.bin")
+	cache = TrajectoryCache()
+	for seed in range(5):
+		cache.plan(10, 20, 900 + seed, 500, seed=seed)
+	cache.get(cache.makeKey(10, 20, 900, 500, seed=0))
+	cache.save(fileName)
+	loaded = TrajectoryCache()
+	loaded.load(fileName)
+	assert list(loaded._paths) == list(cache._paths)
+	for key, path in cache._paths.items():
+		assert samples(loaded.get(key)) == samples(path)
+	assert loaded.points == cache.points
+
+
+def test_loadIgnoresOtherFiles(tmp_path):
+	fileName = os.path.join(str(tmp_path), "paths.bin")
+	with open(fileName, "wb") as f:
+		f.write(b"something else entirely")
+	cache = TrajectoryCache()
+	cache.load(fileName)
+	assert len(cache) == 0
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+from cursorMovements import emission, models
+from cursorMovements.trajectory import Trajectory
+
+
+RATE = 120
+MAX_GAP = emission.MAX_GAP_FRAMES / float(RATE)
+
+
+def at(points, t):
+	# Position of a cursor moving straight between the (x, y, t) points around t.
+	for (ax, ay, at), (bx, by, bt) in zip(points, points[1:]):
+		if at <= t <= bt:
+			share = (t - at) / (bt - at) if bt > at else 1.0
+			return ax + (bx - ax) * share, ay + (by - ay) * share
+
+
+@pytest.mark.parametrize("name", list(models.motionModels))
+@pytest.mark.parametrize("tolerance", [1.0, 3.0])
+def test_decimateKeepsThePositionInTime(name, tolerance):
+	path = models.getMotionModel(name).plan(0, 0, 1500, 900, RATE, seed=3)
+	thinned, dropped = emission.decimate(path, tolerance, maxGap=1.0)
+	assert 0 < dropped == len(path) - len(thinned) == thinned.droppedSamples
+	assert thinned.end == path.end and thinned.duration == path.duration
+	points = [(path.startX, path.startY, 0.0)] + list(thinned)
+	for x, y, t in path:
+		ex, ey = at(points, t)
+		assert (x - ex) ** 2 + (y - ey) ** 2 <= tolerance * tolerance + 1e-9
+
+
+def test_decimateKeepsChangesOfSpeed():
+	# A straight line, but the cursor rests halfway for a second.
+	path = Trajectory(0, 0)
+	for x in range(1, 1001):
+		path.append(x, 0, x / 500.0 + (1.0 if x > 500 else 0.0))
+	thinned, dropped = emission.decimate(path, 1.0, maxGap=10.0)
+	# A check on the shape alone would keep only the end.
+	assert (500, 0, 1.0) in list(thinned)
+	assert len(thinned) <= 3 and thinned.end == (1000, 0)
+
+
+def test_decimateSendsAPositionEveryFewFrames():
+	# Thinning a long steady move must not turn it into a few jumps.
+	path = models.getMotionModel("minimumJerk").plan(0, 0, 2000, 0, RATE)
+	thinned, dropped = emission.decimate(path, 3.0, MAX_GAP)
+	assert dropped
+	times = [0.0] + list(path.ts)
+	keptTimes = [0.0] + list(thinned.ts)
+	for a, b in zip(keptTimes, keptTimes[1:]):
+		# Only samples that were further apart already may be more than MAX_GAP apart.
+		assert b - a <= MAX_GAP + 1e-9 or times.index(b) == times.index(a) + 1
+	steps = [b - a for a, b in zip([0] + list(path.xs), path.xs)]
+	jumps = [b - a for a, b in zip([0] + list(thinned.xs), thinned.xs)]
+	assert max(jumps) <= emission.MAX_GAP_FRAMES * max(steps)
+
+
+def test_decimateWithoutTolerance():
+	path = models.getMotionModel("bezier").plan(0, 0, 600, 200, RATE, seed=1)
+	thinned, dropped = emission.decimate(path, 0)
+	assert dropped == 0 and list(thinned) == list(path)
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+import cursorMovements
+from cursorMovements import injection
+from cursorMovements.playback import DEFAULT_RATE
+
+
+def clock(times):
+	times = iter(times)
+	return lambda: next(times)
+
+
+def test_recordingBackendRecordsEveryInjection():
+	backend = injection.RecordingBackend(start=(5, 5), clock=clock([0.0, 0.01, 0.02, 0.04, 0.05]))
+	backend.click("right")
+	backend.move(10, 20)
+	backend.moveMany([(11, 20), (12, 21)])
+	assert backend.position() == (12, 21)
+	assert backend.calls == 4
+	assert [(event.kind, event.x, event.y, event.button) for event in backend.events] == [
+		("down", 5, 5, "right"), ("up", 5, 5, "right"), ("move", 10, 20, None), ("move", 11, 20, None),
+		("move", 12, 21, None),
+	]
+	assert backend.moveIntervals() == pytest.approx([0.02, 0.01])
+	assert backend.movesPerSecond() == pytest.approx(2 / 0.03)
+	backend.clear()
+	assert (backend.events, backend.calls) == ([], 0)
+
+
+def test_refreshRateIsUnknownUnlessTheBackendTellsIt():
+	assert injection.RecordingBackend().refreshRate() is None
+	assert injection.RecordingBackend(refreshRate=144).refreshRate() == 144
+
+
+@pytest.mark.parametrize("configured, refreshRate, expected", [
+	(0, 144, 144),
+	(0, None, DEFAULT_RATE),
+	(90, 144, 90),
+])
+def test_playbackRate(monkeypatch, configured, refreshRate, expected):
+	monkeypatch.setitem(cursorMovements.config.conf["goldenCursor"], "playbackRate", configured)
+	monkeypatch.setattr(cursorMovements, "injectionBackend", injection.RecordingBackend(refreshRate=refreshRate))
+	assert cursorMovements.getPlaybackRate() == expected
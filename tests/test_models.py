@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+from cursorMovements import models
+
+
+@pytest.mark.parametrize("name", list(models.motionModels))
+def test_modelsArriveAtTheDestination(name):
+	model = models.getMotionModel(name)
+	path = model.plan(10, 20, 1210, 820, 120, seed=2)
+	assert path.end == (1210, 820)
+	assert all(b > a for a, b in zip(path.ts, path.ts[1:]))
+	duration = model.duration(10, 20, 1210, 820)
+	if duration is not None:
+		# The last pixels are reached while the curve is still settling.
+		assert duration - 0.1 < path.duration <= duration + 1.0 / 120
+
+
+def test_fittsDurationGrowsWithDistance():
+	assert models.fittsDuration(0) == models.FITTS_A
+	assert models.fittsDuration(100) < models.fittsDuration(1000) < models.fittsDuration(2000)
+
+
+def test_closedFormModelsAreSeeded():
+	model = models.getMotionModel("bezier")
+	first = list(model.plan(0, 0, 900, 500, 120, seed=7))
+	assert list(model.plan(0, 0, 900, 500, 120, seed=7)) == first
+	assert list(model.plan(0, 0, 900, 500, 120, seed=8)) != first
+
+
+def test_unknownModelIsWindMouse():
+	assert models.getMotionModel("nothing").name == "windMouse"
+
+
+def test_closedFormModelsKeepTheRetargetVelocity():
+	for name in ("minimumJerk", "bezier"):
+		path = models.getMotionModel(name).plan(0, 0, 1500, 900, 120, velocity=(3000.0, 0.0), seed=1)
+		x, y, t = path[0]
+		assert abs(x / t - 3000) < 100 and abs(y) <= 1
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import threading
+import time
+
+from cursorMovements.motion import ActiveMotion
+from cursorMovements.trajectory import Trajectory
+
+
+def line(startX, startY, destX, destY, samples, interval=0.01):
+	path = Trajectory(startX, startY)
+	for i in range(1, samples + 1):
+		share = i / float(samples)
+		path.append(
+			int(round(startX + (destX - startX) * share)), int(round(startY + (destY - startY) * share)), i * interval
+		)
+	return path
+
+
+def waitFor(condition, timeout=5.0):
+	deadline = time.time() + timeout
+	while not condition():
+		assert time.time() < deadline
+		time.sleep(0.001)
+
+
+def test_retargetStartsWhereTheCursorIsWithItsVelocity():
+	plans = []
+	emitted = []
+
+	def planner(startX, startY, destX, destY, velocity):
+		plans.append(((startX, startY), velocity))
+		return line(startX, startY, destX, destY, 200)
+
+	motion = ActiveMotion(lambda x, y: emitted.append((x, y)), planner=planner, rate=100)
+	try:
+		motion.moveTo(400, 0, (0, 0))
+		waitFor(lambda: len(emitted) >= 3)
+		assert motion.moving
+		motion.moveTo(0, 300, (0, 0))
+		assert motion.retargets == 1
+		assert plans[0] == ((0, 0), (0.0, 0.0))
+		(startX, startY), (vx, vy) = plans[1]
+		assert 0 < startX < 400 and startY == 0
+		# Two pixels every 10 ms.
+		assert abs(vx - 200) < 1e-6 and vy == 0
+		waitFor(lambda: emitted[-1][1] > 0)
+	finally:
+		motion.stop()
+
+
+def test_moveFromRestAndArrival():
+	plans = []
+	arrived = threading.Event()
+	emitted = []
+
+	def planner(startX, startY, destX, destY, velocity):
+		plans.append(((startX, startY), velocity))
+		return line(startX, startY, destX, destY, 3)
+
+	motion = ActiveMotion(
+		lambda x, y: emitted.append((x, y)), planner=planner, rate=100, onArrived=lambda playback: arrived.set()
+	)
+	motion.moveTo(30, 0, (0, 0))
+	assert arrived.wait(5.0)
+	waitFor(lambda: not motion.moving)
+	motion.moveTo(60, 0, (30, 0))
+	motion.stop()
+	assert motion.retargets == 0
+	assert plans == [((0, 0), (0.0, 0.0)), ((30, 0), (0.0, 0.0))]
+	assert emitted[:3] == [(10, 0), (20, 0), (30, 0)]
+
+
+def test_playStopsTheMoveInProgress():
+	emitted = []
+	motion = ActiveMotion(
+		lambda x, y: emitted.append((x, y)), planner=lambda *args: line(0, 0, 1000, 0, 1000), rate=100
+	)
+	try:
+		motion.moveTo(1000, 0, (0, 0))
+		waitFor(lambda: emitted)
+		motion.play(line(0, 0, 0, -20, 2))
+		waitFor(lambda: emitted[-1] == (0, -20))
+		waitFor(lambda: not motion.moving)
+		count = len(emitted)
+		time.sleep(0.05)
+		assert len(emitted) == count
+	finally:
+		motion.stop()
+
+
+def test_thinningIsCountedForMovesThatArrived():
+	arrived = threading.Event()
+	thinned = line(0, 0, 30, 0, 3)
+	thinned.droppedSamples = 5
+	motion = ActiveMotion(lambda x, y: None, rate=100, onArrived=lambda playback: arrived.set())
+	motion.play(line(0, 0, 1000, 0, 1000))
+	motion.play(thinned)
+	assert arrived.wait(5.0)
+	waitFor(lambda: not motion.moving)
+	motion.play(line(0, 0, 0, 30, 3))
+	motion.stop()
+	# The interrupted and the unthinned moves are left out.
+	assert (motion.thinnedMoves, motion.sentEvents, motion.droppedEvents) == (1, 3, 5)
+	motion.clearStatistics()
+	assert (motion.thinnedMoves, motion.sentEvents, motion.droppedEvents) == (0, 0, 0)
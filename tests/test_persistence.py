@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+import threading
+
+import pytest
+
+from cursorMovements.persistence import WriteBehind, atomicWrite
+
+
+def test_atomicWriteReplaces(tmp_path):
+	fileName = os.path.join(str(tmp_path), "file")
+	atomicWrite(fileName, b"first")
+	atomicWrite(fileName, b"second")
+	with open(fileName, "rb") as f:
+		assert f.read() == b"second"
+	assert os.listdir(str(tmp_path)) == ["file"]
+
+
+def test_latestValuePerKeyIsWritten():
+	written = []
+	writer = WriteBehind(lambda key, value: written.append((key, value)), idleDelay=60)
+	for i in range(10):
+		writer.submit("a", i)
+	writer.submit("b", "x")
+	writer.flush(wait=True)
+	assert sorted(written) == [("a", 9), ("b", "x")]
+	writer.close()
+
+
+def test_closeWritesPending():
+	written = []
+	writer = WriteBehind(lambda key, value: written.append(key), idleDelay=60)
+	writer.submit("a", 1)
+	writer.close()
+	assert written == ["a"]
+
+
+def test_failedWritesAreReported():
+	errors = []
+
+	def write(key, value):
+		raise IOError("disk full")
+	writer = WriteBehind(write, onError=errors.append)
+	writer.submit("a", 1)
+	writer.flush(wait=True)
+	writer.close()
+	assert errors == ["a"] and writer.failed == 1
+
+
+def test_tooManyPendingFlushes():
+	done = threading.Event()
+	writer = WriteBehind(lambda key, value: done.set(), idleDelay=60, maxPending=2)
+	for key in range(3):
+		writer.submit(key, None)
+	assert done.wait(5)
+	writer.close()
+
+
+def test_discardedValuesAreNotWritten():
+	written = []
+	writer = WriteBehind(lambda key, value: written.append(key), idleDelay=60)
+	writer.submit("a", 1)
+	writer.submit("b", 2)
+	writer.discard("a")
+	assert writer.pending == 1
+	writer.close()
+	assert written == ["b"]
+
+
+def test_submitAfterCloseFails():
+	writer = WriteBehind(lambda key, value: None)
+	writer.close()
+	with pytest.raises(RuntimeError):
+		writer.submit("a", 1)
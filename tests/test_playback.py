@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+from cursorMovements.playback import LatestPositionDispatcher, Playback
+from cursorMovements.trajectory import Trajectory
+
+
+class FakeTime(object):
+	# A clock that only moves when playback waits for the next frame, or when a test moves it.
+
+	def __init__(self):
+		self.now = 0.0
+		self.stopped = False
+
+	def __call__(self):
+		return self.now
+
+	def wait(self, delay):
+		self.now += delay
+		return self.stopped
+
+	def set(self):
+		self.stopped = True
+
+	def is_set(self):
+		return self.stopped
+
+
+def straightPath(samples, interval):
+	path = Trajectory(0, 0)
+	for i in range(1, samples + 1):
+		path.append(i, 0, i * interval)
+	return path
+
+
+def play(path, rate, emit):
+	clock = FakeTime()
+	playback = Playback(path, lambda x, y: emit(clock, x, y), rate=rate, clock=clock)
+	playback._stopEvent = clock
+	playback.run()
+	return playback
+
+
+def test_framesFollowTheSchedule():
+	emitted = []
+	playback = play(straightPath(10, 0.01), 100, lambda clock, x, y: emitted.append((clock(), x)))
+	assert [x for t, x in emitted] == list(range(1, 11))
+	for (t, x) in emitted:
+		assert abs(t - x * 0.01) < 1e-9
+	assert playback.finished
+	assert playback.skippedFrames == 0
+	assert abs(playback.actualDuration - 0.1) < 1e-9
+
+
+def test_samplesBetweenFramesAreNotEmitted():
+	# Samples every 5 ms played at 100 frames per second: the newest sample due at each frame.
+	emitted = []
+	play(straightPath(20, 0.005), 100, lambda clock, x, y: emitted.append(x))
+	assert emitted == list(range(2, 21, 2))
+
+
+def test_lateFramesAreSkipped():
+	emitted = []
+
+	def emit(clock, x, y):
+		emitted.append((clock(), x))
+		if x == 3:
+			# The emitting thread stalls for three and a half frames.
+			clock.now += 0.035
+
+	playback = play(straightPath(10, 0.01), 100, emit)
+	assert playback.skippedFrames == 2
+	# No burst after the stall: the sample due at the current frame comes next, one per frame.
+	assert [x for t, x in emitted] == [1, 2, 3, 6, 7, 8, 9, 10]
+	# The late sample goes out at once, the ones after it are back on the original schedule.
+	assert abs(emitted[3][0] - 0.065) < 1e-9
+	for t, x in emitted[4:]:
+		assert abs(t - x * 0.01) < 1e-9
+
+
+def test_stopEndsPlayback():
+	finished = []
+	path = straightPath(10, 0.01)
+
+	def emit(clock, x, y):
+		if x == 4:
+			playback.stop()
+
+	clock = FakeTime()
+	playback = Playback(path, lambda x, y: emit(clock, x, y), rate=100, clock=clock, onFinished=finished.append)
+	playback._stopEvent = clock
+	playback.run()
+	assert finished == [playback]
+	assert playback.stopped and not playback.finished
+	assert playback.position == (4, 0)
+
+
+def test_dispatcherOnlyForwardsTheNewestPosition():
+	calls = []
+	moved = []
+	dispatcher = LatestPositionDispatcher(calls.append, lambda x, y: moved.append((x, y)))
+	dispatcher(1, 1)
+	dispatcher(2, 2)
+	dispatcher(3, 3)
+	assert len(calls) == 1
+	calls[0]()
+	assert moved == [(3, 3)]
+	dispatcher(4, 4)
+	assert len(calls) == 2
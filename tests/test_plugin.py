@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import sys
+
+import pytest
+import stubs
+
+import cursorMovements
+from cursorMovements import injection
+from cursorMovements.motion import ArrivalTiming
+from cursorMovements.positions import Position, PositionTable
+
+
+@pytest.fixture
+def plugin(tmp_path, monkeypatch):
+	monkeypatch.setattr(cursorMovements, "CMMousePositions", str(tmp_path))
+	backend = injection.RecordingBackend()
+	monkeypatch.setattr(cursorMovements, "injectionBackend", backend)
+	sys.modules["api"].focus = stubs.FocusObject("app")
+	plugin = cursorMovements.GlobalPlugin()
+	yield plugin
+	plugin.terminate()
+
+
+class NameDialog(object):
+	name = ""
+
+	def __init__(self, *args, **kwargs):
+		pass
+
+	def GetValue(self):
+		return self.name
+
+
+def test_savingOverAPositionUnbindsItsShortcut(plugin, monkeypatch):
+	plugin.positionFiles.write("app", PositionTable([("a", Position(10, 20, "kb:control+f1"))]))
+	plugin.getShortCut()
+	assert plugin.boundShortCuts == frozenset(["kb:control+f1"])
+	NameDialog.name = "a"
+	monkeypatch.setattr(cursorMovements, "EnterPositionName", NameDialog)
+	monkeypatch.setattr(cursorMovements.wx, "ID_OK", 1, raising=False)
+	monkeypatch.setattr(
+		cursorMovements.gui, "runScriptModalDialog", lambda dialog, callback: callback(1), raising=False
+	)
+	cursorMovements.injectionBackend.move(50, 60)
+	plugin.script_saveMousePosition(None)
+	assert plugin.boundShortCuts == frozenset()
+	assert plugin.shortCutIndex.lookup(["kb:control+f1"]) is None
+	assert plugin.positions["a"] == Position(50, 60)
+
+
+@pytest.mark.parametrize("identifier", ["kb:uparrow", "kb:pagedown", "kb:numpadenter", "kb:shift+tab"])
+def test_reservedKeysAreNotShortcuts(identifier):
+	assert identifier.split(":")[1] in cursorMovements.CMReservedShortCuts
+
+
+class LogRecorder(object):
+	def __init__(self):
+		self.lines = []
+
+	def info(self, text, *args, **kwargs):
+		self.lines.append(text)
+
+	debug = debugWarning = warning = error = info
+
+
+def test_latencyReportLogsArrivalTimes(plugin, monkeypatch):
+	logged = LogRecorder()
+	monkeypatch.setattr(cursorMovements, "log", logged)
+	monkeypatch.setattr(cursorMovements.probes, "enabled", True)
+	plugin.motion.timings.append(ArrivalTiming(0.5, 0.5, 0.52))
+	plugin.motion.timings.append(ArrivalTiming(1.0, 0.99, 0.99))
+	plugin.script_latencyReport(None)
+	arrival = [line for line in logged.lines if line.startswith("Arrival")]
+	assert arrival == [
+		"Arrival of 2 moves with a fixed duration, actual minus requested time: "
+		"mean 5.0, min -10.0, max 20.0 milliseconds"
+	]
+
+
+def test_clickShortcutMovesAndClicks(plugin):
+	plugin.positionFiles.write("app", PositionTable([("a", Position(10, 20, "kb:control+f1"))]))
+	plugin.getShortCut()
+	plugin.script_click(stubs.Gesture("kb:Control+F1"))
+	backend = cursorMovements.injectionBackend
+	assert [(event.kind, event.x, event.y) for event in backend.events] == [
+		("move", 10, 20), ("down", 10, 20), ("up", 10, 20)
+	]
+	backend.clear()
+	plugin.script_click(stubs.Gesture("kb:control+f2"))
+	assert backend.events == []
+
+
+def test_droppedWaypointsLeaveTheSpatialIndex(plugin, monkeypatch):
+	monkeypatch.setitem(cursorMovements.config.conf["goldenCursor"], "waypointCapacity", 10)
+	monkeypatch.setitem(cursorMovements.config.conf["goldenCursor"], "skipRepeatedWaypoints", True)
+	for i in range(15):
+		plugin.addMousePosition(i * 10, 0)
+		plugin.current_idx = len(plugin.list_of_points) - 1
+	plugin.addMousePosition(140, 0)
+	points = plugin.list_of_points
+	assert len(points) == 10 and points.dropped == 5
+	assert sorted(key[1] for key in plugin.spatialIndex.keys()) == list(range(5, 15))
+	assert plugin.current_idx == 9
+	assert points[plugin.current_idx] == (140, 0)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+
+import pytest
+
+from cursorMovements import positionDatabase
+from cursorMovements.positions import Position, PositionTable
+
+
+pytestmark = pytest.mark.skipif(not positionDatabase.isAvailable(), reason="no sqlite3")
+
+
+@pytest.fixture
+def fileName(tmp_path):
+	return os.path.join(str(tmp_path), "db", "positions.db")
+
+
+def reopened(db):
+	db.close()
+	return positionDatabase.PositionDatabase(db.path)
+
+
+def test_writeAndReadBack(fileName):
+	db = positionDatabase.PositionDatabase(fileName)
+	table = PositionTable([
+		("b", Position(1, 2, "kb:f1", {"note": "first"})), ("a", Position(3, 4)), ("Button [OK]", Position(5, 6)),
+	])
+	db.write("app", table)
+	assert db.get("app") is table
+	db = reopened(db)
+	loaded = db.get("app")
+	assert list(loaded.keys()) == ["b", "a", "Button [OK]"]
+	assert loaded["b"] == table["b"]
+	assert db.get("other") is None
+	assert db.get("app") is loaded and db.hits == 1
+	db.close()
+
+
+def test_singlePositionEdits(fileName):
+	db = positionDatabase.PositionDatabase(fileName)
+	table = PositionTable([("a", Position(1, 1, "kb:f1")), ("b", Position(2, 2)), ("c", Position(3, 3))])
+	db.write("app", table)
+	table.setGesture("c", "kb:f1")
+	db.setPosition("app", table, "c")
+	table.rename("a", "first")
+	db.renamePosition("app", table, "a", "first")
+	table.remove("b")
+	db.removePosition("app", table, "b")
+	table.set("d", Position(4, 4))
+	db.setPosition("app", table, "d")
+	db = reopened(db)
+	loaded = db.get("app")
+	assert list(loaded.keys()) == ["first", "c", "d"]
+	# The gesture moved to c in the same transaction, the unique index was never violated.
+	assert loaded["first"].gesture is None and loaded["c"].gesture == "kb:f1"
+	db.delete("app")
+	db = reopened(db)
+	assert db.get("app") is None
+	db.close()
+
+
+def test_filesAreImportedOnce(fileName, tmp_path):
+	directory = str(tmp_path)
+	with open(os.path.join(directory, "app.gc"), "w") as f:
+		f.write("first = 10,20\n")
+	db = positionDatabase.PositionDatabase(fileName)
+	assert db.importFiles(directory) == 1
+	assert db.get("app")["first"] == Position(10, 20)
+	with open(os.path.join(directory, "other.gc"), "w") as f:
+		f.write("second = 30,40\n")
+	assert db.importFiles(directory) == 0
+	assert db.get("other") is None
+	db.close()
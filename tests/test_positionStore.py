@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+
+from cursorMovements.positions import Position, PositionTable
+from cursorMovements.positionStore import PositionFileCache
+
+
+NAMES = ["plain", "Button [OK]", 'He said "hi"', "50% zoom", "Ünïcode ✓"]
+
+
+class Clock(object):
+	def __init__(self):
+		self.now = 0.0
+
+	def __call__(self):
+		return self.now
+
+
+def writeFile(directory, appName, text):
+	fileName = os.path.join(directory, appName + ".gc")
+	with open(fileName, "w", encoding="utf-8") as f:
+		f.write(text)
+	return fileName
+
+
+def test_fileCacheRoundTrip(tmp_path):
+	cache = PositionFileCache(str(tmp_path), ".gc")
+	table = PositionTable((name, Position(i, i)) for i, name in enumerate(NAMES))
+	cache.write("app", table)
+	cache.close()
+	loaded = PositionFileCache(str(tmp_path), ".gc").get("app")
+	assert list(loaded.keys()) == NAMES
+
+
+def test_fileIsOnlyParsedAgainWhenItChanged(tmp_path):
+	directory = str(tmp_path)
+	fileName = writeFile(directory, "app", "first = 10,20\n")
+	clock = Clock()
+	cache = PositionFileCache(directory, ".gc", recheckInterval=2.0, clock=clock)
+	try:
+		first = cache.get("app")
+		assert first["first"] == Position(10, 20)
+		clock.now = 1.0
+		assert cache.get("app") is first
+		assert (cache.stats, cache.parses) == (1, 1)
+		# After the recheck interval the disk is looked at, but an unchanged file is not parsed.
+		clock.now = 3.0
+		assert cache.get("app") is first
+		assert (cache.stats, cache.parses) == (2, 1)
+		writeFile(directory, "app", "first = 10,20\nsecond = 30,40\n")
+		stat = os.stat(fileName)
+		os.utime(fileName, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+		clock.now = 6.0
+		assert list(cache.get("app").keys()) == ["first", "second"]
+		assert cache.parses == 2
+	finally:
+		cache.close()
+
+
+def test_missingFilesAreCached(tmp_path):
+	cache = PositionFileCache(str(tmp_path), ".gc")
+	try:
+		assert cache.get("none") is None
+		assert cache.get("none") is None
+		assert (cache.stats, cache.hits, cache.parses) == (1, 1, 0)
+	finally:
+		cache.close()
+
+
+def test_ownWritesAreNotOutsideChanges(tmp_path):
+	clock = Clock()
+	cache = PositionFileCache(str(tmp_path), ".gc", recheckInterval=0, clock=clock)
+	try:
+		table = PositionTable([("a", Position(1, 2))])
+		cache.write("app", table)
+		cache.flush(wait=True)
+		assert cache.get("app") is table
+		assert cache.parses == 0
+		cache.delete("app")
+		cache.flush(wait=True)
+		assert cache.get("app") is None
+		assert not os.path.exists(cache.fileName("app"))
+	finally:
+		cache.close()
+
+
+def test_editsReachTheFileWithoutCopyingTheTable(tmp_path):
+	cache = PositionFileCache(str(tmp_path), ".gc")
+	table = PositionTable((name, Position(i, i)) for i, name in enumerate(NAMES))
+	cache.write("app", table)
+	copied = cache._copies["app"][1]
+	table.set("new", Position(100, 100, "kb:f1"))
+	cache.setPosition("app", table, "new")
+	table.rename("plain", "renamed")
+	cache.renamePosition("app", table, "plain", "renamed")
+	table.remove("50% zoom")
+	cache.removePosition("app", table, "50% zoom")
+	# Changing the cached table afterwards does not change what is written.
+	table["new"].x = -1
+	assert cache._copies["app"][1] is copied
+	cache.close()
+	loaded = PositionFileCache(str(tmp_path), ".gc").get("app")
+	assert list(loaded.keys()) == ["renamed", "Button [OK]", 'He said "hi"', "Ünïcode ✓", "new"]
+	assert loaded["new"] == Position(100, 100, "kb:f1")
+
+
+def test_firstEditOfANewTableWritesIt(tmp_path):
+	cache = PositionFileCache(str(tmp_path), ".gc")
+	table = PositionTable([("a", Position(1, 2))])
+	cache.setPosition("app", table, "a")
+	cache.close()
+	assert list(PositionFileCache(str(tmp_path), ".gc").get("app").keys()) == ["a"]
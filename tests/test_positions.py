@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+from collections import OrderedDict
+import os
+import random
+
+from configobj import ConfigObj
+import pytest
+
+from cursorMovements.positions import Position, PositionTable, escapeSectionName, unescapeSectionName
+from cursorMovements.positionStore import PositionFileCache
+
+
+NAMES = [
+	"plain", "Button [OK]", "[start", "end]", 'He said "hi"', "it's", "both ' and \"", "50% zoom", "%5B",
+	"a = b", "a, b", "# not a comment", "Ünïcode ✓",
+]
+
+
+def roundTrip(table):
+	return PositionTable.fromConfig(ConfigObj(table.toConfig().write(), encoding="UTF-8"))
+
+
+def test_roundTripKeepsNamesOrderAndFields():
+	table = PositionTable(
+		(name, Position(i, -i, "kb:control+f%d" % i if i % 2 else None, {"note": name} if i % 3 else None))
+		for i, name in enumerate(NAMES)
+	)
+	loaded = roundTrip(table)
+	assert list(loaded.keys()) == NAMES
+	for name in NAMES:
+		assert loaded[name] == table[name]
+
+
+def test_legacyFormat():
+	config = ConfigObj(["first = 10,20", "second = 30,40,CONTROL+f1", "broken = 5"], encoding="UTF-8")
+	table = PositionTable.fromConfig(config)
+	assert list(table.keys()) == ["first", "second"]
+	assert table["first"] == Position(10, 20)
+	assert table["second"] == Position(30, 40, "kb:control+f1")
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_sectionNamesWithoutBrackets(name):
+	escaped = escapeSectionName(name)
+	assert not any(char in escaped for char in '[]"')
+	assert unescapeSectionName(escaped) == name
+
+
+def test_malformedLegacyValues():
+	for value in ("5", "", "x,10", ["1"]):
+		with pytest.raises(ValueError):
+			Position.fromLegacy(value)
+	assert Position.fromLegacy(["1", "2"]) == Position(1, 2)
+
+
+def test_setGestureTakesItFromTheOtherPosition():
+	table = PositionTable([("a", Position(1, 1, "kb:f1")), ("b", Position(2, 2))])
+	assert table.setGesture("b", "kb:f1") == ["b", "a"]
+	assert table["a"].gesture is None
+	assert table.ownerOf("kb:f1") == "b"
+
+
+def test_unreadableFileIsKeptAside(tmp_path):
+	fileName = os.path.join(str(tmp_path), "app.gc")
+	with open(fileName, "w") as f:
+		f.write("[Button [OK]]\nx = 1\ny = 2\n")
+	errors = []
+	cache = PositionFileCache(str(tmp_path), ".gc", onReadError=errors.append)
+	assert cache.get("app") is None
+	assert errors == ["app"]
+	cache.write("app", PositionTable([("new", Position(1, 2))]))
+	cache.close()
+	assert os.path.exists(fileName + ".unreadable")
+	assert list(PositionFileCache(str(tmp_path), ".gc").get("app").keys()) == ["new"]
+
+
+def test_tableMatchesAnOrderedDict():
+	rnd = random.Random(2)
+	table = PositionTable()
+	expected = OrderedDict()
+	for step in range(3000):
+		name = "n%d" % rnd.randrange(100)
+		action = rnd.random()
+		if action < 0.5:
+			table.set(name, Position(step, step))
+			expected[name] = Position(step, step)
+		elif action < 0.8:
+			if name in expected:
+				table.remove(name)
+				del expected[name]
+		elif name in expected:
+			newName = "r%d" % step
+			table.rename(name, newName)
+			expected = OrderedDict((newName if key == name else key, value) for key, value in expected.items())
+		assert len(table) == len(expected)
+	assert table.items() == list(expected.items())
+	assert all(table.get(name) == position for name, position in expected.items())
+	assert table.get("missing") is None and "missing" not in table
+
+
+def test_copySharesNoRecord():
+	table = PositionTable([("a", Position(1, 2, "kb:f1", {"note": "x"}))])
+	copy = table.copy()
+	copy["a"].meta["note"] = "y"
+	copy.rename("a", "b")
+	assert table["a"].meta == {"note": "x"} and list(table) == ["a"]
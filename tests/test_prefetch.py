@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import threading
+import time
+
+import pytest
+
+from cursorMovements.prefetch import PathPrefetcher
+
+
+def waitFor(condition, timeout=5.0):
+	deadline = time.time() + timeout
+	while not condition():
+		assert time.time() < deadline
+		time.sleep(0.001)
+
+
+@pytest.fixture
+def planned():
+	return []
+
+
+@pytest.fixture
+def prefetcher(planned):
+	def planner(startX, startY, destX, destY):
+		planned.append((startX, startY, destX, destY))
+		return ("path", startX, startY, destX, destY)
+
+	prefetcher = PathPrefetcher(planner)
+	yield prefetcher
+	prefetcher.close()
+
+
+def test_plansAreTakenOnce(prefetcher, planned):
+	prefetcher.prefetch((0, 0), [(10, 0), (0, 0), (20, 0), (10, 0)], context="a")
+	waitFor(lambda: prefetcher.planned == 2)
+	# The start itself and duplicates are not planned.
+	assert planned == [(0, 0, 10, 0), (0, 0, 20, 0)]
+	assert prefetcher.take((0, 0), (20, 0), "a") == ("path", 0, 0, 20, 0)
+	assert prefetcher.take((0, 0), (20, 0), "a") is None
+	assert (prefetcher.hits, prefetcher.misses) == (1, 1)
+	assert prefetcher.take((0, 0), (10, 0), "a") is not None
+
+
+def test_anotherStartOrContextMakesEveryPlanStale(prefetcher):
+	prefetcher.prefetch((0, 0), [(10, 0), (20, 0)], context="a")
+	waitFor(lambda: prefetcher.planned == 2)
+	assert prefetcher.take((0, 0), (10, 0), "b") is None
+	assert prefetcher.take((0, 0), (20, 0), "a") is None
+	assert prefetcher.discarded == 2
+	prefetcher.prefetch((0, 0), [(10, 0)], context="a")
+	waitFor(lambda: prefetcher.planned == 3)
+	assert prefetcher.take((5, 5), (10, 0), "a") is None
+	assert prefetcher.discarded == 3
+
+
+def test_planFinishedAfterANewPrefetchIsDiscarded():
+	entered = threading.Event()
+	release = threading.Event()
+
+	def planner(startX, startY, destX, destY):
+		entered.set()
+		release.wait(5)
+		return (startX, startY, destX, destY)
+
+	prefetcher = PathPrefetcher(planner)
+	try:
+		prefetcher.prefetch((0, 0), [(10, 0)])
+		assert entered.wait(5)
+		prefetcher.prefetch((1, 1), [(20, 0)])
+		release.set()
+		waitFor(lambda: prefetcher.planned == 1)
+		assert prefetcher.take((1, 1), (20, 0)) == (1, 1, 20, 0)
+		assert prefetcher.discarded == 1
+	finally:
+		prefetcher.close()
+
+
+def test_plannerErrorsAreReported():
+	errors = []
+
+	def planner(startX, startY, destX, destY):
+		raise ValueError("cannot plan")
+
+	prefetcher = PathPrefetcher(planner, onError=lambda: errors.append(1))
+	try:
+		prefetcher.prefetch((0, 0), [(10, 0)])
+		waitFor(lambda: errors)
+		assert prefetcher.take((0, 0), (10, 0)) is None
+	finally:
+		prefetcher.close()
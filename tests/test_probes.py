@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+from cursorMovements import probes
+
+
+@pytest.fixture
+def clock(monkeypatch):
+	times = [0.0]
+	monkeypatch.setattr(probes, "now", lambda: times[0])
+	probes.reset()
+	yield times
+	probes.reset()
+
+
+def test_histogramSummary():
+	histogram = probes.Histogram()
+	assert histogram.summary()["p50"] == 0.0
+	for i in range(1, 101):
+		histogram.record(i / 1000.0)
+	summary = histogram.summary()
+	assert summary["count"] == 100 and summary["max"] == 0.1
+	assert abs(summary["mean"] - 0.0505) < 1e-9
+	# A percentile is the upper bound of its bucket, at most 25% above the real value.
+	for percent in (50, 95, 99):
+		assert percent / 1000.0 <= summary["p%d" % percent] <= percent / 1000.0 * 1.25
+
+
+def test_slowerThanEveryBucketReportsTheMaximum():
+	histogram = probes.Histogram()
+	histogram.record(60.0)
+	assert histogram.counts[-1] == 1
+	assert histogram.percentile(50) == 60.0
+
+
+def test_spansEndOnce(clock):
+	probes.mark("arrival")
+	clock[0] = 0.25
+	probes.markEnd("arrival", "gestureToArrival")
+	probes.markEnd("arrival", "gestureToArrival")
+	probes.markEnd("never", "neverEnded")
+	assert list(probes.histograms) == ["gestureToArrival"]
+	histogram = probes.histograms["gestureToArrival"]
+	assert (histogram.count, histogram.max) == (1, 0.25)
+
+
+def test_reportAndReset(clock):
+	clock[0] = 0.003
+	probes.since("plan", 0.001)
+	lines = probes.report().splitlines()
+	assert lines[0].split() == ["probe", "count", "mean", "p50", "p95", "p99", "max"]
+	assert lines[1].split()[:3] == ["plan", "1", "2.00"]
+	probes.mark("firstMove")
+	probes.reset()
+	assert not probes.histograms
+	probes.markEnd("firstMove", "gestureToFirstMove")
+	assert not probes.histograms
@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+import threading
+
+import pytest
+
+from cursorMovements import profiling
+from cursorMovements.motion import ActiveMotion
+from cursorMovements.trajectory import planWindMouse
+
+
+INCLUDE = os.path.dirname(os.path.abspath(profiling.__file__))
+
+
+@pytest.fixture
+def profiler(tmp_path):
+	times = iter([100.0, 112.5])
+	profiler = profiling.Profiler(os.path.join(str(tmp_path), "profiles"), INCLUDE, clock=lambda: next(times))
+	yield profiler
+	if profiler.running:
+		profiler.stop()
+
+
+def test_reportListsAddonFunctionsOnly(profiler):
+	assert profiler.stop() is None
+	profiler.start()
+	profiler.start()
+	assert profiler.running
+	planWindMouse(0, 0, 800, 300, seed=1)
+	sorted(range(10))
+	fileName = profiler.stop()
+	assert not profiler.running
+	assert os.path.dirname(fileName) == profiler.directory
+	with open(fileName, encoding="utf-8") as f:
+		report = f.read()
+	assert "12.5 seconds" in report
+	assert "planWindMouse" in report and "iterWindMouse" in report
+	assert "{built-in method builtins.sorted}" not in report
+
+
+def test_playbackThreadsAreProfiled(profiler):
+	arrived = threading.Event()
+	motion = ActiveMotion(lambda x, y: None, rate=1000, onArrived=lambda playback: arrived.set())
+	profiler.start()
+	motion.moveTo(30, 0, (0, 0))
+	assert arrived.wait(5.0)
+	fileName = profiler.stop()
+	with open(fileName, encoding="utf-8") as f:
+		report = f.read()
+	assert "_play" in report
+	if not profiling.PROCESS_WIDE:
+		assert "1 playback threads" in report
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import os
+import random
+
+import pytest
+
+import cursorMovements
+from cursorMovements.recording import (
+	CompressedRing, MAX_WINDOW, Recorder, Simplifier, TICKS_PER_SECOND, _readVarints, _writeVarint
+)
+
+
+def test_varintRoundTrip():
+	values = [0, 1, -1, 63, -64, 64, 127, -128, 2 ** 31, -2 ** 31, 2 ** 40]
+	data = bytearray()
+	for value in values:
+		_writeVarint(data, value)
+	assert list(_readVarints(bytes(data))) == values
+
+
+def randomWalk(count, seed):
+	rnd = random.Random(seed)
+	x = y = ticks = 0
+	points = []
+	for unused in range(count):
+		x += rnd.randrange(-40, 41)
+		y += rnd.randrange(-40, 41)
+		ticks += rnd.randrange(1, 100)
+		points.append((x, y, ticks))
+	return points
+
+
+def test_ringRoundTripAcrossChunks():
+	points = randomWalk(5000, 1)
+	ring = CompressedRing(maxBytes=1 << 20, chunkSize=256)
+	for point in points:
+		ring.append(*point)
+	assert len(ring.chunks) > 1
+	assert list(ring) == points
+	assert ring.points == len(points)
+
+
+def test_ringDropsOldestChunksWhenFull():
+	points = randomWalk(20000, 2)
+	ring = CompressedRing(maxBytes=4096, chunkSize=512)
+	for point in points:
+		ring.append(*point)
+	assert ring.sizeBytes <= 4096 + 512
+	assert ring.points + ring.droppedPoints == len(points)
+	# What is left is the newest points, unchanged.
+	assert list(ring) == points[-ring.points:]
+
+
+def test_saveLoad(tmp_path):
+	points = randomWalk(3000, 3)
+	ring = CompressedRing(chunkSize=300)
+	for point in points:
+		ring.append(*point)
+	fileName = os.path.join(str(tmp_path), "sub", "take.cmr")
+	ring.save(fileName)
+	loaded = CompressedRing.load(fileName)
+	assert list(loaded) == points
+	assert loaded.points == len(points)
+
+
+def interpolate(kept, t):
+	for (x0, y0, t0), (x1, y1, t1) in zip(kept, kept[1:]):
+		if t0 <= t <= t1:
+			share = (t - t0) / (t1 - t0) if t1 > t0 else 1.0
+			return x0 + (x1 - x0) * share, y0 + (y1 - y0) * share
+	raise AssertionError("time outside the recording")
+
+
+def test_simplifierStaysWithinTolerance():
+	rnd = random.Random(4)
+	samples = []
+	x = y = 0.0
+	vx, vy = 3.0, 1.0
+	for i in range(3000):
+		if rnd.random() < 0.02:
+			vx, vy = rnd.uniform(-5, 5), rnd.uniform(-5, 5)
+		if rnd.random() < 0.01:
+			vx = vy = 0.0
+		x += vx
+		y += vy
+		samples.append((int(round(x)), int(round(y)), i / 200.0))
+	for tolerance in (0.5, 1.0, 3.0):
+		kept = []
+		simplifier = Simplifier(lambda *sample: kept.append(sample), tolerance)
+		for sample in samples:
+			simplifier.add(*sample)
+		simplifier.flush()
+		assert kept[0] == samples[0] and kept[-1] == samples[-1]
+		if tolerance >= 1:
+			# Rounding to whole pixels already puts a steady move half a pixel off its line.
+			assert len(kept) < len(samples) / 10
+		for sx, sy, t in samples:
+			ix, iy = interpolate(kept, t)
+			assert (sx - ix) ** 2 + (sy - iy) ** 2 <= tolerance * tolerance + 1e-9
+
+
+def test_trajectoryFillsInDroppedSamples():
+	ring = CompressedRing()
+	for point in [(0, 0, 0), (100, 0, TICKS_PER_SECOND // 10), (100, 50, TICKS_PER_SECOND // 5)]:
+		ring.append(*point)
+	assert list(ring.toTrajectory()) == [(100, 0, 0.1), (100, 50, 0.2)]
+	path = ring.toTrajectory(rate=100)
+	assert path.end == (100, 50)
+	assert list(path)[:2] == [(10, 0, 0.01), (20, 0, 0.02)]
+
+
+class SteppingClock(object):
+	# Moves on by one sample each time the position is read, so the recorder never waits nor skips.
+
+	def __init__(self, period):
+		self.period = period
+		self.now = 0.0
+		self.reads = 0
+
+	def __call__(self):
+		return self.now
+
+	def position(self):
+		self.now += self.period
+		self.reads += 1
+		return self.reads, 2 * self.reads
+
+
+def test_recorderKeepsTheEndsOfASteadyMove():
+	clock = SteppingClock(0.001)
+	recorder = Recorder(clock.position, rate=1000, clock=clock)
+	recorder.start()
+	while recorder.samples < 500:
+		pass
+	recorder.stop()
+	points = list(recorder.ring)
+	assert recorder.skippedSamples == 0
+	# Only the window limit keeps samples in between.
+	assert len(points) <= recorder.samples // MAX_WINDOW + 2
+	assert points[0] == (1, 2, 0)
+	last = recorder.samples
+	assert points[-1] == (last, 2 * last, (last - 1) * TICKS_PER_SECOND // 1000)
+	assert all(y == 2 * x and ticks == (x - 1) * TICKS_PER_SECOND // 1000 for x, y, ticks in points)
+
+
+@pytest.mark.parametrize("name, expected", [
+	("take 1", "take 1"),
+	("a/b\\c", "a_b_c"),
+	("../..", ".._"),
+	("what?", "what_"),
+	("con", "_con"),
+	("  end. ", "end"),
+])
+def test_recordingNames(name, expected):
+	assert cursorMovements.recordingName(name) == expected
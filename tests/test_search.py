@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import random
+
+from cursorMovements.positions import Position
+from cursorMovements.search import SearchIndex, positionText
+
+
+def test_searchMatchesBruteForce():
+	rnd = random.Random(1)
+	alphabet = "abcAB 1,"
+	index = SearchIndex()
+	texts = {}
+	order = []
+	for step in range(400):
+		name = "n%d" % rnd.randrange(60)
+		action = rnd.random()
+		if action < 0.6:
+			text = "".join(rnd.choice(alphabet) for unused in range(rnd.randrange(1, 12)))
+			index.set(name, text)
+			if name not in texts:
+				order.append(name)
+			texts[name] = text.lower()
+		elif action < 0.8:
+			index.remove(name)
+			if name in texts:
+				del texts[name]
+				order.remove(name)
+		elif name in texts:
+			newName = "r%d" % step
+			index.rename(name, newName, texts[name])
+			texts[newName] = texts.pop(name)
+			order[order.index(name)] = newName
+		# Queries typed one character at a time exercise the narrowing of the previous result.
+		query = "".join(rnd.choice(alphabet) for unused in range(rnd.randrange(0, 6)))
+		for end in range(len(query) + 1):
+			expected = [name for name in order if query[:end].lower() in texts[name]]
+			assert index.search(query[:end]) == expected
+
+
+def test_positionsAreFoundByCoordinatesAndShortcut():
+	index = SearchIndex()
+	index.set("save", positionText("Save", Position(120, 45, "kb:control+s")))
+	index.set("open", positionText("Open", Position(300, 45)))
+	assert index.search("SAVE") == ["save"]
+	assert index.search(",45") == ["save", "open"]
+	assert index.search("control+s") == ["save"]
+	assert index.search("kb:") == []
+	assert index.search("") == ["save", "open"]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+from cursorMovements.positions import Position, PositionTable
+from cursorMovements.positionStore import ShortCutIndex
+
+
+def test_shortCutIndex():
+	table = PositionTable([("a", Position(1, 2, "kb:control+f1")), ("b", Position(3, 4))])
+	index = ShortCutIndex(str.lower, table)
+	assert index.lookup(["kb:control+f1"]) == (1, 2)
+	table.setGesture("b", "kb:control+f1")
+	index.set("b", table["b"])
+	index.set("a", table["a"])
+	assert index.lookup(["kb:control+f1"]) == (3, 4)
+	index.rename("b", "c")
+	index.remove("b")
+	assert index.gestures == frozenset(["kb:control+f1"])
+	index.remove("c")
+	assert len(index) == 0
+
+
+def test_lookupUsesTheFirstShortcutOfTheGesture():
+	index = ShortCutIndex(str.lower, PositionTable([
+		("a", Position(1, 2, "kb:Control+F1")), ("b", Position(3, 4, "kb:f2")),
+	]))
+	assert index.gestures == frozenset(["kb:control+f1", "kb:f2"])
+	assert index.lookup(["kb:f3", "kb:f2", "kb:control+f1"]) == (3, 4)
+	assert index.lookup(["kb:f3"]) is None
+
+
+def test_gesturesThatCannotBeNormalizedAreSkipped():
+	def normalize(identifier):
+		if identifier == "broken":
+			raise ValueError(identifier)
+		return identifier
+
+	table = PositionTable([("a", Position(1, 2, "broken")), ("b", Position(3, 4, "kb:f2"))])
+	index = ShortCutIndex(normalize, table)
+	assert index.gestures == frozenset(["kb:f2"])
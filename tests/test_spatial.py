@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import random
+
+import pytest
+
+from cursorMovements.spatial import DIRECTIONS, SpatialIndex
+
+
+@pytest.mark.parametrize("cellSize", [1, 16, 128])
+def test_nearestMatchesBruteForce(cellSize):
+	rnd = random.Random(cellSize)
+	for unused in range(100):
+		index = SpatialIndex(cellSize)
+		points = {}
+		for key in range(rnd.randrange(1, 80)):
+			point = (rnd.randrange(-200, 2000), rnd.randrange(-200, 1200))
+			index.insert(key, *point)
+			points[key] = point
+		for key in rnd.sample(list(points), rnd.randrange(len(points))):
+			index.remove(key)
+			del points[key]
+		x, y = rnd.randrange(-300, 2100), rnd.randrange(-300, 1300)
+		for direction in [None] + list(DIRECTIONS):
+			scores = [index._score(key, x, y, direction) for key in points]
+			scores = [score for score in scores if score is not None]
+			found = index.nearest(x, y, direction)
+			if not scores:
+				assert found is None
+			else:
+				assert index._score(found, x, y, direction) == min(scores)
+
+
+def test_nearestSkipsTheQueryPoint():
+	index = SpatialIndex()
+	index.insert("here", 10, 10)
+	assert index.nearest(10, 10) is None
+	index.insert("there", 500, 10)
+	assert index.nearest(10, 10) == "there"
+	assert index.nearest(10, 10, "left") is None
+
+
+def test_directionBeyondEveryPointLooksAtNone(monkeypatch):
+	rnd = random.Random(3)
+	index = SpatialIndex()
+	for key in range(5000):
+		index.insert(key, rnd.randrange(1920), rnd.randrange(1080))
+	scored = []
+	score = index._score
+	monkeypatch.setattr(index, "_score", lambda *args: scored.append(args) or score(*args))
+	assert index.nearest(1950, 500, "right") is None
+	assert index.nearest(-10, 500, "left") is None
+	assert index.nearest(900, -5, "up") is None
+	assert index.nearest(900, 1200, "down") is None
+	assert scored == []
+	# At the edge only the points of the last column are looked at.
+	assert index.nearest(1919, 500, "right") is None
+	assert 0 < len(scored) < 1000
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import itertools
+import math
+import random
+
+from cursorMovements import tour
+
+
+def test_shortestOrderIsAPermutationNoLongerThanRecorded():
+	rnd = random.Random(5)
+	for count in (1, 2, 10, 200):
+		points = [(rnd.randrange(1920), rnd.randrange(1080)) for unused in range(count)] + [(5, 5), (5, 5)]
+		order = tour.shortestOrder((0, 0), points)
+		assert sorted(order) == list(range(len(points)))
+		assert tour.tourLength((0, 0), points, order) <= tour.tourLength((0, 0), points, range(len(points)))
+
+
+def test_nearestNeighbourMatchesBruteForce():
+	rnd = random.Random(6)
+	# Coordinates far apart enough that there are no ties.
+	points = [(rnd.random() * 1e6, rnd.random() * 1e6) for unused in range(100)]
+	points = [(int(x), int(y)) for x, y in points]
+	remaining = list(range(len(points)))
+	expected = []
+	last = (0, 0)
+	while remaining:
+		best = min(remaining, key=lambda index: math.hypot(points[index][0] - last[0], points[index][1] - last[1]))
+		remaining.remove(best)
+		expected.append(best)
+		last = points[best]
+	assert tour.nearestNeighbourOrder((0, 0), points) == expected
+
+
+def test_twoOptFindsTheOptimumOfSmallRoutes():
+	rnd = random.Random(7)
+	points = [(rnd.randrange(500), rnd.randrange(500)) for unused in range(6)]
+	best = min(
+		tour.tourLength((0, 0), points, order) for order in itertools.permutations(range(len(points)))
+	)
+	order = tour.twoOpt((0, 0), points, range(len(points)))
+	# 2-opt is a local search, it gets close to the optimum on small routes.
+	assert tour.tourLength((0, 0), points, order) <= best * 1.2
+
+
+def test_tourPassesThroughEveryWaypoint():
+	points = [(300, 100), (300, 100), (600, 400), (100, 400)]
+	path = tour.planTour((0, 0), points, 120)
+	samples = [(x, y) for x, y, t in path]
+	for point in points:
+		assert point in samples
+	assert path.end == (100, 400)
+	assert all(b > a for a, b in zip(path.ts, path.ts[1:]))
+	# The cursor does not stop at the waypoints, the legs follow each other.
+	legs = sum(tour.fittsDuration(d) for d in (math.hypot(300, 100), math.hypot(300, 300), 500))
+	assert legs - 0.1 < path.duration <= legs
+
+
+def test_tourDwellsAtWaypoints():
+	path = tour.planTour((0, 0), [(300, 0), (600, 0)], 120, dwell=0.5)
+	at = path.ts[[(x, y) for x, y, t in path].index((300, 0))]
+	after = min(t for x, y, t in path if x > 300)
+	assert after - at >= 0.5
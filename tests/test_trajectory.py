@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+import pytest
+
+from cursorMovements.trajectory import (
+	MAX_EASING_SLOPE, Trajectory, minimumJerk, planWindMouse, quinticEasing, resampleToDuration, speedEasing,
+)
+
+
+def straight(length):
+	# A straight path to the right with a sample every pixel, as a slow planner would give.
+	path = Trajectory(0, 0)
+	for x in range(1, length + 1):
+		path.append(x, 0, x / 1000.0)
+	return path
+
+
+def test_planWindMouseIsSeeded():
+	path = planWindMouse(0, 0, 900, 400, seed=3)
+	assert list(planWindMouse(0, 0, 900, 400, seed=3)) == list(path)
+	assert abs(path.end[0] - 900) <= 1 and abs(path.end[1] - 400) <= 1
+
+
+@pytest.mark.parametrize("duration", [0.05, 0.5, 2.0])
+def test_resampleArrivesAfterTheDuration(duration):
+	path = planWindMouse(0, 0, 1500, 700, seed=1)
+	resampled = resampleToDuration(path, duration, 120)
+	assert resampled.requestedDuration == duration
+	assert resampled.end == path.end
+	assert abs(resampled.duration - round(duration * 120) / 120.0) < 1e-9
+	assert all(b > a for a, b in zip(resampled.ts, resampled.ts[1:]))
+
+
+def test_resampleWithoutEasingMovesAtConstantSpeed():
+	resampled = resampleToDuration(straight(1200), 1.0, 120, easing=None)
+	assert len(resampled) == 120
+	assert [x for x, y, t in resampled] == [10 * frame for frame in range(1, 121)]
+
+
+def test_resampleStartsAndEndsAtRest():
+	resampled = resampleToDuration(straight(1200), 1.0, 120)
+	steps = [b - a for a, b in zip([0] + list(resampled.xs), resampled.xs)]
+	assert steps[0] <= 1 and max(steps) > 15
+	assert resampled.xs[-1] - resampled.xs[-2] <= 1
+
+
+@pytest.mark.parametrize("slope", [0.0, 0.5, 1.0, 2.0, MAX_EASING_SLOPE])
+def test_quinticEasing(slope):
+	easing = quinticEasing(slope)
+	assert easing(0.0) == 0.0 and abs(easing(1.0) - 1.0) < 1e-12
+	assert abs(easing(1e-6) / 1e-6 - slope) < 1e-4
+	values = [easing(i / 1000.0) for i in range(1001)]
+	assert all(b >= a - 1e-12 for a, b in zip(values, values[1:]))
+	if not slope:
+		assert values == [minimumJerk(i / 1000.0) for i in range(1001)]
+
+
+def test_speedEasingKeepsTheSpeedOfARetarget():
+	# At 3000 pixels per second and 120 frames per second the cursor leaves at 25 pixels a frame.
+	resampled = resampleToDuration(straight(2000), 1.0, 120, speedEasing(3000.0, 2000, 1.0))
+	assert abs(resampled.xs[0] - 25) <= 1
+	assert abs(resampled.xs[1] - resampled.xs[0] - 25) <= 1
+	assert resampled.end == (2000, 0)
+
+
+def test_speedEasingIsClampedAndFallsBackToRest():
+	assert speedEasing(0.0, 2000, 1.0) is minimumJerk
+	assert speedEasing(3000.0, 0, 1.0) is minimumJerk
+	resampled = resampleToDuration(straight(100), 1.0, 120, speedEasing(1e6, 100, 1.0))
+	assert all(b >= a for a, b in zip(resampled.xs, resampled.xs[1:]))
+	assert resampled.end == (100, 0)
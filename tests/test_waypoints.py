@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+# Cursor Movements
+# License GNU GPL
+
+from collections import deque
+import random
+
+from cursorMovements.waypoints import WaypointBuffer
+
+
+def test_ringMatchesDeque():
+	rnd = random.Random(2)
+	buffer = WaypointBuffer(capacity=7, skipRepeated=False)
+	reference = deque(maxlen=7)
+	added = 0
+	for unused in range(500):
+		action = rnd.random()
+		if action < 0.8:
+			point = (rnd.randrange(5), rnd.randrange(5))
+			buffer.append(*point)
+			reference.append(point)
+			added += 1
+		elif action < 0.9:
+			capacity = rnd.randrange(1, 12)
+			buffer.resize(capacity)
+			reference = deque(reference, maxlen=capacity)
+		else:
+			buffer.clear()
+			reference.clear()
+		assert list(buffer) == list(reference)
+		assert [buffer[i] for i in range(len(buffer))] == list(reference)
+		if reference:
+			assert buffer[-1] == reference[-1]
+		# The waypoint at index i was the (dropped + i)th one added.
+		assert buffer.dropped + len(buffer) == added
+
+
+def test_skipRepeated():
+	buffer = WaypointBuffer(capacity=4)
+	assert buffer.append(1, 1)
+	assert not buffer.append(1, 1)
+	assert buffer.append(2, 2)
+	assert buffer.append(1, 1)
+	assert list(buffer) == [(1, 1), (2, 2), (1, 1)]
+
+
+def test_exportImportRoundTrip():
+	buffer = WaypointBuffer(capacity=5, skipRepeated=False)
+	for i in range(8):
+		buffer.append(i, -i)
+	copy = WaypointBuffer(capacity=5, skipRepeated=False)
+	copy.importPoints(buffer.exportPoints())
+	assert list(copy) == list(buffer)
+	smaller = WaypointBuffer(capacity=3, skipRepeated=False)
+	smaller.importPoints(buffer.exportPoints())
+	assert list(smaller) == list(buffer)[-3:]